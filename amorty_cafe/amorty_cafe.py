@@ -1,6 +1,10 @@
 """Main Amorty Cafe Management System application."""
 import reflex as rx
 from .auth import AuthState
+from .event_stats import install as install_event_stats
+from .search_index import search_index
+from .pages.kitchen import kitchen_page, KitchenState
+from .pages.analytics import analytics_page, AnalyticsState
 
 # Simple landing page
 def index() -> rx.Component:
@@ -25,15 +29,13 @@ def index() -> rx.Component:
 
 # Simple login page with state
 class LoginState(rx.State):
-    admin_username: str = ""
-    admin_password: str = ""
-    customer_id: str = ""
+    # Inputs are uncontrolled; each form arrives as one submit event
 
-    def handle_admin_login(self):
-        return AuthState.login_admin(self.admin_username, self.admin_password)
+    def handle_admin_login(self, form_data: dict):
+        return AuthState.login_admin(form_data.get("username", ""), form_data.get("password", ""))
 
-    def handle_customer_login(self):
-        return AuthState.login_customer(self.customer_id)
+    def handle_customer_login(self, form_data: dict):
+        return AuthState.login_customer(form_data.get("customer_id", ""))
 
 def login_page() -> rx.Component:
     """Login page."""
@@ -43,29 +45,30 @@ def login_page() -> rx.Component:
 
             # Admin login section
             rx.card(
-                rx.vstack(
-                    rx.heading("👑 Admin Login", size="6"),
-                    rx.input(
-                        placeholder="Username Admin",
-                        value=LoginState.admin_username,
-                        on_change=LoginState.set_admin_username,
-                        size="3"
-                    ),
-                    rx.input(
-                        placeholder="Password Admin",
-                        type="password",
-                        value=LoginState.admin_password,
-                        on_change=LoginState.set_admin_password,
-                        size="3"
-                    ),
-                    rx.button(
-                        "Login Admin",
-                        on_click=LoginState.handle_admin_login,
-                        size="3",
+                rx.form(
+                    rx.vstack(
+                        rx.heading("👑 Admin Login", size="6"),
+                        rx.input(
+                            placeholder="Username Admin",
+                            name="username",
+                            size="3"
+                        ),
+                        rx.input(
+                            placeholder="Password Admin",
+                            type="password",
+                            name="password",
+                            size="3"
+                        ),
+                        rx.button(
+                            "Login Admin",
+                            type="submit",
+                            size="3",
+                            width="100%"
+                        ),
+                        spacing="3",
                         width="100%"
                     ),
-                    spacing="3",
-                    width="100%"
+                    on_submit=LoginState.handle_admin_login,
                 ),
                 width="300px"
             ),
@@ -74,22 +77,24 @@ def login_page() -> rx.Component:
 
             # Customer login section
             rx.card(
-                rx.vstack(
-                    rx.heading("👤 Customer Login", size="6"),
-                    rx.input(
-                        placeholder="Customer ID (contoh: CUS1)",
-                        value=LoginState.customer_id,
-                        on_change=LoginState.set_customer_id,
-                        size="3"
-                    ),
-                    rx.button(
-                        "Login Customer",
-                        on_click=LoginState.handle_customer_login,
-                        size="3",
+                rx.form(
+                    rx.vstack(
+                        rx.heading("👤 Customer Login", size="6"),
+                        rx.input(
+                            placeholder="Customer ID (contoh: CUS1)",
+                            name="customer_id",
+                            size="3"
+                        ),
+                        rx.button(
+                            "Login Customer",
+                            type="submit",
+                            size="3",
+                            width="100%"
+                        ),
+                        spacing="3",
                         width="100%"
                     ),
-                    spacing="3",
-                    width="100%"
+                    on_submit=LoginState.handle_customer_login,
                 ),
                 width="300px"
             ),
@@ -139,6 +144,7 @@ def admin_dashboard() -> rx.Component:
                 rx.card("💰 Total Transaksi: 0"),
                 spacing="4"
             ),
+            rx.link(rx.button("📈 Analitik Penjualan", size="3"), href="/analytics"),
 
             spacing="6",
             width="100%",
@@ -181,9 +187,14 @@ def customer_dashboard() -> rx.Component:
 
 # Create the main app
 app = rx.App()
+install_event_stats(app)
+# Build the global search index in the background as the server starts
+app.register_lifespan_task(search_index.start_build)
 
 # Add pages
 app.add_page(index, route="/")
 app.add_page(login_page, route="/login")
 app.add_page(admin_dashboard, route="/admin-dashboard")
 app.add_page(customer_dashboard, route="/customer-dashboard")
+app.add_page(kitchen_page, route="/kitchen", on_load=KitchenState.watch_queue)
+app.add_page(analytics_page, route="/analytics", on_load=AnalyticsState.load_report)
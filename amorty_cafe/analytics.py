@@ -0,0 +1,183 @@
+"""Sales and table-utilization metrics computed with pandas.
+
+Each metric starts from a columnar extract: one SELECT of only the
+needed columns, read straight into a DataFrame. Everything after that
+is vectorized: hours come from ``.dt.hour``, days from ``resample``,
+rankings from ``groupby``, and rental overlap with the range from
+``clip``. No Python loop runs per row.
+
+Reports are cached by date range. Ranges that include today expire
+after ``ttl``; ranges that ended before today after ``past_ttl``. Admin
+writes to the tables a report reads clear the cache (see admin_dashboard).
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+import reflex as rx
+from sqlalchemy import or_, select
+
+from .models import RentalTransaction
+from .models_rafi import Menu, Pesanan, Transaksi
+
+TOP_MENU = 10
+
+def extract(statement) -> pd.DataFrame:
+    """Run a SELECT and return its columns as a DataFrame."""
+    with rx.session() as session:
+        return pd.read_sql(statement, session.connection())
+
+def range_bounds(start: date, end: date) -> Tuple[datetime, datetime]:
+    """[start 00:00, day after end 00:00) for an inclusive date range."""
+    return datetime(start.year, start.month, start.day), datetime(end.year, end.month, end.day) + timedelta(days=1)
+
+def load_orders(start: datetime, end: datetime) -> pd.DataFrame:
+    """Pesanan in range with their menu name and price (one joined SELECT)."""
+    return extract(
+        select(Pesanan.Waktu_Pesanan, Pesanan.ID_Menu, Menu.Nama_Menu, Menu.Harga_Menu)
+        .outerjoin(Menu, Menu.ID_Menu == Pesanan.ID_Menu)
+        .where(Pesanan.Waktu_Pesanan >= start, Pesanan.Waktu_Pesanan < end)
+    )
+
+def load_transactions(start: datetime, end: datetime) -> pd.DataFrame:
+    return extract(
+        select(Transaksi.Tanggal_Transaksi, Transaksi.Total_Harga)
+        .where(Transaksi.Tanggal_Transaksi >= start, Transaksi.Tanggal_Transaksi < end)
+    )
+
+def load_rentals(start: datetime, end: datetime) -> pd.DataFrame:
+    """Rentals overlapping the range, including ones still running."""
+    return extract(
+        select(RentalTransaction.table_number, RentalTransaction.start_time,
+               RentalTransaction.end_time, RentalTransaction.total_amount)
+        .where(RentalTransaction.start_time < end,
+               or_(RentalTransaction.end_time.is_(None), RentalTransaction.end_time >= start))
+    )
+
+def revenue_by_hour(orders: pd.DataFrame, rentals: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Menu and rental revenue per hour of day (rentals count at their start hour)."""
+    hours = pd.RangeIndex(24, name="hour")
+    menu = orders.groupby(pd.to_datetime(orders["Waktu_Pesanan"]).dt.hour)["Harga_Menu"].sum()
+    rental = rentals.groupby(pd.to_datetime(rentals["start_time"]).dt.hour)["total_amount"].sum()
+    frame = pd.DataFrame({
+        "menu": menu.reindex(hours, fill_value=0.0),
+        "rental": rental.reindex(hours, fill_value=0.0),
+    })
+    frame["total"] = frame["menu"] + frame["rental"]
+    frame = frame.reset_index()
+    frame["hour"] = frame["hour"].map("{:02d}:00".format)
+    return frame.round(2).to_dict("records")
+
+def revenue_by_day(transactions: pd.DataFrame, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+    """Transaksi revenue per calendar day, zero-filled across the range."""
+    days = pd.date_range(start, end - timedelta(days=1), freq="D")
+    series = (
+        transactions.set_index(pd.to_datetime(transactions["Tanggal_Transaksi"]))["Total_Harga"]
+        .resample("D").sum()
+        .reindex(days, fill_value=0.0)
+    )
+    frame = series.rename("revenue").rename_axis("day").reset_index()
+    frame["day"] = frame["day"].dt.strftime("%d-%m")
+    return frame.round(2).to_dict("records")
+
+def top_menu_items(orders: pd.DataFrame, limit: int = TOP_MENU) -> List[Dict[str, Any]]:
+    """Best-selling menu items by order count, with their revenue."""
+    if orders.empty:
+        return []
+    frame = (
+        orders.assign(name=orders["Nama_Menu"].fillna(orders["ID_Menu"]))
+        .groupby("ID_Menu")
+        .agg(name=("name", "first"), orders=("name", "size"), revenue=("Harga_Menu", "sum"))
+        .nlargest(limit, "orders")
+        .reset_index(drop=True)
+    )
+    return frame.round(2).to_dict("records")
+
+def table_utilization(rentals: pd.DataFrame, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+    """Share of the range each billiard table was rented, in percent.
+
+    Rental intervals are clipped to the range (running rentals end now),
+    then occupied hours are summed per table.
+    """
+    if rentals.empty:
+        return []
+    now = min(datetime.now(), end)
+    begins = pd.to_datetime(rentals["start_time"]).clip(lower=start)
+    ends = pd.to_datetime(rentals["end_time"]).fillna(now).clip(upper=end)
+    hours = ((ends - begins).dt.total_seconds() / 3600).clip(lower=0)
+    span = max((now - start).total_seconds() / 3600, 1e-9)
+    frame = (
+        rentals.assign(hours=hours)
+        .groupby("table_number")
+        .agg(hours=("hours", "sum"), rentals=("hours", "size"), revenue=("total_amount", "sum"))
+        .reset_index()
+        .sort_values("table_number")
+    )
+    frame["utilization"] = (frame["hours"] / span * 100).clip(upper=100)
+    frame["table"] = "Meja " + frame["table_number"].astype(str)
+    return frame.drop(columns="table_number").round(2).to_dict("records")
+
+def build_report(start: date, end: date) -> Dict[str, Any]:
+    """Every metric for an inclusive date range, as JSON-ready records."""
+    lower, upper = range_bounds(start, end)
+    orders = load_orders(lower, upper)
+    transactions = load_transactions(lower, upper)
+    rentals = load_rentals(lower, upper)
+    return {
+        "revenue_by_hour": revenue_by_hour(orders, rentals),
+        "revenue_by_day": revenue_by_day(transactions, lower, upper),
+        "top_menu": top_menu_items(orders),
+        "utilization": table_utilization(rentals, lower, upper),
+        "totals": {
+            "orders": int(len(orders)),
+            "menu_revenue": round(float(orders["Harga_Menu"].sum()), 2),
+            "transaksi_revenue": round(float(transactions["Total_Harga"].sum()), 2),
+            "rental_revenue": round(float(rentals["total_amount"].sum()), 2),
+        },
+    }
+
+class ReportCache:
+    """Reports by (start, end); current ranges expire after ``ttl``, past ones after ``past_ttl``.
+
+    Past days still change (late edits, fixed totals, closed rentals), so
+    no range is kept forever; ``clear`` drops everything after such writes.
+    """
+
+    def __init__(self, ttl: float = 300.0, past_ttl: float = 3600.0, max_ranges: int = 64):
+        self.ttl = ttl
+        self.past_ttl = past_ttl
+        self.max_ranges = max_ranges
+        self._reports: "OrderedDict[Tuple[date, date], tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, start: date, end: date) -> Dict[str, Any]:
+        key = (start, end)
+        with self._lock:
+            entry = self._reports.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._reports.move_to_end(key)
+                return entry[1]
+        report = build_report(start, end)
+        expires = time.monotonic() + (self.past_ttl if end < date.today() else self.ttl)
+        with self._lock:
+            self._reports[key] = (expires, report)
+            self._reports.move_to_end(key)
+            while len(self._reports) > self.max_ranges:
+                self._reports.popitem(last=False)
+        return report
+
+    def clear(self):
+        with self._lock:
+            self._reports.clear()
+
+# Shared report cache
+reports = ReportCache()
+
+def sales_report(start: Optional[date] = None, end: Optional[date] = None) -> Dict[str, Any]:
+    """Cached report; defaults to the last 7 days including today."""
+    end = end or date.today()
+    start = start or end - timedelta(days=6)
+    return reports.get(start, end)
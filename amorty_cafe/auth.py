@@ -1,58 +1,193 @@
 """Authentication utilities and state management for Rafi's system."""
+import functools
 import reflex as rx
-from typing import Optional
+from typing import Any, Callable, Dict
+from .customer_cache import customer_ids
+from .models import User, UserRole
+from .rate_limit import check_login_attempt, login_succeeded
+from .passwords import hash_password_async, verify_password_async
+from .tokens import create_session_token, decode_session_token, get_token_settings, has_role
 
 class AuthState(rx.State):
-    """Simple authentication state management."""
-    is_authenticated: bool = False
-    current_user: Optional[dict] = None
+    """Authentication state backed by a signed session token.
+
+    Identity and role live in the token claims, so every check is an
+    in-memory signature/expiry check and needs no database access.
+    """
+    session_token: str = rx.Cookie(
+        "",
+        name="amorty_session",
+        max_age=get_token_settings()["expire_minutes"] * 60,
+        same_site="strict",
+    )
     login_error: str = ""
-    user_role: str = ""  # "admin" or "customer"
-    
+    signup_error: str = ""
+
+    @rx.var
+    def token_claims(self) -> Dict[str, Any]:
+        """Verified claims of the current session token."""
+        return decode_session_token(self.session_token) or {}
+
+    @rx.var
+    def is_authenticated(self) -> bool:
+        return bool(self.token_claims)
+
+    @rx.var
+    def user_role(self) -> str:
+        """Role from the token: "admin", "customer" or empty."""
+        return self.token_claims.get("role", "")
+
+    @rx.var
+    def is_admin(self) -> bool:
+        return self.user_role == "admin"
+
+    @rx.var
+    def current_user(self) -> Dict[str, Any]:
+        """Current user built from token claims."""
+        claims = self.token_claims
+        if not claims:
+            return {}
+        return {
+            "id": claims["sub"],
+            "username": claims["sub"],
+            "name": claims.get("name", claims["sub"]),
+            "role": claims["role"],
+            "customer_id": claims["sub"] if claims["role"] == "customer" else "",
+        }
+
+    def start_session(self, subject: str, role: str, name: str = ""):
+        """Issue a new session token for an authenticated user."""
+        self.session_token = create_session_token(subject, role, name)
+        self.login_error = ""
+
+    def _rate_limited(self, username: str) -> bool:
+        """Reject excess attempts before any database or bcrypt work."""
+        self.login_error = check_login_attempt(self.router.session.client_ip, username)
+        return self.login_error != ""
+
+    def _login_succeeded(self, username: str):
+        login_succeeded(self.router.session.client_ip, username)
+
+    async def login(self, username: str, password: str):
+        """Login with username and password against the User table."""
+        self.login_error = ""
+        if self._rate_limited(username):
+            return
+
+        with rx.session() as session:
+            user = session.query(User).filter(User.username == username).first()
+            hashed = user.hashed_password if user and user.is_active else None
+
+        # bcrypt runs in the process pool so the event loop stays free
+        if not await verify_password_async(password, hashed):
+            self.login_error = "Username atau password salah!"
+            return
+
+        self._login_succeeded(username)
+        self.start_session(user.username, user.role.value)
+        if user.role == UserRole.ADMIN:
+            return rx.redirect("/admin-dashboard")
+        return rx.redirect("/customer-dashboard")
+
+    async def signup(self, username: str, email: str, password: str):
+        """Create a new customer account.
+
+        Public signup never grants admin; admins come from seed data only.
+        """
+        self.signup_error = ""
+
+        with rx.session() as session:
+            exists = session.query(User).filter(
+                (User.username == username) | (User.email == email)
+            ).first()
+        if exists:
+            self.signup_error = "Username atau email sudah terdaftar!"
+            return
+
+        hashed = await hash_password_async(password)
+        with rx.session() as session:
+            session.add(User(
+                username=username,
+                email=email,
+                hashed_password=hashed,
+                role=UserRole.CUSTOMER
+            ))
+            session.commit()
+        return rx.redirect("/login")
+
     def login_admin(self, username: str, password: str):
         """Login as admin."""
         self.login_error = ""
-        
+        if self._rate_limited(username):
+            return
+
         # Simple admin login - hardcoded for now
         if username == "admin" and password == "admin":
-            self.is_authenticated = True
-            self.user_role = "admin"
-            self.current_user = {
-                "username": username,
-                "role": "admin"
-            }
+            self._login_succeeded(username)
+            self.start_session(username, "admin", "Administrator")
             return rx.redirect("/admin-dashboard")
         else:
             self.login_error = "Username atau password admin salah!"
-    
-    def login_customer(self, customer_id: str):
+
+    async def login_customer(self, customer_id: str):
         """Login as customer with Customer ID."""
         self.login_error = ""
-        
-        # Simple customer login - just check if ID format is correct
-        if customer_id and customer_id.startswith("CUS"):
-            self.is_authenticated = True
-            self.user_role = "customer"
-            self.current_user = {
-                "customer_id": customer_id,
-                "role": "customer"
-            }
+        if self._rate_limited(customer_id):
+            return
+
+        # Same format and membership rule as the login form; the session gets the normalized ID
+        customer_id = await customer_ids.verify_async(customer_id)
+        if customer_id:
+            self._login_succeeded(customer_id)
+            self.start_session(customer_id, "customer", f"Customer {customer_id}")
             return rx.redirect("/customer-dashboard")
         else:
             self.login_error = "Customer ID tidak valid! Gunakan format CUS1, CUS2, dll."
-    
+
     def logout(self):
         """Logout current user."""
-        self.is_authenticated = False
-        self.current_user = None
-        self.user_role = ""
+        self.session_token = ""
         self.login_error = ""
         return rx.redirect("/login")
-    
+
     def check_admin_auth(self):
         """Check if current user is admin."""
-        return self.is_authenticated and self.user_role == "admin"
-    
+        return self.user_role == "admin"
+
     def check_customer_auth(self):
         """Check if current user is customer."""
-        return self.is_authenticated and self.user_role == "customer"
+        return self.user_role == "customer"
+
+async def is_admin_session(state: rx.State) -> bool:
+    """Server-side admin check for event handlers.
+
+    ``require_admin`` only hides the page; events can still be sent by
+    any client, so every admin handler calls this first. Background tasks
+    must call it inside ``async with self``.
+    """
+    auth = await state.get_state(AuthState)
+    return has_role(auth.session_token, "admin")
+
+def _access_denied() -> rx.Component:
+    return rx.center(
+        rx.vstack(
+            rx.text("Silakan login terlebih dahulu.", class_name="text-slate-300"),
+            rx.link("Login", href="/login", class_name="text-blue-400 hover:text-blue-300"),
+            class_name="space-y-2"
+        ),
+        class_name="min-h-screen bg-slate-900"
+    )
+
+def require_auth(page: Callable[[], rx.Component]) -> Callable[[], rx.Component]:
+    """Only render the page for a valid session token."""
+    @functools.wraps(page)
+    def wrapper() -> rx.Component:
+        return rx.cond(AuthState.is_authenticated, page(), _access_denied())
+    return wrapper
+
+def require_admin(page: Callable[[], rx.Component]) -> Callable[[], rx.Component]:
+    """Only render the page for an admin session token."""
+    @functools.wraps(page)
+    def wrapper() -> rx.Component:
+        return rx.cond(AuthState.is_admin, page(), _access_denied())
+    return wrapper
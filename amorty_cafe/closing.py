@@ -0,0 +1,192 @@
+"""End-of-day closing: one streaming pass and an immutable DailyLedger row.
+
+``close_day`` only closes a day that is over (yesterday by default). It
+first ends rentals started that day and still running, charging
+hours * hourly_rate up to midnight. It then streams the day's Transaksi (joined to its
+Pesanan for the table), Pembayaran and completed RentalTransaction rows
+in keyset chunks, adding into running totals by payment method, employee
+and table. Memory is the chunk plus one number per method, employee and
+table, however many rows the day has.
+
+The ledger row is written once per business day and chained to the
+previous day by checksum. Running the close again for a closed day
+returns the stored row and changes nothing.
+"""
+import hashlib
+import json
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import reflex as rx
+from sqlalchemy.exc import IntegrityError
+
+from .models import DailyLedger, RentalStatus, RentalTransaction
+from .models_rafi import Pembayaran, Pesanan, Transaksi
+from .reconciliation import CHUNK_SIZE, stream
+
+def day_bounds(day: date) -> Tuple[datetime, datetime]:
+    start = datetime(day.year, day.month, day.day)
+    return start, start + timedelta(days=1)
+
+def rental_price(start_time: datetime, end_time: datetime, hourly_rate: float) -> Tuple[float, float]:
+    """(hours, amount) for a rental, hours rounded to the minute."""
+    hours = max(0.0, (end_time - start_time).total_seconds() / 3600)
+    hours = round(hours * 60) / 60
+    return round(hours, 2), round(hours * (hourly_rate or 0.0), 2)
+
+def close_active_rentals(until: datetime, chunk_size: int = CHUNK_SIZE) -> int:
+    """Complete rentals started before ``until`` that are still running.
+
+    Each chunk is one bulk UPDATE; returns the number of rentals closed.
+    """
+    closed, last_id = 0, 0
+    while True:
+        with rx.session() as session:
+            rows = (
+                session.query(RentalTransaction.id, RentalTransaction.start_time, RentalTransaction.hourly_rate)
+                .filter(RentalTransaction.status == RentalStatus.ACTIVE,
+                        RentalTransaction.start_time < until,
+                        RentalTransaction.id > last_id)
+                .order_by(RentalTransaction.id)
+                .limit(chunk_size)
+                .all()
+            )
+            if not rows:
+                return closed
+            updates = []
+            for row_id, start_time, hourly_rate in rows:
+                hours, amount = rental_price(start_time, until, hourly_rate)
+                updates.append({"id": row_id, "end_time": until, "duration": hours,
+                                "total_amount": amount, "status": RentalStatus.COMPLETED})
+            session.bulk_update_mappings(RentalTransaction, updates)
+            session.commit()
+        closed += len(rows)
+        last_id = rows[-1][0]
+
+def stream_transaksi(start: datetime, end: datetime, chunk_size: int = CHUNK_SIZE) -> Iterator[List[Tuple]]:
+    """Chunks of (id, Total_Harga, ID_Karyawan, ID_Meja) for the day's Transaksi."""
+    last_id = 0
+    while True:
+        with rx.session() as session:
+            rows = (
+                session.query(Transaksi.id, Transaksi.Total_Harga, Transaksi.ID_Karyawan, Pesanan.ID_Meja)
+                .outerjoin(Pesanan, Pesanan.ID_Pesanan == Transaksi.ID_Pesanan)
+                .filter(Transaksi.Tanggal_Transaksi >= start, Transaksi.Tanggal_Transaksi < end,
+                        Transaksi.id > last_id)
+                .order_by(Transaksi.id)
+                .limit(chunk_size)
+                .all()
+            )
+        if not rows:
+            return
+        last_id = rows[-1][0]
+        yield [tuple(row) for row in rows]
+
+def ledger_to_dict(ledger: DailyLedger) -> Dict[str, Any]:
+    return {
+        "business_date": ledger.business_date.strftime("%Y-%m-%d"),
+        "closed_at": ledger.closed_at.strftime("%Y-%m-%d %H:%M"),
+        "revenue_total": ledger.revenue_total,
+        "payments_total": ledger.payments_total,
+        "rental_total": ledger.rental_total,
+        "transaksi_count": ledger.transaksi_count,
+        "pembayaran_count": ledger.pembayaran_count,
+        "rental_count": ledger.rental_count,
+        "rentals_closed": ledger.rentals_closed,
+        "by_method": json.loads(ledger.by_method),
+        "by_employee": json.loads(ledger.by_employee),
+        "by_table": json.loads(ledger.by_table),
+        "checksum": ledger.checksum,
+    }
+
+def find_ledger(day: date) -> Optional[Dict[str, Any]]:
+    with rx.session() as session:
+        ledger = session.query(DailyLedger).filter(DailyLedger.business_date == day_bounds(day)[0]).first()
+        return ledger_to_dict(ledger) if ledger else None
+
+def checksum(totals: Dict[str, Any], prev_checksum: str) -> str:
+    payload = json.dumps(totals, sort_keys=True, default=str) + prev_checksum
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def close_day(day: Optional[date] = None, chunk_size: int = CHUNK_SIZE) -> Dict[str, Any]:
+    """Close ``day`` (default yesterday) and return its ledger as a dict.
+
+    Raises ValueError for a day that has not ended yet.
+    """
+    day = day or date.today() - timedelta(days=1)
+    existing = find_ledger(day)
+    if existing is not None:
+        return existing
+
+    start, end = day_bounds(day)
+    closed_at = datetime.now()
+    if closed_at < end:
+        raise ValueError(f"hari {day.isoformat()} belum selesai")
+    rentals_closed = close_active_rentals(end, chunk_size)
+
+    by_method: Dict[str, float] = defaultdict(float)
+    by_employee: Dict[str, float] = defaultdict(float)
+    by_table: Dict[str, float] = defaultdict(float)
+    revenue = payments = rentals = 0.0
+    transaksi_count = pembayaran_count = rental_count = 0
+
+    for chunk in stream_transaksi(start, end, chunk_size):
+        transaksi_count += len(chunk)
+        for _, total, employee, meja in chunk:
+            total = total or 0.0
+            revenue += total
+            by_employee[employee or "-"] += total
+            by_table[meja or "-"] += total
+
+    for chunk in stream(Pembayaran, ["Metode_Pembayaran", "Jumlah_Bayar"],
+                        [Pembayaran.Tanggal_Pembayaran >= start, Pembayaran.Tanggal_Pembayaran < end],
+                        chunk_size):
+        pembayaran_count += len(chunk)
+        for _, method, amount in chunk:
+            payments += amount or 0.0
+            by_method[method or "-"] += amount or 0.0
+
+    for chunk in stream(RentalTransaction, ["total_amount", "employee_name", "table_number"],
+                        [RentalTransaction.status == RentalStatus.COMPLETED,
+                         RentalTransaction.end_time >= start, RentalTransaction.end_time < end],
+                        chunk_size):
+        rental_count += len(chunk)
+        for _, amount, employee, table_number in chunk:
+            amount = amount or 0.0
+            rentals += amount
+            by_employee[employee or "-"] += amount
+            by_table[f"Meja {table_number}"] += amount
+
+    totals = {
+        "business_date": start,
+        "revenue_total": round(revenue + rentals, 2),
+        "payments_total": round(payments, 2),
+        "rental_total": round(rentals, 2),
+        "transaksi_count": transaksi_count,
+        "pembayaran_count": pembayaran_count,
+        "rental_count": rental_count,
+        "rentals_closed": rentals_closed,
+        "by_method": json.dumps({k: round(v, 2) for k, v in by_method.items()}, sort_keys=True),
+        "by_employee": json.dumps({k: round(v, 2) for k, v in by_employee.items()}, sort_keys=True),
+        "by_table": json.dumps({k: round(v, 2) for k, v in by_table.items()}, sort_keys=True),
+    }
+    with rx.session() as session:
+        previous = (
+            session.query(DailyLedger.checksum)
+            .filter(DailyLedger.business_date < start)
+            .order_by(DailyLedger.business_date.desc())
+            .first()
+        )
+        prev_checksum = previous[0] if previous else ""
+        ledger = DailyLedger(closed_at=closed_at, prev_checksum=prev_checksum,
+                             checksum=checksum(totals, prev_checksum), **totals)
+        session.add(ledger)
+        try:
+            session.commit()
+        except IntegrityError:
+            # Another run closed the same day first; keep its row
+            session.rollback()
+            return find_ledger(day)
+        session.refresh(ledger)
+        return ledger_to_dict(ledger)
@@ -0,0 +1,141 @@
+"""Columnar encoding for table rows kept in state and sent to the browser.
+
+A list of dicts repeats every column name in every row. Here the column
+list is known by the table component, rows are plain arrays in column
+order, and low-cardinality columns (statuses, categories, payment
+methods) are stored as small int codes into a per-column value list.
+"""
+import json
+import random
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from .table_store import TABLE_SCHEMAS
+
+# Columns with few distinct values, stored as codes into a dictionary.
+DICTIONARY_COLUMNS = {"Status_Meja", "Kategori", "Metode_Pembayaran", "Status_Reservasi"}
+
+def dictionary_columns(columns: Iterable[str]) -> List[str]:
+    """Columns of a table that are dictionary encoded."""
+    return [column for column in columns if column in DICTIONARY_COLUMNS]
+
+def empty_dictionaries(columns: Iterable[str]) -> Dict[str, List[Any]]:
+    """Empty value lists for every dictionary-encoded column of a table."""
+    return {column: [] for column in dictionary_columns(columns)}
+
+def encode_value(column: str, value: Any, dictionaries: Dict[str, List[Any]]) -> Any:
+    """Encode one cell, adding new dictionary values as needed."""
+    values = dictionaries.get(column)
+    if values is None:
+        return value
+    try:
+        return values.index(value)
+    except ValueError:
+        values.append(value)
+        return len(values) - 1
+
+def encode_row(row: Dict[str, Any], columns: List[str],
+               dictionaries: Dict[str, List[Any]]) -> List[Any]:
+    """One dict row as an array in column order."""
+    return [encode_value(column, row.get(column), dictionaries) for column in columns]
+
+def encode_rows(rows: Iterable[Dict[str, Any]], columns: List[str],
+                dictionaries: Optional[Dict[str, List[Any]]] = None) -> Dict[str, Any]:
+    """Encode dict rows; returns {"rows": [[...]], "dictionaries": {...}}."""
+    if dictionaries is None:
+        dictionaries = empty_dictionaries(columns)
+    codes = {column: {value: i for i, value in enumerate(values)}
+             for column, values in dictionaries.items()}
+    encoded = []
+    for row in rows:
+        out = []
+        for column in columns:
+            value = row.get(column)
+            lookup = codes.get(column)
+            if lookup is not None:
+                code = lookup.get(value)
+                if code is None:
+                    code = lookup[value] = len(dictionaries[column])
+                    dictionaries[column].append(value)
+                value = code
+            out.append(value)
+        encoded.append(out)
+    return {"rows": encoded, "dictionaries": dictionaries}
+
+def encode_changes(changes: Dict[str, Any], columns: List[str],
+                   dictionaries: Dict[str, List[Any]]) -> Dict[int, Any]:
+    """Column-name changes as {column index: encoded value}."""
+    return {
+        columns.index(column): encode_value(column, value, dictionaries)
+        for column, value in changes.items()
+        if column in columns
+    }
+
+def decode_row(row: List[Any], columns: List[str],
+               dictionaries: Dict[str, List[Any]]) -> Dict[str, Any]:
+    """One encoded array back to a dict row."""
+    decoded = {}
+    for column, value in zip(columns, row):
+        values = dictionaries.get(column)
+        decoded[column] = values[value] if values is not None and value is not None else value
+    return decoded
+
+def decode_rows(table: Dict[str, Any], columns: List[str]) -> List[Dict[str, Any]]:
+    """Inverse of ``encode_rows``."""
+    return [decode_row(row, columns, table["dictionaries"]) for row in table["rows"]]
+
+# Sample values for the dictionary columns, used by ``measure``.
+_SAMPLE_VALUES = {
+    "Status_Meja": ["AVAILABLE", "DIPESAN", "TERPAKAI"],
+    "Kategori": ["Makanan", "Minuman"],
+    "Metode_Pembayaran": ["Cash", "Credit Card", "Debit Card", "Digital Wallet"],
+    "Status_Reservasi": ["PENDING", "CONFIRMED", "CANCELLED", "COMPLETED"],
+}
+
+def _sample_value(column: str, i: int, rng: random.Random) -> Any:
+    if column in _SAMPLE_VALUES:
+        return rng.choice(_SAMPLE_VALUES[column])
+    if column.startswith("ID_"):
+        return f"{column[3:6].upper()}{rng.randint(1, 500)}"
+    if column.startswith(("Tanggal", "Waktu")):
+        return f"{rng.randint(1, 28):02d}-{rng.randint(1, 12):02d}-2024"
+    if column in ("Gaji", "Harga_Menu", "Total_Harga", "Jumlah_Bayar"):
+        return float(rng.randint(10, 500) * 1000)
+    if column == "Nomor_Meja":
+        return i + 1
+    return f"{column.split('_')[0]} {i}"
+
+def measure(rows_per_table: int = 1000, repeat: int = 20) -> List[Dict[str, Any]]:
+    """Compare JSON size and encode+serialize time: dict rows vs columnar."""
+    rng = random.Random(0)
+    results = []
+    for table, schema in TABLE_SCHEMAS.items():
+        columns = schema["columns"]
+        rows = [{column: _sample_value(column, i, rng) for column in columns}
+                for i in range(rows_per_table)]
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            as_dicts = json.dumps(rows)
+        dict_ms = (time.perf_counter() - start) / repeat * 1000
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            as_columns = json.dumps(encode_rows(rows, columns))
+        columnar_ms = (time.perf_counter() - start) / repeat * 1000
+
+        assert decode_rows(json.loads(as_columns), columns) == rows
+        results.append({
+            "table": table,
+            "rows": rows_per_table,
+            "dict_kb": round(len(as_dicts) / 1024, 1),
+            "columnar_kb": round(len(as_columns) / 1024, 1),
+            "saved_pct": round(100 * (1 - len(as_columns) / len(as_dicts)), 1),
+            "dict_ms": round(dict_ms, 2),
+            "columnar_ms": round(columnar_ms, 2),
+        })
+    return results
+
+if __name__ == "__main__":
+    for row in measure():
+        print(row)
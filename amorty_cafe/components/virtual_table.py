@@ -0,0 +1,179 @@
+"""Windowed table that only renders the visible rows plus a buffer."""
+import reflex as rx
+from reflex.event import EventSpec
+from typing import Callable, Iterable, List, Optional, Tuple
+from ..columnar import dictionary_columns
+
+# Rows have a fixed height so scroll offset maps directly to a row index.
+ROW_HEIGHT = 44
+VIEWPORT_HEIGHT = 528
+BUFFER_ROWS = 20
+# Milliseconds scrolling must pause before the window is checked
+SCROLL_DEBOUNCE_MS = 100
+
+def visible_range(scroll_top: float, total: int, row_height: int = ROW_HEIGHT,
+                  viewport_height: int = VIEWPORT_HEIGHT) -> Tuple[int, int]:
+    """Row indices [first, last) currently inside the viewport."""
+    first = max(int(scroll_top // row_height), 0)
+    last = first + -(-viewport_height // row_height) + 1
+    return min(first, total), min(last, total)
+
+def next_window(scroll_top: float, total: int, loaded_start: int, loaded_count: int,
+                row_height: int = ROW_HEIGHT, viewport_height: int = VIEWPORT_HEIGHT,
+                buffer: int = BUFFER_ROWS) -> Optional[Tuple[int, int]]:
+    """Window (offset, limit) to fetch for ``scroll_top``.
+
+    Returns None while the visible rows are still inside the loaded
+    window, so most scroll events cost no fetch and no state change.
+    """
+    first, last = visible_range(scroll_top, total, row_height, viewport_height)
+    if loaded_start <= first and last <= loaded_start + loaded_count:
+        return None
+    start = max(first - buffer, 0)
+    end = min(last + buffer, total)
+    return start, end - start
+
+def window_size(row_height: int = ROW_HEIGHT, viewport_height: int = VIEWPORT_HEIGHT,
+                buffer: int = BUFFER_ROWS) -> int:
+    """Rows in the first window (top of the table)."""
+    return -(-viewport_height // row_height) + 1 + buffer
+
+def spacer_px(rows: int, row_height: int = ROW_HEIGHT) -> str:
+    """CSS height standing in for ``rows`` rows that are not rendered."""
+    return f"{max(rows, 0) * row_height}px"
+
+def scroll_to_top(table_id: str) -> EventSpec:
+    """Reset a virtual table's scroll position (e.g. after a filter change)."""
+    return rx.call_script(
+        f"var el = document.getElementById('vt-{table_id}'); if (el) {{ el.scrollTop = 0; }}"
+    )
+
+def watch_scroll(table_id: str, row_height: int = ROW_HEIGHT, viewport_height: int = VIEWPORT_HEIGHT,
+                 delay_ms: int = SCROLL_DEBOUNCE_MS) -> EventSpec:
+    """Install a debounced scroll listener on a virtual table.
+
+    It compares the visible rows (same rule as ``visible_range``) with
+    the loaded window in the table's data-start/data-count attributes
+    and clicks the hidden fetch button only when they leave it, so
+    scrolling inside the window sends no events at all.
+    """
+    visible_rows = -(-viewport_height // row_height) + 1
+    return rx.call_script(
+        f"""(() => {{
+  const el = document.getElementById('vt-{table_id}');
+  if (!el || el.dataset.watching) return;
+  el.dataset.watching = '1';
+  let timer = null;
+  el.addEventListener('scroll', () => {{
+    clearTimeout(timer);
+    timer = setTimeout(() => {{
+      const total = Number(el.dataset.total), start = Number(el.dataset.start), count = Number(el.dataset.count);
+      const first = Math.min(Math.max(Math.floor(el.scrollTop / {row_height}), 0), total);
+      const last = Math.min(first + {visible_rows}, total);
+      if (first < start || last > start + count) {{
+        const fetch = document.getElementById('vt-{table_id}-fetch');
+        if (fetch) fetch.click();
+      }}
+    }}, {delay_ms});
+  }}, {{passive: true}});
+}})()"""
+    )
+
+def virtual_table(
+    table_id: str,
+    rows: rx.Var,
+    columns: List[str],
+    top_spacer: rx.Var,
+    bottom_spacer: rx.Var,
+    on_scroll: Callable,
+    window_start: rx.Var,
+    total: rx.Var,
+    dictionaries: Optional[rx.Var] = None,
+    actions: Optional[Callable[[rx.Var], rx.Component]] = None,
+    on_sort: Optional[Callable] = None,
+    sort_field: Optional[rx.Var] = None,
+    sort_desc: Optional[rx.Var] = None,
+    sortable: Optional[Iterable[str]] = None,
+    header_class: str = "",
+    cell_class: str = "",
+    row_height: int = ROW_HEIGHT,
+    viewport_height: int = VIEWPORT_HEIGHT,
+) -> rx.Component:
+    """Render the loaded window of ``rows`` inside a fixed-height scroller.
+
+    Rows are columnar arrays in ``columns`` order (see columnar.py);
+    dictionary-encoded columns are decoded through ``dictionaries``.
+    ``top_spacer``/``bottom_spacer`` are CSS heights for the rows above and
+    below the window (see ``spacer_px``). ``window_start`` and ``total``
+    are the loaded window's first row index and the matching row count.
+    The browser checks scroll positions itself (see ``watch_scroll``) and
+    calls ``on_scroll`` with the container's scrollTop only when the
+    visible rows leave the loaded window; the handler should still call
+    ``next_window`` and fetch only when that returns a new window.
+
+    With ``on_sort`` the headers of ``sortable`` columns (default: all)
+    call it with the column name; sorting itself happens server side and
+    ``sort_field``/``sort_desc`` only drive the arrow shown.
+    """
+    column_count = len(columns) + (1 if actions else 0)
+    encoded = set(dictionary_columns(columns)) if dictionaries is not None else set()
+
+    def cell(item: rx.Var, index: int, column: str) -> rx.Var:
+        if column in encoded:
+            return dictionaries[column][item[index]]
+        return item[index]
+    row_style = {"height": f"{row_height}px"}
+    cell_style = {"white_space": "nowrap", "overflow": "hidden", "text_overflow": "ellipsis"}
+
+    sortable = set(columns if sortable is None else sortable) if on_sort else set()
+
+    def header(column: str) -> rx.Component:
+        if column not in sortable:
+            return rx.th(column, class_name=header_class)
+        arrow = rx.cond(sort_field == column, rx.cond(sort_desc, " ▼", " ▲"), "")
+        return rx.th(
+            column, arrow,
+            on_click=lambda: on_sort(column),
+            style={"cursor": "pointer", "user_select": "none"},
+            class_name=header_class,
+        )
+
+    def render_row(item: rx.Var) -> rx.Component:
+        cells = [rx.td(cell(item, i, column), style=cell_style, class_name=cell_class)
+                 for i, column in enumerate(columns)]
+        if actions:
+            cells.append(rx.td(actions(item), class_name=cell_class))
+        return rx.tr(*cells, style=row_style)
+
+    return rx.box(
+        rx.table(
+            rx.thead(
+                rx.tr(
+                    *[header(column) for column in columns],
+                    *([rx.th("Actions", class_name=header_class)] if actions else []),
+                ),
+                style={"position": "sticky", "top": "0", "z_index": "1"},
+            ),
+            rx.tbody(
+                rx.tr(rx.td(col_span=column_count), style={"height": top_spacer}),
+                rx.foreach(rows, render_row),
+                rx.tr(rx.td(col_span=column_count), style={"height": bottom_spacer}),
+            ),
+            width="100%",
+        ),
+        # Clicked by the scroll listener; reads scrollTop and calls the handler
+        rx.el.button(
+            id=f"vt-{table_id}-fetch",
+            type="button",
+            on_click=rx.call_script(
+                f"document.getElementById('vt-{table_id}').scrollTop",
+                callback=on_scroll,
+            ),
+            style={"display": "none"},
+        ),
+        id=f"vt-{table_id}",
+        custom_attrs={"data-start": window_start, "data-count": rows.length(), "data-total": total},
+        on_mount=watch_scroll(table_id, row_height, viewport_height),
+        style={"height": f"{viewport_height}px", "overflow_y": "auto"},
+        width="100%",
+    )
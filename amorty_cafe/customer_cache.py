@@ -0,0 +1,155 @@
+"""In-memory customer ID membership cache for login verification."""
+import asyncio
+import math
+import re
+import threading
+import time
+from typing import Iterable, List, Optional, Tuple
+
+import reflex as rx
+from .models_rafi import Customer
+from .phone import PhoneIndex
+
+# Format of a customer ID after normalize(), e.g. CUS1
+ID_FORMAT = re.compile(r"CUS\d+")
+
+class CustomerIdCache:
+    """Set of known ``ID_Customer`` values, loaded with a single query.
+
+    Lookups (hits and misses) are answered from memory. The set is kept
+    in sync by admin CRUD through ``add``/``discard`` and fully reloaded
+    after ``ttl`` seconds to pick up writes made by other processes.
+    An expired set keeps being served while one background thread
+    reloads it; only the very first load makes a caller wait.
+    Changes made while a reload is running are replayed on the reloaded
+    set, so a slow reload cannot undo them.
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._ids: set = set()
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        # Held by the one reload allowed to run at a time
+        self._refresh_lock = threading.Lock()
+        # One list of (added, customer_id) per reload in progress
+        self._journals: List[List[Tuple[bool, str]]] = []
+
+    @staticmethod
+    def normalize(customer_id: str) -> str:
+        """Normalize user input the same way IDs are stored (CUS1)."""
+        return (customer_id or "").strip().upper()
+
+    def verify(self, customer_id: str) -> str:
+        """The normalized ID if it has the CUS<n> format and exists, else ""."""
+        customer_id = self.normalize(customer_id)
+        if not ID_FORMAT.fullmatch(customer_id):
+            return ""
+        return customer_id if self.contains(customer_id) else ""
+
+    async def verify_async(self, customer_id: str) -> str:
+        """verify() for event handlers: the first load runs off the event loop."""
+        if self._loaded_at is None:
+            await asyncio.to_thread(self._ensure_fresh)
+        return self.verify(customer_id)
+
+    def refresh(self):
+        """Reload every customer ID, waiting for a reload already running."""
+        with self._refresh_lock:
+            self._reload()
+
+    def _refresh_in_background(self):
+        """Start a reload thread unless one is already running."""
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+
+        def run():
+            try:
+                self._reload()
+            except Exception as e:
+                print(f"Error reloading customer IDs: {e}")
+            finally:
+                self._refresh_lock.release()
+
+        threading.Thread(target=run, name="customer-id-refresh", daemon=True).start()
+
+    def _reload(self):
+        """Query every customer ID and swap in the new set (refresh lock held)."""
+        journal: List[Tuple[bool, str]] = []
+        with self._lock:
+            self._journals.append(journal)
+        try:
+            with rx.session() as session:
+                rows = session.query(Customer.ID_Customer).all()
+        except Exception:
+            with self._lock:
+                self._journals.remove(journal)
+            raise
+        ids = {self.normalize(row[0]) for row in rows}
+        with self._lock:
+            self._journals.remove(journal)
+            for added, customer_id in journal:
+                if added:
+                    ids.add(customer_id)
+                else:
+                    ids.discard(customer_id)
+            self._ids = ids
+            self._loaded_at = time.monotonic()
+
+    def _record(self, added: bool, customer_ids: Iterable[str]):
+        """Apply a change now and to every reload in progress (lock held)."""
+        for customer_id in customer_ids:
+            if added:
+                self._ids.add(customer_id)
+            else:
+                self._ids.discard(customer_id)
+            for journal in self._journals:
+                journal.append((added, customer_id))
+
+    def _ensure_fresh(self):
+        if self._loaded_at is None:
+            # Nothing to serve yet; concurrent first callers share one load
+            with self._refresh_lock:
+                if self._loaded_at is None:
+                    self._reload()
+        elif time.monotonic() - self._loaded_at > self.ttl:
+            self._refresh_in_background()
+
+    def contains(self, customer_id: str) -> bool:
+        """Check whether a customer ID exists."""
+        customer_id = self.normalize(customer_id)
+        if not customer_id:
+            return False
+        self._ensure_fresh()
+        return customer_id in self._ids
+
+    def add(self, customer_id: str):
+        """Record a newly inserted customer."""
+        with self._lock:
+            self._record(True, [self.normalize(customer_id)])
+
+    def add_many(self, customer_ids: Iterable[str]):
+        """Record several newly inserted customers."""
+        with self._lock:
+            self._record(True, [self.normalize(cid) for cid in customer_ids])
+
+    def discard(self, customer_id: str):
+        """Forget a deleted customer."""
+        with self._lock:
+            self._record(False, [self.normalize(customer_id)])
+
+    def invalidate(self):
+        """Reload in the background on the next lookup."""
+        if self._loaded_at is not None:
+            self._loaded_at = -math.inf
+
+# Global customer ID cache
+customer_ids = CustomerIdCache()
+
+def load_customer_phones():
+    """(ID_Customer, normalised phone) for every customer."""
+    with rx.session() as session:
+        return session.query(Customer.ID_Customer, Customer.Kontak_Normal).all()
+
+# Global customer phone index (exact and last-digits lookups)
+customer_phones = PhoneIndex(load_customer_phones)
@@ -6,6 +6,8 @@ from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 import reflex as rx
 from .models import *
+from .phone import add_normalized_column, backfill
+from .schema import drop_stale_indexes
 from datetime import datetime, timedelta
 import json
 
@@ -69,9 +71,40 @@ def setup_database():
     success = oracle_db.connect()
     if success:
         oracle_db.create_tables()
+        migrate_phone_numbers()
+        create_indexes()
         seed_sample_data()
     return success
 
+def create_indexes():
+    """Create the customer filter/sort indexes missing from older tables
+    and drop auto-named ``ix_*`` indexes no longer declared."""
+    try:
+        drop_stale_indexes(oracle_db.engine, Customer)
+        for index in Customer.__table__.indexes:
+            index.create(oracle_db.engine, checkfirst=True)
+        print("✅ Indexes up to date")
+    except Exception as e:
+        print(f"❌ Failed to create indexes: {e}")
+
+def migrate_phone_numbers():
+    """Add customer.phone_normalized to older databases and backfill it from phone."""
+    session = oracle_db.get_session()
+    if not session:
+        print("❌ Cannot migrate phone numbers - no database session")
+        return
+
+    try:
+        if add_normalized_column(oracle_db.engine, Customer, "phone_normalized"):
+            print("✅ Added column customer.phone_normalized")
+        changed = backfill(session, Customer, "phone", "phone_normalized")
+        print(f"✅ Normalized {changed} phone numbers")
+    except Exception as e:
+        print(f"❌ Failed to migrate phone numbers: {e}")
+        session.rollback()
+    finally:
+        session.close()
+
 def seed_sample_data():
     """Seed the database with sample data."""
     session = oracle_db.get_session()
@@ -85,20 +118,19 @@ def seed_sample_data():
             return
 
         # Create sample users
-        from .auth import AuthState
-        auth_state = AuthState()
+        from .passwords import hash_password
 
         admin_user = User(
             username="admin",
             email="admin@amorty.com",
-            hashed_password=auth_state.hash_password("admin123"),
+            hashed_password=hash_password("admin123"),
             role=UserRole.ADMIN
         )
 
         customer_user = User(
             username="customer1",
             email="customer@example.com",
-            hashed_password=auth_state.hash_password("customer123"),
+            hashed_password=hash_password("customer123"),
             role=UserRole.CUSTOMER
         )
 
@@ -6,6 +6,9 @@ from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 import reflex as rx
 from .models_rafi import *
+from .phone import add_normalized_column, backfill
+from .schema import drop_stale_indexes
+from .integrity import apply_constraints, scan_orphans
 from datetime import datetime
 import json
 
@@ -120,8 +123,11 @@ class OracleDatabaseRafi:
 # Global database instance
 oracle_db_rafi = OracleDatabaseRafi()
 
-def setup_database_rafi():
-    """Setup database connection and create tables for Rafi's system."""
+def setup_database_rafi(fix_orphans: bool = False):
+    """Setup database connection and create tables for Rafi's system.
+
+    Orphaned rows are only reported unless ``fix_orphans`` is set.
+    """
     print("🚀 Setting up Rafi's Oracle database...")
     print("=" * 50)
     
@@ -133,10 +139,67 @@ def setup_database_rafi():
     success = oracle_db_rafi.connect()
     if success:
         oracle_db_rafi.create_tables()
+        migrate_phone_numbers_rafi()
+        create_indexes_rafi()
+        enforce_integrity_rafi(fix_orphans)
         seed_sample_data_rafi()
         return True
     return False
 
+def create_indexes_rafi():
+    """Create the declared model indexes (filter/sort columns) missing from
+    older tables and drop auto-named ``ix_*`` indexes no longer declared."""
+    try:
+        for model in (Customer, Karyawan, Meja, Menu, Pesanan, Transaksi, Pembayaran, Reservasi):
+            drop_stale_indexes(oracle_db_rafi.engine, model)
+            for index in model.__table__.indexes:
+                index.create(oracle_db_rafi.engine, checkfirst=True)
+        print("✅ Indexes up to date")
+    except Exception as e:
+        print(f"❌ Failed to create indexes: {e}")
+
+def enforce_integrity_rafi(fix: bool = False):
+    """Report orphans (or, with ``fix``, clean them up by the delete policies),
+    then add the declared UNIQUE/FK constraints."""
+    session = oracle_db_rafi.get_session()
+    if not session:
+        print("❌ Cannot check integrity - no database session")
+        return
+
+    try:
+        found = False
+        for result in scan_orphans(session, fix=fix):
+            if result["orphans"]:
+                found = True
+                print(f"⚠️  {result['relation']}: {result['orphans']} orphans, {result['fixed']} fixed ({result['policy']})")
+        if found and not fix:
+            print("ℹ️  Orphans were not changed; run setup with --fix-orphans to apply the delete policies")
+        for constraint in apply_constraints(oracle_db_rafi.engine):
+            print(f"✅ Added constraint {constraint}")
+    except Exception as e:
+        print(f"❌ Failed to enforce integrity: {e}")
+        session.rollback()
+    finally:
+        session.close()
+
+def migrate_phone_numbers_rafi():
+    """Add CUSTOMER.Kontak_Normal to older databases and backfill it from Kontak_Customer."""
+    session = oracle_db_rafi.get_session()
+    if not session:
+        print("❌ Cannot migrate phone numbers - no database session")
+        return
+
+    try:
+        if add_normalized_column(oracle_db_rafi.engine, Customer, "Kontak_Normal"):
+            print("✅ Added column CUSTOMER.Kontak_Normal")
+        changed = backfill(session, Customer, "Kontak_Customer", "Kontak_Normal")
+        print(f"✅ Normalized {changed} phone numbers")
+    except Exception as e:
+        print(f"❌ Failed to migrate phone numbers: {e}")
+        session.rollback()
+    finally:
+        session.close()
+
 def seed_sample_data_rafi():
     """Seed the database with sample data for Rafi's schema."""
     session = oracle_db_rafi.get_session()
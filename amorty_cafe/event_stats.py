@@ -0,0 +1,60 @@
+"""Count websocket events per completed form (enable with EVENT_STATS=1)."""
+import os
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+from reflex.middleware import Middleware
+
+# Handlers that complete a form; everything its state receives before them counts.
+SUBMIT_HANDLERS = {
+    "add_item", "update_item", "save_item",
+    "admin_login", "customer_login", "handle_login", "handle_signup",
+    "handle_admin_login", "handle_customer_login",
+}
+
+class EventCounter(Middleware):
+    """Middleware that counts form events per client between submits.
+
+    Every event a state receives from a client counts towards that
+    client's next submit to the same state: per-keystroke ``set_*``
+    handlers, debounced lookups such as ``search_fk``, picks, and the
+    submit itself.
+    """
+
+    def __init__(self, verbose: bool = True):
+        self.verbose = verbose
+        self.counts: Counter = Counter()
+        self.per_form: Dict[str, List[int]] = defaultdict(list)
+        self._pending: Dict[tuple, int] = defaultdict(int)
+
+    async def preprocess(self, app, state, event) -> Optional[object]:
+        state_name, _, handler = event.name.rpartition(".")
+        self.counts[event.name] += 1
+        key = (event.token, state_name)
+        self._pending[key] += 1
+        if handler in SUBMIT_HANDLERS:
+            events = self._pending.pop(key)
+            self.per_form[event.name].append(events)
+            if self.verbose:
+                print(f"[event-stats] {event.name}: {events} events for this form")
+        return None
+
+    async def postprocess(self, app, state, event, update):
+        return update
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """Forms completed and average events per form, by submit handler."""
+        return {
+            name: {
+                "forms": len(events),
+                "events_per_form": round(sum(events) / len(events), 1),
+            }
+            for name, events in self.per_form.items()
+        }
+
+event_counter = EventCounter()
+
+def install(app):
+    """Attach the counter to an app when EVENT_STATS is set."""
+    if os.getenv("EVENT_STATS"):
+        app.add_middleware(event_counter)
@@ -0,0 +1,160 @@
+"""Shared ID/label lookups with prefix typeahead for foreign key pickers."""
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# A loader returns (id, label) pairs for every row of a referenced table
+Loader = Callable[[], Iterable[Tuple[str, str]]]
+
+def normalize(text) -> str:
+    """Lowercase and collapse whitespace so search ignores case and spacing."""
+    return " ".join(str(text or "").lower().split())
+
+class PrefixIndex:
+    """Sorted (key, id) entries searched by bisect.
+
+    Every row gets one key for its ID, one for its full label and one for
+    each later word of the label, so "bud" finds "Andi Budiman". A search
+    walks only the entries starting with the prefix and stops after
+    ``limit`` distinct IDs.
+    """
+
+    def __init__(self, pairs: Iterable[Tuple[str, str]] = ()):
+        self.labels: Dict[str, str] = {}
+        entries = []
+        for item_id, label in pairs:
+            item_id = str(item_id)
+            self.labels[item_id] = label or ""
+            entries.extend((key, item_id) for key in self._keys(item_id, label))
+        entries.sort()
+        self.entries: List[Tuple[str, str]] = entries
+
+    @staticmethod
+    def _keys(item_id: str, label: str) -> List[str]:
+        keys = {normalize(item_id)}
+        words = normalize(label).split(" ")
+        for i in range(len(words)):
+            if words[i]:
+                keys.add(" ".join(words[i:]))
+        return sorted(keys)
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, str]]:
+        prefix = normalize(query)
+        found: Dict[str, None] = {}
+        entries = self.entries
+        i = bisect.bisect_left(entries, (prefix, ""))
+        while i < len(entries) and len(found) < limit:
+            key, item_id = entries[i]
+            if not key.startswith(prefix):
+                break
+            found[item_id] = None
+            i += 1
+        return [{"id": item_id, "label": self.labels[item_id]} for item_id in found]
+
+    def put(self, item_id: str, label: str):
+        """Add a row, or replace its keys after a label change."""
+        item_id = str(item_id)
+        self.remove(item_id)
+        self.labels[item_id] = label or ""
+        for key in self._keys(item_id, label):
+            bisect.insort(self.entries, (key, item_id))
+
+    def remove(self, item_id: str):
+        item_id = str(item_id)
+        label = self.labels.pop(item_id, None)
+        if label is None:
+            return
+        for key in self._keys(item_id, label):
+            i = bisect.bisect_left(self.entries, (key, item_id))
+            if i < len(self.entries) and self.entries[i] == (key, item_id):
+                del self.entries[i]
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+class FKLookup:
+    """Per-table prefix indexes built from a loader and reloaded after ``ttl``.
+
+    Pickers call ``search`` for the top matches of what the user typed;
+    only those few rows ever reach the browser. CRUD keeps the indexes
+    current through ``put``/``remove``; the TTL picks up writes made
+    elsewhere.
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._loaders: Dict[str, Loader] = {}
+        self._indexes: Dict[str, Tuple[float, PrefixIndex]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, table: str, loader: Loader):
+        self._loaders[table] = loader
+        self._indexes.pop(table, None)
+
+    def _index(self, table: str) -> Optional[PrefixIndex]:
+        entry = self._indexes.get(table)
+        if entry is not None and time.monotonic() - entry[0] <= self.ttl:
+            return entry[1]
+        loader = self._loaders.get(table)
+        if loader is None:
+            return None
+        index = PrefixIndex(loader())
+        with self._lock:
+            self._indexes[table] = (time.monotonic(), index)
+        return index
+
+    def search(self, table: str, query: str, limit: int = 10) -> List[Dict[str, str]]:
+        """Top ``limit`` rows whose ID or label starts with ``query``."""
+        index = self._index(table)
+        return index.search(query, limit) if index is not None else []
+
+    def label(self, table: str, item_id: str) -> str:
+        index = self._index(table)
+        return index.labels.get(str(item_id), "") if index is not None else ""
+
+    def put(self, table: str, item_id: str, label: str):
+        """Record an inserted or renamed row (no-op until the index is built)."""
+        entry = self._indexes.get(table)
+        if entry is not None:
+            with self._lock:
+                entry[1].put(item_id, label)
+
+    def remove(self, table: str, item_id: str):
+        entry = self._indexes.get(table)
+        if entry is not None:
+            with self._lock:
+                entry[1].remove(item_id)
+
+    def invalidate(self, table: Optional[str] = None):
+        """Force a reload of one table (or all) on the next search."""
+        if table is None:
+            self._indexes.clear()
+        else:
+            self._indexes.pop(table, None)
+
+def row_label(row: Dict, label_fields: Iterable[str]) -> str:
+    """Label for a row from its label columns, e.g. "Meja 3" or a name."""
+    return " ".join(str(row.get(field, "")) for field in label_fields if row.get(field) not in (None, ""))
+
+def benchmark(rows: int = 200_000, queries: int = 2000) -> Dict[str, float]:
+    """Build time and average search time for a synthetic name table."""
+    import random
+    rng = random.Random(0)
+    first = ["Andi", "Budi", "Citra", "Dewi", "Eko", "Fitri", "Gilang", "Hana", "Intan", "Joko"]
+    last = ["Saputra", "Nurhaliza", "Wijaya", "Pratama", "Lestari", "Santoso", "Kusuma"]
+    pairs = [(f"KAR{i}", f"{rng.choice(first)} {rng.choice(last)} {i}") for i in range(1, rows + 1)]
+
+    start = time.perf_counter()
+    index = PrefixIndex(pairs)
+    build_s = time.perf_counter() - start
+
+    terms = [rng.choice(first + last)[:rng.randint(1, 4)] for _ in range(queries)]
+    start = time.perf_counter()
+    for term in terms:
+        index.search(term, 10)
+    search_ms = (time.perf_counter() - start) / queries * 1000
+    return {"rows": rows, "build_s": round(build_s, 2), "search_ms": round(search_ms, 3)}
+
+if __name__ == "__main__":
+    print(benchmark())
@@ -1,8 +1,17 @@
 """Comprehensive Amorty Cafe Admin Dashboard with full CRUD features."""
 import reflex as rx
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional
 from datetime import datetime, date
 import json
+import os
+from .event_stats import install as install_event_stats
+from .fk_lookup import FKLookup, row_label
+from .list_ops import insert_row, patch_row, remove_row
+from .rate_limit import check_login_attempt, login_succeeded
+from .columnar import encode_changes, encode_row, encode_rows
+from .components import virtual_table
+from .store_log import OperationLog
+from .table_store import COLUMN_CHOICES, TableStore, TABLE_SCHEMAS, view
 
 # Sample data storage (in production, this would be database)
 sample_data = {
@@ -39,20 +48,113 @@ sample_data = {
     ]
 }
 
+# Keyed store shared by all admin sessions, persisted as snapshot + op log.
+# Only the process holding the store's lock writes; other workers get a read-only
+# copy that is never updated, so run this app with a single worker.
+admin_store = TableStore()
+admin_log = OperationLog(os.getenv("ADMIN_STORE_DIR", ".amorty_store"))
+admin_log.acquire()
+if not admin_log.restore(admin_store):
+    admin_store.attach(None)
+    admin_store.load(sample_data)
+    if admin_log.is_writer:
+        admin_log.snapshot(admin_store)
+        admin_store.attach(admin_log.record)
+
+READ_ONLY_MESSAGE = "Data hanya bisa diubah dari proses utama server."
+
+# Columns shown next to the ID in foreign key pickers, per referenced table
+FK_LABELS = {
+    "customers": ["Nama_Customer"],
+    "karyawan": ["Nama_Karyawan"],
+    "meja": ["Nomor_Meja"],
+    "menu": ["Nama_Menu"],
+    "pesanan": [],
+    "transaksi": [],
+}
+
+# Form field -> table it references
+FK_FIELDS = {TABLE_SCHEMAS[table]["id_field"]: table for table in FK_LABELS}
+
+# Matches returned to a foreign key picker per search
+FK_MATCHES = 8
+
+def store_loader(table: str):
+    """(ID, label) pairs read from the shared store."""
+    def load():
+        id_field = TABLE_SCHEMAS[table]["id_field"]
+        return [(row[id_field], row_label(row, FK_LABELS[table])) for row in admin_store[table]]
+    return load
+
+# ID/label index over admin_store for foreign key pickers
+admin_lookup = FKLookup()
+for _table in FK_LABELS:
+    admin_lookup.register(_table, store_loader(_table))
+
+# Form fields per table; IDs and creation timestamps are set by add_item
+FORM_FIELDS = {
+    "customers": ["Nama_Customer", "Kontak_Customer"],
+    "karyawan": ["Nama_Karyawan", "Tanggal_Masuk", "Gaji"],
+    "meja": ["Nomor_Meja", "Status_Meja", "ID_Karyawan"],
+    "menu": ["Nama_Menu", "Harga_Menu", "Kategori"],
+    "pesanan": ["ID_Customer", "ID_Karyawan", "ID_Menu", "ID_Meja"],
+    "transaksi": ["ID_Pesanan", "Total_Harga", "ID_Karyawan"],
+    "pembayaran": ["ID_Pesanan", "ID_Transaksi", "ID_Karyawan", "Metode_Pembayaran", "Jumlah_Bayar"],
+    "reservasi": ["ID_Customer", "ID_Meja", "ID_Karyawan", "Tanggal_Reservasi", "Waktu_Mulai", "Waktu_Selesai", "Status_Reservasi"],
+}
+
+FORM_DEFAULTS = {
+    "meja": {"Status_Meja": "AVAILABLE"},
+    "menu": {"Kategori": "Makanan"},
+    "pembayaran": {"Metode_Pembayaran": "Cash"},
+    "reservasi": {"Status_Reservasi": "PENDING"},
+}
+
+# Select value meaning "no filter" (selects cannot hold an empty value)
+ALL_VALUES = "SEMUA"
+
+FLOAT_FIELDS = {"Gaji", "Harga_Menu", "Total_Harga", "Jumlah_Bayar"}
+INT_FIELDS = {"Nomor_Meja"}
+
+def form_values(table: str, form_data: Dict[str, Any], partial: bool = True) -> Dict[str, Any]:
+    """Typed values for a table from submitted form data.
+
+    With ``partial`` only fields present in the form are returned, so an
+    edit form never blanks columns it does not show.
+    """
+    values = {}
+    for field in FORM_FIELDS.get(table, []):
+        if partial and field not in form_data:
+            continue
+        value = form_data.get(field, FORM_DEFAULTS.get(table, {}).get(field, ""))
+        if field in FLOAT_FIELDS:
+            value = float(value) if value else 0
+        elif field in INT_FIELDS:
+            value = int(value) if value else 0
+        values[field] = value
+    return values
+
 class AdminState(rx.State):
     """Admin dashboard state management."""
     is_logged_in: bool = False
     current_page: str = "login"
-    username: str = ""
-    password: str = ""
     customer_id: str = ""
     error_message: str = ""
     
     # Active tab for admin dashboard
     active_tab: str = "dashboard"
     
-    # Data storage
-    data: Dict = sample_data
+    # Per-session view of the shared admin_store: only the visible window
+    window_start: int = 0
+    window_size: int = virtual_table.window_size()
+    filters: Dict[str, str] = {}
+    sort_field: str = ""
+    sort_desc: bool = False
+    # Rows are columnar arrays in TABLE_SCHEMAS column order (see columnar.py)
+    rows: List[List[Any]] = []
+    dictionaries: Dict[str, List[Any]] = {}
+    total_rows: int = 0
+    table_counts: Dict[str, int] = admin_store.counts()
     
     # Modal states
     show_add_modal: bool = False
@@ -60,65 +162,33 @@ class AdminState(rx.State):
     current_edit_item: Dict = {}
     current_table: str = ""
     
-    # Form states for each table
-    # Customer form
-    customer_nama: str = ""
-    customer_kontak: str = ""
-    
-    # Karyawan form
-    karyawan_nama: str = ""
-    karyawan_tanggal: str = ""
-    karyawan_gaji: str = ""
-    
-    # Meja form
-    meja_nomor: str = ""
-    meja_status: str = "AVAILABLE"
-    meja_karyawan: str = ""
-    
-    # Menu form
-    menu_nama: str = ""
-    menu_harga: str = ""
-    menu_kategori: str = "Makanan"
-    
-    # Pesanan form
-    pesanan_customer: str = ""
-    pesanan_karyawan: str = ""
-    pesanan_menu: str = ""
-    pesanan_meja: str = ""
-    
-    # Transaksi form
-    transaksi_pesanan: str = ""
-    transaksi_total: str = ""
-    transaksi_karyawan: str = ""
+    # Values shown when a form opens; inputs are uncontrolled and the
+    # whole form is sent once on submit
+    form_defaults: Dict[str, Any] = {}
+    # Text in each foreign key picker and its top matches; pickers are
+    # controlled (debounced) so a picked suggestion replaces the text
+    fk_query: Dict[str, str] = {field: "" for field in FK_FIELDS}
+    fk_options: Dict[str, List[Dict[str, str]]] = {field: [] for field in FK_FIELDS}
     
-    # Pembayaran form
-    pembayaran_pesanan: str = ""
-    pembayaran_transaksi: str = ""
-    pembayaran_karyawan: str = ""
-    pembayaran_metode: str = "Cash"
-    pembayaran_jumlah: str = ""
-    
-    # Reservasi form
-    reservasi_customer: str = ""
-    reservasi_meja: str = ""
-    reservasi_karyawan: str = ""
-    reservasi_tanggal: str = ""
-    reservasi_mulai: str = ""
-    reservasi_selesai: str = ""
-    reservasi_status: str = "PENDING"
-    
-    def admin_login(self):
+    def admin_login(self, form_data: Dict[str, Any]):
         """Handle admin login."""
-        if self.username == "admin" and self.password == "admin":
+        username = form_data.get("username", "")
+        self.error_message = check_login_attempt(self.router.session.client_ip, username)
+        if self.error_message:
+            return
+        if username == "admin" and form_data.get("password", "") == "admin":
+            login_succeeded(self.router.session.client_ip, username)
             self.is_logged_in = True
             self.current_page = "admin"
             self.error_message = ""
         else:
             self.error_message = "Username atau password admin salah!"
     
-    def customer_login(self):
+    def customer_login(self, form_data: Dict[str, Any]):
         """Handle customer login."""
-        if self.customer_id and self.customer_id.startswith("CUS"):
+        customer_id = form_data.get("customer_id", "")
+        if customer_id and customer_id.startswith("CUS"):
+            self.customer_id = customer_id
             self.is_logged_in = True
             self.current_page = "customer"
             self.error_message = ""
@@ -129,8 +199,6 @@ class AdminState(rx.State):
         """Handle logout."""
         self.is_logged_in = False
         self.current_page = "login"
-        self.username = ""
-        self.password = ""
         self.customer_id = ""
         self.error_message = ""
         self.active_tab = "dashboard"
@@ -138,247 +206,165 @@ class AdminState(rx.State):
     def set_active_tab(self, tab: str):
         """Set active tab."""
         self.active_tab = tab
+        self.window_start = 0
+        self.window_size = virtual_table.window_size()
+        self.filters = {}
+        self.sort_field = ""
+        self.sort_desc = False
         self.close_modals()
+        self.refresh_view()
+    
+    def refresh_view(self):
+        """Reload the visible window and table counts from the shared store."""
+        if self.active_tab in TABLE_SCHEMAS:
+            current = view(admin_store, self.active_tab, self.window_start, self.window_size,
+                           self.filters, self.sort_field or None, self.sort_desc)
+            encoded = encode_rows(current["rows"], TABLE_SCHEMAS[self.active_tab]["columns"])
+            self.rows = encoded["rows"]
+            self.dictionaries = encoded["dictionaries"]
+            self.total_rows = current["total"]
+            self.table_counts = current["counts"]
+        else:
+            self.rows = []
+            self.dictionaries = {}
+            self.total_rows = 0
+            self.table_counts = admin_store.counts()
+    
+    def set_filter(self, field: str, value: str):
+        """Filter the current table on an indexed column and go back to the top."""
+        if value and value != ALL_VALUES:
+            self.filters[field] = value
+        else:
+            self.filters.pop(field, None)
+        self.window_start = 0
+        self.window_size = virtual_table.window_size()
+        self.refresh_view()
+        return virtual_table.scroll_to_top(self.active_tab)
+    
+    def toggle_sort(self, field: str):
+        """Sort by a column; clicking it again reverses the order."""
+        if self.sort_field == field:
+            self.sort_desc = not self.sort_desc
+        else:
+            self.sort_field = field
+            self.sort_desc = False
+        self.window_start = 0
+        self.window_size = virtual_table.window_size()
+        self.refresh_view()
+        return virtual_table.scroll_to_top(self.active_tab)
+    
+    def scroll_table(self, scroll_top: float):
+        """Fetch a new window when scrolling leaves the loaded rows."""
+        window = virtual_table.next_window(
+            scroll_top or 0, self.total_rows, self.window_start, len(self.rows)
+        )
+        if window is not None:
+            self.window_start, self.window_size = window
+            self.refresh_view()
+    
+    @rx.var
+    def top_spacer(self) -> str:
+        return virtual_table.spacer_px(self.window_start)
+    
+    @rx.var
+    def bottom_spacer(self) -> str:
+        return virtual_table.spacer_px(self.total_rows - self.window_start - len(self.rows))
+    
+    def search_fk(self, field: str, query: str):
+        """Top matches for what was typed into a foreign key picker."""
+        self.fk_query[field] = query
+        self.fk_options[field] = admin_lookup.search(FK_FIELDS[field], query, FK_MATCHES) if query else []
+    
+    def pick_fk(self, field: str, item_id: str):
+        """Put a suggested ID into the picker input."""
+        self.fk_query[field] = item_id
+        self.fk_options[field] = []
     
     def generate_id(self, table: str) -> str:
-        """Generate new ID for table."""
-        prefixes = {
-            "customers": "CUS",
-            "karyawan": "KAR", 
-            "meja": "MJ",
-            "menu": "MN",
-            "pesanan": "PES",
-            "transaksi": "TRX",
-            "pembayaran": "PB",
-            "reservasi": "RSV"
-        }
-        
-        prefix = prefixes.get(table, "ID")
-        existing_ids = [item.get(f"ID_{table[:-1].title()}" if table != "karyawan" else "ID_Karyawan", "") 
-                       for item in self.data[table]]
-        
-        max_num = 0
-        for id_str in existing_ids:
-            if id_str.startswith(prefix):
-                try:
-                    num = int(id_str[len(prefix):])
-                    max_num = max(max_num, num)
-                except:
-                    pass
-        
-        return f"{prefix}{max_num + 1}"
+        """Generate new ID for table from the store's counter."""
+        return admin_store[table].generate_id()
     
     def show_add_form(self, table: str):
         """Show add form modal."""
         self.current_table = table
+        self.form_defaults = dict(FORM_DEFAULTS.get(table, {}))
+        self.fk_query = {field: "" for field in FK_FIELDS}
         self.show_add_modal = True
-        self.clear_form_fields()
     
-    def show_edit_form(self, table: str, item: Dict):
+    def show_edit_form(self, table: str, item_id: str):
         """Show edit form modal."""
+        item = dict(admin_store[table].get(item_id) or {})
         self.current_table = table
         self.current_edit_item = item
+        self.form_defaults = {**FORM_DEFAULTS.get(table, {}), **{k: str(v) for k, v in item.items()}}
+        self.fk_query = {field: self.form_defaults.get(field, "") for field in FK_FIELDS}
         self.show_edit_modal = True
-        self.populate_form_fields(item)
     
     def close_modals(self):
         """Close all modals."""
         self.show_add_modal = False
         self.show_edit_modal = False
         self.current_edit_item = {}
-        self.clear_form_fields()
-    
-    def clear_form_fields(self):
-        """Clear all form fields."""
-        self.customer_nama = ""
-        self.customer_kontak = ""
-        self.karyawan_nama = ""
-        self.karyawan_tanggal = ""
-        self.karyawan_gaji = ""
-        self.meja_nomor = ""
-        self.meja_status = "AVAILABLE"
-        self.meja_karyawan = ""
-        self.menu_nama = ""
-        self.menu_harga = ""
-        self.menu_kategori = "Makanan"
-        self.pesanan_customer = ""
-        self.pesanan_karyawan = ""
-        self.pesanan_menu = ""
-        self.pesanan_meja = ""
-        self.transaksi_pesanan = ""
-        self.transaksi_total = ""
-        self.transaksi_karyawan = ""
-        self.pembayaran_pesanan = ""
-        self.pembayaran_transaksi = ""
-        self.pembayaran_karyawan = ""
-        self.pembayaran_metode = "Cash"
-        self.pembayaran_jumlah = ""
-        self.reservasi_customer = ""
-        self.reservasi_meja = ""
-        self.reservasi_karyawan = ""
-        self.reservasi_tanggal = ""
-        self.reservasi_mulai = ""
-        self.reservasi_selesai = ""
-        self.reservasi_status = "PENDING"
-    
-    def populate_form_fields(self, item: Dict):
-        """Populate form fields with item data."""
-        table = self.current_table
-        
-        if table == "customers":
-            self.customer_nama = item.get("Nama_Customer", "")
-            self.customer_kontak = item.get("Kontak_Customer", "")
-        elif table == "karyawan":
-            self.karyawan_nama = item.get("Nama_Karyawan", "")
-            self.karyawan_tanggal = item.get("Tanggal_Masuk", "")
-            self.karyawan_gaji = str(item.get("Gaji", ""))
-        elif table == "meja":
-            self.meja_nomor = str(item.get("Nomor_Meja", ""))
-            self.meja_status = item.get("Status_Meja", "AVAILABLE")
-            self.meja_karyawan = item.get("ID_Karyawan", "")
-        elif table == "menu":
-            self.menu_nama = item.get("Nama_Menu", "")
-            self.menu_harga = str(item.get("Harga_Menu", ""))
-            self.menu_kategori = item.get("Kategori", "Makanan")
-        elif table == "pesanan":
-            self.pesanan_customer = item.get("ID_Customer", "")
-            self.pesanan_karyawan = item.get("ID_Karyawan", "")
-            self.pesanan_menu = item.get("ID_Menu", "")
-            self.pesanan_meja = item.get("ID_Meja", "")
-        elif table == "transaksi":
-            self.transaksi_pesanan = item.get("ID_Pesanan", "")
-            self.transaksi_total = str(item.get("Total_Harga", ""))
-            self.transaksi_karyawan = item.get("ID_Karyawan", "")
-        elif table == "pembayaran":
-            self.pembayaran_pesanan = item.get("ID_Pesanan", "")
-            self.pembayaran_transaksi = item.get("ID_Transaksi", "")
-            self.pembayaran_karyawan = item.get("ID_Karyawan", "")
-            self.pembayaran_metode = item.get("Metode_Pembayaran", "Cash")
-            self.pembayaran_jumlah = str(item.get("Jumlah_Bayar", ""))
-        elif table == "reservasi":
-            self.reservasi_customer = item.get("ID_Customer", "")
-            self.reservasi_meja = item.get("ID_Meja", "")
-            self.reservasi_karyawan = item.get("ID_Karyawan", "")
-            self.reservasi_tanggal = item.get("Tanggal_Reservasi", "")
-            self.reservasi_mulai = item.get("Waktu_Mulai", "")
-            self.reservasi_selesai = item.get("Waktu_Selesai", "")
-            self.reservasi_status = item.get("Status_Reservasi", "PENDING")
+        self.fk_options = {field: [] for field in FK_FIELDS}
     
-    def add_item(self):
-        """Add new item to current table."""
+    def add_item(self, form_data: Dict[str, Any]):
+        """Add new item to current table from the submitted form."""
+        if not admin_log.is_writer:
+            self.error_message = READ_ONLY_MESSAGE
+            return
         table = self.current_table
-        new_item = {}
+        new_item = {TABLE_SCHEMAS[table]["id_field"]: self.generate_id(table)}
+        new_item.update(form_values(table, form_data, partial=False))
         
-        if table == "customers":
-            new_item = {
-                "ID_Customer": self.generate_id(table),
-                "Nama_Customer": self.customer_nama,
-                "Kontak_Customer": self.customer_kontak
-            }
-        elif table == "karyawan":
-            new_item = {
-                "ID_Karyawan": self.generate_id(table),
-                "Nama_Karyawan": self.karyawan_nama,
-                "Tanggal_Masuk": self.karyawan_tanggal,
-                "Gaji": float(self.karyawan_gaji) if self.karyawan_gaji else 0
-            }
-        elif table == "meja":
-            new_item = {
-                "ID_Meja": self.generate_id(table),
-                "Nomor_Meja": int(self.meja_nomor) if self.meja_nomor else 0,
-                "Status_Meja": self.meja_status,
-                "ID_Karyawan": self.meja_karyawan
-            }
-        elif table == "menu":
-            new_item = {
-                "ID_Menu": self.generate_id(table),
-                "Nama_Menu": self.menu_nama,
-                "Harga_Menu": float(self.menu_harga) if self.menu_harga else 0,
-                "Kategori": self.menu_kategori
-            }
-        elif table == "pesanan":
-            new_item = {
-                "ID_Pesanan": self.generate_id(table),
-                "ID_Customer": self.pesanan_customer,
-                "ID_Karyawan": self.pesanan_karyawan,
-                "Waktu_Pesanan": datetime.now().strftime("%d-%m-%Y %H:%M"),
-                "ID_Menu": self.pesanan_menu,
-                "ID_Meja": self.pesanan_meja
-            }
+        # Timestamps are set on creation only
+        if table == "pesanan":
+            new_item["Waktu_Pesanan"] = datetime.now().strftime("%d-%m-%Y %H:%M")
         elif table == "transaksi":
-            new_item = {
-                "ID_Transaksi": self.generate_id(table),
-                "ID_Pesanan": self.transaksi_pesanan,
-                "Total_Harga": float(self.transaksi_total) if self.transaksi_total else 0,
-                "Tanggal_Transaksi": datetime.now().strftime("%d-%m-%Y"),
-                "ID_Karyawan": self.transaksi_karyawan
-            }
+            new_item["Tanggal_Transaksi"] = datetime.now().strftime("%d-%m-%Y")
         elif table == "pembayaran":
-            new_item = {
-                "ID_Pembayaran": self.generate_id(table),
-                "ID_Pesanan": self.pembayaran_pesanan,
-                "ID_Transaksi": self.pembayaran_transaksi,
-                "ID_Karyawan": self.pembayaran_karyawan,
-                "Metode_Pembayaran": self.pembayaran_metode,
-                "Jumlah_Bayar": float(self.pembayaran_jumlah) if self.pembayaran_jumlah else 0,
-                "Tanggal_Pembayaran": datetime.now().strftime("%d-%m-%Y")
-            }
-        elif table == "reservasi":
-            new_item = {
-                "ID_Reservasi": self.generate_id(table),
-                "ID_Customer": self.reservasi_customer,
-                "ID_Meja": self.reservasi_meja,
-                "ID_Karyawan": self.reservasi_karyawan,
-                "Tanggal_Reservasi": self.reservasi_tanggal,
-                "Waktu_Mulai": self.reservasi_mulai,
-                "Waktu_Selesai": self.reservasi_selesai,
-                "Status_Reservasi": self.reservasi_status
-            }
+            new_item["Tanggal_Pembayaran"] = datetime.now().strftime("%d-%m-%Y")
         
-        self.data[table].append(new_item)
+        admin_store[table].insert(new_item)
+        if table in FK_LABELS:
+            admin_lookup.put(table, new_item[TABLE_SCHEMAS[table]["id_field"]], row_label(new_item, FK_LABELS[table]))
+        self.table_counts[table] += 1
+        matches = all(new_item.get(col) == value for col, value in self.filters.items() if value)
+        if table == self.active_tab and matches:
+            # New IDs sort last, so the row only shows if the window reaches the end
+            at_end = not self.sort_field and self.window_start + len(self.rows) >= self.total_rows
+            self.total_rows += 1
+            if at_end:
+                insert_row(self.rows, encode_row(new_item, TABLE_SCHEMAS[table]["columns"], self.dictionaries), 0)
         self.close_modals()
     
-    def update_item(self):
-        """Update existing item."""
+    def update_item(self, form_data: Dict[str, Any]):
+        """Update existing item from the submitted form."""
+        if not admin_log.is_writer:
+            self.error_message = READ_ONLY_MESSAGE
+            return
         table = self.current_table
-        id_field = f"ID_{table[:-1].title()}" if table != "karyawan" else "ID_Karyawan"
+        id_field = TABLE_SCHEMAS[table]["id_field"]
         item_id = self.current_edit_item.get(id_field)
         
-        # Find and update item
-        for i, item in enumerate(self.data[table]):
-            if item.get(id_field) == item_id:
-                if table == "customers":
-                    self.data[table][i].update({
-                        "Nama_Customer": self.customer_nama,
-                        "Kontak_Customer": self.customer_kontak
-                    })
-                elif table == "karyawan":
-                    self.data[table][i].update({
-                        "Nama_Karyawan": self.karyawan_nama,
-                        "Tanggal_Masuk": self.karyawan_tanggal,
-                        "Gaji": float(self.karyawan_gaji) if self.karyawan_gaji else 0
-                    })
-                elif table == "meja":
-                    self.data[table][i].update({
-                        "Nomor_Meja": int(self.meja_nomor) if self.meja_nomor else 0,
-                        "Status_Meja": self.meja_status,
-                        "ID_Karyawan": self.meja_karyawan
-                    })
-                elif table == "menu":
-                    self.data[table][i].update({
-                        "Nama_Menu": self.menu_nama,
-                        "Harga_Menu": float(self.menu_harga) if self.menu_harga else 0,
-                        "Kategori": self.menu_kategori
-                    })
-                # Add other table updates as needed
-                break
-        
+        changes = form_values(table, form_data)
+        item = admin_store[table].update(item_id, changes)
+        if item is not None and table in FK_LABELS:
+            admin_lookup.put(table, item_id, row_label(item, FK_LABELS[table]))
+        patch_row(self.rows, 0, item_id, encode_changes(changes, TABLE_SCHEMAS[table]["columns"], self.dictionaries))
         self.close_modals()
     
     def delete_item(self, table: str, item_id: str):
         """Delete item from table."""
-        id_field = f"ID_{table[:-1].title()}" if table != "karyawan" else "ID_Karyawan"
-        self.data[table] = [item for item in self.data[table] if item.get(id_field) != item_id]
+        if not admin_log.is_writer:
+            self.error_message = READ_ONLY_MESSAGE
+            return
+        if admin_store[table].delete(item_id) is None:
+            return
+        admin_lookup.remove(table, item_id)
+        self.table_counts[table] -= 1
+        if table == self.active_tab:
+            self.total_rows -= 1
+            remove_row(self.rows, 0, item_id)
 
 def login_page() -> rx.Component:
     """Login page."""
@@ -389,26 +375,20 @@ def login_page() -> rx.Component:
             
             # Admin Login
             rx.box(
-                rx.vstack(
-                    rx.heading("👑 Admin Login", size="6"),
-                    rx.input(
-                        placeholder="Username",
-                        value=AdminState.username,
-                        on_change=AdminState.set_username,
-                    ),
-                    rx.input(
-                        placeholder="Password",
-                        type="password",
-                        value=AdminState.password,
-                        on_change=AdminState.set_password,
+                rx.form(
+                    rx.vstack(
+                        rx.heading("👑 Admin Login", size="6"),
+                        rx.input(placeholder="Username", name="username"),
+                        rx.input(placeholder="Password", type="password", name="password"),
+                        rx.button(
+                            "Login Admin",
+                            type="submit",
+                            bg="blue.500",
+                            color="white",
+                        ),
+                        spacing="3",
                     ),
-                    rx.button(
-                        "Login Admin",
-                        on_click=AdminState.admin_login,
-                        bg="blue.500",
-                        color="white",
-                    ),
-                    spacing="3",
+                    on_submit=AdminState.admin_login,
                 ),
                 p="4",
                 border="1px solid #ccc",
@@ -420,20 +400,19 @@ def login_page() -> rx.Component:
             
             # Customer Login
             rx.box(
-                rx.vstack(
-                    rx.heading("👤 Customer Login", size="6"),
-                    rx.input(
-                        placeholder="Customer ID (contoh: CUS1)",
-                        value=AdminState.customer_id,
-                        on_change=AdminState.set_customer_id,
-                    ),
-                    rx.button(
-                        "Login Customer",
-                        on_click=AdminState.customer_login,
-                        bg="green.500",
-                        color="white",
+                rx.form(
+                    rx.vstack(
+                        rx.heading("👤 Customer Login", size="6"),
+                        rx.input(placeholder="Customer ID (contoh: CUS1)", name="customer_id"),
+                        rx.button(
+                            "Login Customer",
+                            type="submit",
+                            bg="green.500",
+                            color="white",
+                        ),
+                        spacing="3",
                     ),
-                    spacing="3",
+                    on_submit=AdminState.customer_login,
                 ),
                 p="4",
                 border="1px solid #ccc",
@@ -453,11 +432,32 @@ def login_page() -> rx.Component:
         height="100vh",
     )
 
-def create_data_table(table_name: str, data: List[Dict], headers: List[str]) -> rx.Component:
-    """Create a data table component."""
+def filter_bar(table_name: str) -> rx.Component:
+    """Filters on the table's indexed columns, applied by the store."""
+    controls = []
+    for field in TABLE_SCHEMAS[table_name]["indexes"]:
+        if field in COLUMN_CHOICES:
+            controls.append(rx.select(
+                [ALL_VALUES] + COLUMN_CHOICES[field],
+                value=AdminState.filters.get(field, ALL_VALUES),
+                on_change=lambda value, field=field: AdminState.set_filter(field, value),
+            ))
+        else:
+            controls.append(rx.input(
+                placeholder=field,
+                value=AdminState.filters.get(field, ""),
+                on_change=lambda value, field=field: AdminState.set_filter(field, value),
+                debounce_timeout=300,
+                width="120px",
+            ))
+    return rx.hstack(*controls, spacing="2")
+
+def create_data_table(table_name: str) -> rx.Component:
+    """Create a windowed data table; rows are fetched as the table scrolls."""
     return rx.vstack(
         rx.hstack(
             rx.heading(f"Data {table_name.title()}", size="6"),
+            rx.text(AdminState.total_rows, " data", size="2"),
             rx.button(
                 f"+ Tambah {table_name.title()}",
                 on_click=lambda: AdminState.show_add_form(table_name),
@@ -469,62 +469,91 @@ def create_data_table(table_name: str, data: List[Dict], headers: List[str]) ->
             width="100%",
             mb="4"
         ),
+        filter_bar(table_name),
         
-        rx.table(
-            rx.thead(
-                rx.tr(*[rx.th(header) for header in headers + ["Actions"]])
-            ),
-            rx.tbody(
-                *[
-                    rx.tr(
-                        *[rx.td(str(item.get(header, ""))) for header in headers],
-                        rx.td(
-                            rx.hstack(
-                                rx.button(
-                                    "Edit",
-                                    on_click=lambda item=item: AdminState.show_edit_form(table_name, item),
-                                    bg="blue.500",
-                                    color="white",
-                                    size="xs"
-                                ),
-                                rx.button(
-                                    "Delete",
-                                    on_click=lambda item=item: AdminState.delete_item(
-                                        table_name, 
-                                        item.get(f"ID_{table_name[:-1].title()}" if table_name != "karyawan" else "ID_Karyawan")
-                                    ),
-                                    bg="red.500",
-                                    color="white",
-                                    size="xs"
-                                ),
-                                spacing="2"
-                            )
-                        )
-                    )
-                    for item in data
-                ]
+        virtual_table.virtual_table(
+            table_name,
+            AdminState.rows,
+            TABLE_SCHEMAS[table_name]["columns"],
+            AdminState.top_spacer,
+            AdminState.bottom_spacer,
+            AdminState.scroll_table,
+            AdminState.window_start,
+            AdminState.total_rows,
+            dictionaries=AdminState.dictionaries,
+            on_sort=AdminState.toggle_sort,
+            sort_field=AdminState.sort_field,
+            sort_desc=AdminState.sort_desc,
+            actions=lambda item: rx.hstack(
+                rx.button(
+                    "Edit",
+                    on_click=lambda: AdminState.show_edit_form(table_name, item[0]),
+                    bg="blue.500",
+                    color="white",
+                    size="xs"
+                ),
+                rx.button(
+                    "Delete",
+                    on_click=lambda: AdminState.delete_item(table_name, item[0]),
+                    bg="red.500",
+                    color="white",
+                    size="xs"
+                ),
+                spacing="2"
             ),
-            variant="striped",
-            width="100%"
         ),
         
         width="100%",
         spacing="4"
     )
 
-def create_customer_form() -> rx.Component:
-    """Create customer form."""
+def form_input(field: str, placeholder: str, type: str = "text") -> rx.Component:
+    """Uncontrolled form input prefilled from AdminState.form_defaults."""
+    return rx.input(
+        name=field,
+        placeholder=placeholder,
+        type=type,
+        default_value=AdminState.form_defaults[field],
+    )
+
+def form_select(field: str, options) -> rx.Component:
+    """Uncontrolled form select prefilled from AdminState.form_defaults."""
+    return rx.select(
+        options,
+        name=field,
+        default_value=AdminState.form_defaults[field],
+    )
+
+def fk_picker(field: str, placeholder: str) -> rx.Component:
+    """Typeahead for a foreign key; suggestions are the top matches only."""
     return rx.vstack(
         rx.input(
-            placeholder="Nama Customer",
-            value=AdminState.customer_nama,
-            on_change=AdminState.set_customer_nama,
+            name=field,
+            placeholder=placeholder,
+            value=AdminState.fk_query[field],
+            on_change=lambda value: AdminState.search_fk(field, value),
+            debounce_timeout=250,
         ),
-        rx.input(
-            placeholder="Kontak Customer",
-            value=AdminState.customer_kontak,
-            on_change=AdminState.set_customer_kontak,
+        rx.foreach(
+            AdminState.fk_options[field],
+            lambda option: rx.button(
+                rx.text(option["id"], " — ", option["label"]),
+                on_click=lambda: AdminState.pick_fk(field, option["id"]),
+                type="button",
+                variant="ghost",
+                size="1",
+                width="100%",
+            ),
         ),
+        spacing="1",
+        width="100%"
+    )
+
+def create_customer_form() -> rx.Component:
+    """Create customer form."""
+    return rx.vstack(
+        form_input("Nama_Customer", "Nama Customer"),
+        form_input("Kontak_Customer", "Kontak Customer"),
         spacing="3",
         width="100%"
     )
@@ -532,22 +561,9 @@ def create_customer_form() -> rx.Component:
 def create_karyawan_form() -> rx.Component:
     """Create karyawan form."""
     return rx.vstack(
-        rx.input(
-            placeholder="Nama Karyawan",
-            value=AdminState.karyawan_nama,
-            on_change=AdminState.set_karyawan_nama,
-        ),
-        rx.input(
-            placeholder="Tanggal Masuk (dd-mm-yyyy)",
-            value=AdminState.karyawan_tanggal,
-            on_change=AdminState.set_karyawan_tanggal,
-        ),
-        rx.input(
-            placeholder="Gaji",
-            type="number",
-            value=AdminState.karyawan_gaji,
-            on_change=AdminState.set_karyawan_gaji,
-        ),
+        form_input("Nama_Karyawan", "Nama Karyawan"),
+        form_input("Tanggal_Masuk", "Tanggal Masuk (dd-mm-yyyy)"),
+        form_input("Gaji", "Gaji", type="number"),
         spacing="3",
         width="100%"
     )
@@ -555,23 +571,9 @@ def create_karyawan_form() -> rx.Component:
 def create_meja_form() -> rx.Component:
     """Create meja form."""
     return rx.vstack(
-        rx.input(
-            placeholder="Nomor Meja",
-            type="number",
-            value=AdminState.meja_nomor,
-            on_change=AdminState.set_meja_nomor,
-        ),
-        rx.select(
-            ["AVAILABLE", "DIPESAN", "TERPAKAI"],
-            value=AdminState.meja_status,
-            on_change=AdminState.set_meja_status,
-        ),
-        rx.select(
-            [item["ID_Karyawan"] for item in AdminState.data["karyawan"]],
-            placeholder="Pilih Karyawan",
-            value=AdminState.meja_karyawan,
-            on_change=AdminState.set_meja_karyawan,
-        ),
+        form_input("Nomor_Meja", "Nomor Meja", type="number"),
+        form_select("Status_Meja", COLUMN_CHOICES["Status_Meja"]),
+        fk_picker("ID_Karyawan", "Cari ID atau nama karyawan"),
         spacing="3",
         width="100%"
     )
@@ -579,22 +581,9 @@ def create_meja_form() -> rx.Component:
 def create_menu_form() -> rx.Component:
     """Create menu form."""
     return rx.vstack(
-        rx.input(
-            placeholder="Nama Menu",
-            value=AdminState.menu_nama,
-            on_change=AdminState.set_menu_nama,
-        ),
-        rx.input(
-            placeholder="Harga Menu",
-            type="number",
-            value=AdminState.menu_harga,
-            on_change=AdminState.set_menu_harga,
-        ),
-        rx.select(
-            ["Makanan", "Minuman"],
-            value=AdminState.menu_kategori,
-            on_change=AdminState.set_menu_kategori,
-        ),
+        form_input("Nama_Menu", "Nama Menu"),
+        form_input("Harga_Menu", "Harga Menu", type="number"),
+        form_select("Kategori", COLUMN_CHOICES["Kategori"]),
         spacing="3",
         width="100%"
     )
@@ -604,22 +593,26 @@ def create_modal(title: str, form_component: rx.Component, is_edit: bool = False
     return rx.dialog_root(
         rx.dialog_content(
             rx.dialog_title(title),
-            form_component,
-            rx.hstack(
-                rx.button(
-                    "Batal",
-                    on_click=AdminState.close_modals,
-                    variant="outline"
-                ),
-                rx.button(
-                    "Simpan",
-                    on_click=AdminState.update_item if is_edit else AdminState.add_item,
-                    bg="green.500",
-                    color="white"
+            rx.form(
+                form_component,
+                rx.hstack(
+                    rx.button(
+                        "Batal",
+                        type="button",
+                        on_click=AdminState.close_modals,
+                        variant="outline"
+                    ),
+                    rx.button(
+                        "Simpan",
+                        type="submit",
+                        bg="green.500",
+                        color="white"
+                    ),
+                    justify="end",
+                    spacing="3",
+                    mt="4"
                 ),
-                justify="end",
-                spacing="3",
-                mt="4"
+                on_submit=AdminState.update_item if is_edit else AdminState.add_item,
             ),
             max_width="400px"
         ),
@@ -638,6 +631,10 @@ def admin_page() -> rx.Component:
                 width="100%",
                 pb="4"
             ),
+            rx.cond(
+                AdminState.error_message != "",
+                rx.text(AdminState.error_message, color="red"),
+            ),
             
             # Tab navigation
             rx.hstack(
@@ -715,14 +712,14 @@ def admin_page() -> rx.Component:
                 rx.vstack(
                     rx.text("📊 Dashboard Overview", size="6", weight="bold"),
                     rx.grid(
-                        rx.box(f"👥 Total Customer: {len(AdminState.data['customers'])}", p="4", bg="blue.100", border_radius="md"),
-                        rx.box(f"👨‍💼 Total Karyawan: {len(AdminState.data['karyawan'])}", p="4", bg="green.100", border_radius="md"),
-                        rx.box(f"🎱 Total Meja: {len(AdminState.data['meja'])}", p="4", bg="yellow.100", border_radius="md"),
-                        rx.box(f"🍽️ Total Menu: {len(AdminState.data['menu'])}", p="4", bg="purple.100", border_radius="md"),
-                        rx.box(f"📋 Total Pesanan: {len(AdminState.data['pesanan'])}", p="4", bg="red.100", border_radius="md"),
-                        rx.box(f"💰 Total Transaksi: {len(AdminState.data['transaksi'])}", p="4", bg="orange.100", border_radius="md"),
-                        rx.box(f"💳 Total Pembayaran: {len(AdminState.data['pembayaran'])}", p="4", bg="pink.100", border_radius="md"),
-                        rx.box(f"📅 Total Reservasi: {len(AdminState.data['reservasi'])}", p="4", bg="cyan.100", border_radius="md"),
+                        rx.box("👥 Total Customer: ", AdminState.table_counts["customers"], p="4", bg="blue.100", border_radius="md"),
+                        rx.box("👨‍💼 Total Karyawan: ", AdminState.table_counts["karyawan"], p="4", bg="green.100", border_radius="md"),
+                        rx.box("🎱 Total Meja: ", AdminState.table_counts["meja"], p="4", bg="yellow.100", border_radius="md"),
+                        rx.box("🍽️ Total Menu: ", AdminState.table_counts["menu"], p="4", bg="purple.100", border_radius="md"),
+                        rx.box("📋 Total Pesanan: ", AdminState.table_counts["pesanan"], p="4", bg="red.100", border_radius="md"),
+                        rx.box("💰 Total Transaksi: ", AdminState.table_counts["transaksi"], p="4", bg="orange.100", border_radius="md"),
+                        rx.box("💳 Total Pembayaran: ", AdminState.table_counts["pembayaran"], p="4", bg="pink.100", border_radius="md"),
+                        rx.box("📅 Total Reservasi: ", AdminState.table_counts["reservasi"], p="4", bg="cyan.100", border_radius="md"),
                         columns="4",
                         spacing="4",
                         width="100%"
@@ -734,42 +731,42 @@ def admin_page() -> rx.Component:
             
             rx.cond(
                 AdminState.active_tab == "customers",
-                create_data_table("customers", AdminState.data["customers"], ["ID_Customer", "Nama_Customer", "Kontak_Customer"])
+                create_data_table("customers")
             ),
             
             rx.cond(
                 AdminState.active_tab == "karyawan",
-                create_data_table("karyawan", AdminState.data["karyawan"], ["ID_Karyawan", "Nama_Karyawan", "Tanggal_Masuk", "Gaji"])
+                create_data_table("karyawan")
             ),
             
             rx.cond(
                 AdminState.active_tab == "meja",
-                create_data_table("meja", AdminState.data["meja"], ["ID_Meja", "Nomor_Meja", "Status_Meja", "ID_Karyawan"])
+                create_data_table("meja")
             ),
             
             rx.cond(
                 AdminState.active_tab == "menu",
-                create_data_table("menu", AdminState.data["menu"], ["ID_Menu", "Nama_Menu", "Harga_Menu", "Kategori"])
+                create_data_table("menu")
             ),
             
             rx.cond(
                 AdminState.active_tab == "pesanan",
-                create_data_table("pesanan", AdminState.data["pesanan"], ["ID_Pesanan", "ID_Customer", "ID_Karyawan", "Waktu_Pesanan", "ID_Menu", "ID_Meja"])
+                create_data_table("pesanan")
             ),
             
             rx.cond(
                 AdminState.active_tab == "transaksi",
-                create_data_table("transaksi", AdminState.data["transaksi"], ["ID_Transaksi", "ID_Pesanan", "Total_Harga", "Tanggal_Transaksi", "ID_Karyawan"])
+                create_data_table("transaksi")
             ),
             
             rx.cond(
                 AdminState.active_tab == "pembayaran",
-                create_data_table("pembayaran", AdminState.data["pembayaran"], ["ID_Pembayaran", "ID_Pesanan", "ID_Transaksi", "ID_Karyawan", "Metode_Pembayaran", "Jumlah_Bayar", "Tanggal_Pembayaran"])
+                create_data_table("pembayaran")
             ),
             
             rx.cond(
                 AdminState.active_tab == "reservasi",
-                create_data_table("reservasi", AdminState.data["reservasi"], ["ID_Reservasi", "ID_Customer", "ID_Meja", "ID_Karyawan", "Tanggal_Reservasi", "Waktu_Mulai", "Waktu_Selesai", "Status_Reservasi"])
+                create_data_table("reservasi")
             ),
             
             spacing="6",
@@ -830,4 +827,5 @@ def index():
 
 # Create app
 app = rx.App()
+install_event_stats(app)
 app.add_page(index, route="/")
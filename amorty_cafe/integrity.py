@@ -0,0 +1,173 @@
+"""Referential integrity for Rafi's schema: delete policies and orphan scans.
+
+Every FK column in models_rafi is declared here with what happens to the
+child rows when a parent row is deleted:
+
+- CASCADE: child rows are deleted too (recursively)
+- SET_NULL: the FK column is cleared (nullable columns only)
+- RESTRICT: the delete is refused while child rows exist
+
+Deletes run as one DELETE/UPDATE statement per relation with the
+parent keys as a subquery, all in the caller's transaction.
+"""
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from sqlalchemy import inspect
+from sqlalchemy.schema import AddConstraint
+
+from .models_rafi import Customer, Karyawan, Meja, Menu, Pesanan, Transaksi, Pembayaran, Reservasi
+
+CASCADE = "cascade"
+SET_NULL = "set null"
+RESTRICT = "restrict"
+
+class Relation(NamedTuple):
+    child: Any
+    field: str
+    parent: Any
+    parent_field: str
+    policy: str
+
+RELATIONS = [
+    # Orders, transactions and payments are financial history: a customer
+    # or order that still has them cannot be deleted
+    Relation(Pesanan, "ID_Customer", Customer, "ID_Customer", RESTRICT),
+    Relation(Reservasi, "ID_Customer", Customer, "ID_Customer", CASCADE),
+    Relation(Meja, "ID_Karyawan", Karyawan, "ID_Karyawan", SET_NULL),
+    Relation(Pesanan, "ID_Karyawan", Karyawan, "ID_Karyawan", SET_NULL),
+    Relation(Transaksi, "ID_Karyawan", Karyawan, "ID_Karyawan", RESTRICT),
+    Relation(Pembayaran, "ID_Karyawan", Karyawan, "ID_Karyawan", RESTRICT),
+    Relation(Reservasi, "ID_Karyawan", Karyawan, "ID_Karyawan", RESTRICT),
+    # Orders are sales history: tables and menu items in use cannot be deleted
+    Relation(Pesanan, "ID_Meja", Meja, "ID_Meja", RESTRICT),
+    Relation(Reservasi, "ID_Meja", Meja, "ID_Meja", CASCADE),
+    Relation(Pesanan, "ID_Menu", Menu, "ID_Menu", RESTRICT),
+    Relation(Transaksi, "ID_Pesanan", Pesanan, "ID_Pesanan", RESTRICT),
+    Relation(Pembayaran, "ID_Pesanan", Pesanan, "ID_Pesanan", RESTRICT),
+    Relation(Pembayaran, "ID_Transaksi", Transaksi, "ID_Transaksi", RESTRICT),
+]
+
+MODELS = [Customer, Karyawan, Meja, Menu, Pesanan, Transaksi, Pembayaran, Reservasi]
+
+class RestrictViolation(Exception):
+    """A delete was refused because child rows still reference the parent."""
+
+def children(model) -> List[Relation]:
+    return [rel for rel in RELATIONS if rel.parent is model]
+
+def delete_cascade(session, model, clauses: List[Any],
+                   counts: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+    """Delete ``model`` rows matching ``clauses`` and apply every child policy.
+
+    Children are handled before the parent statement, so no step ever
+    sees an orphan. Raises RestrictViolation (leave the transaction to
+    the caller to roll back). Returns rows affected per table.
+    """
+    counts = {} if counts is None else counts
+    for rel in children(model):
+        keys = session.query(getattr(model, rel.parent_field)).filter(*clauses).subquery()
+        column = getattr(rel.child, rel.field)
+        child_clauses = [column.in_(keys)]
+        if rel.policy == RESTRICT:
+            if session.query(rel.child.id).filter(*child_clauses).first() is not None:
+                raise RestrictViolation(
+                    f"{model.__tablename__} masih dipakai di {rel.child.__tablename__}.{rel.field}"
+                )
+        elif rel.policy == SET_NULL:
+            updated = (
+                session.query(rel.child)
+                .filter(*child_clauses)
+                .update({column: None}, synchronize_session=False)
+            )
+            counts[rel.child.__tablename__] = counts.get(rel.child.__tablename__, 0) + updated
+        else:
+            delete_cascade(session, rel.child, child_clauses, counts)
+    deleted = session.query(model).filter(*clauses).delete(synchronize_session=False)
+    counts[model.__tablename__] = counts.get(model.__tablename__, 0) + deleted
+    return counts
+
+def scan_orphans(session, fix: bool = False, batch: int = 5000) -> List[Dict[str, Any]]:
+    """Find child rows whose FK value has no parent, one pass per relation.
+
+    Each parent key column is read once into a set and each child table
+    is streamed in keyset batches of (id, fk), so the job is linear in
+    the table sizes. With ``fix`` orphans are handled by the relation's
+    policy (CASCADE deletes, SET_NULL clears); RESTRICT orphans are only
+    reported.
+    """
+    parent_keys: Dict[tuple, set] = {}
+    results = []
+    for rel in RELATIONS:
+        key = (rel.parent.__tablename__, rel.parent_field)
+        if key not in parent_keys:
+            column = getattr(rel.parent, rel.parent_field)
+            parent_keys[key] = {row[0] for row in session.query(column).yield_per(batch)}
+        parents = parent_keys[key]
+
+        column = getattr(rel.child, rel.field)
+        orphans, checked, last_id = [], 0, 0
+        while True:
+            rows = (
+                session.query(rel.child.id, column)
+                .filter(rel.child.id > last_id)
+                .order_by(rel.child.id)
+                .limit(batch)
+                .all()
+            )
+            if not rows:
+                break
+            checked += len(rows)
+            orphans += [row_id for row_id, value in rows if value is not None and value not in parents]
+            last_id = rows[-1][0]
+
+        fixed = 0
+        if fix and orphans and rel.policy != RESTRICT:
+            for i in range(0, len(orphans), 1000):
+                clauses = [rel.child.id.in_(orphans[i:i + 1000])]
+                if rel.policy == SET_NULL:
+                    fixed += (
+                        session.query(rel.child)
+                        .filter(*clauses)
+                        .update({column: None}, synchronize_session=False)
+                    )
+                else:
+                    fixed += delete_cascade(session, rel.child, clauses).get(rel.child.__tablename__, 0)
+            session.commit()
+        results.append({
+            "relation": f"{rel.child.__tablename__}.{rel.field} -> {rel.parent.__tablename__}.{rel.parent_field}",
+            "policy": rel.policy,
+            "checked": checked,
+            "orphans": len(orphans),
+            "fixed": fixed,
+        })
+    return results
+
+def apply_constraints(engine) -> List[str]:
+    """Add the declared UNIQUE and FOREIGN KEY constraints missing from older tables.
+
+    A constraint that still has violating rows (see ``scan_orphans``)
+    fails and is reported. Returns the constraints added.
+    """
+    inspector = inspect(engine)
+    added = []
+    # Unique keys first: foreign keys need them on the parent side
+    for kind in ("unique", "foreign"):
+        for model in MODELS:
+            table = model.__table__
+            if kind == "unique":
+                existing = {tuple(c["column_names"]) for c in inspector.get_unique_constraints(table.name)}
+                wanted = [c for c in table.constraints if c.__class__.__name__ == "UniqueConstraint"]
+            else:
+                existing = {tuple(fk["constrained_columns"]) for fk in inspector.get_foreign_keys(table.name)}
+                wanted = list(table.foreign_key_constraints)
+            for constraint in wanted:
+                columns = tuple(column.name for column in constraint.columns)
+                if columns in existing:
+                    continue
+                try:
+                    with engine.begin() as conn:
+                        conn.execute(AddConstraint(constraint))
+                    added.append(f"{table.name}{columns}")
+                except Exception as e:
+                    print(f"❌ Cannot add {kind} constraint on {table.name}{columns}: {e}")
+    return added
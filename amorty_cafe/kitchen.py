@@ -0,0 +1,312 @@
+"""Kitchen order queue scheduler for Amorty Cafe Management System."""
+import asyncio
+import heapq
+import itertools
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import reflex as rx
+from .models import Order, OrderItem, MenuCafe, OrderStatus
+
+# Seconds of order age that one second of preparation time is worth.
+# A quick item jumps ahead of slower ones, but never ahead of an order
+# that has been waiting longer than PREP_WEIGHT times the difference.
+PREP_WEIGHT = 2.0
+
+class KitchenTicket:
+    """One order item waiting for (or being) prepared."""
+    __slots__ = (
+        "item_id", "order_id", "menu_name", "quantity", "prep_seconds",
+        "ordered_at", "queued_at", "started_at", "finished_at", "table_number",
+    )
+
+    def __init__(self, item_id: int, order_id: int, menu_name: str, quantity: int,
+                 prep_seconds: float, ordered_at: float, table_number: Optional[int] = None):
+        self.item_id = item_id
+        self.order_id = order_id
+        self.menu_name = menu_name
+        self.quantity = quantity
+        self.prep_seconds = prep_seconds
+        self.ordered_at = ordered_at
+        self.queued_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.table_number = table_number
+
+    @property
+    def priority(self) -> float:
+        """Lower runs first: older orders and shorter items win."""
+        return self.ordered_at + PREP_WEIGHT * self.prep_seconds
+
+    def to_dict(self) -> Dict:
+        """Serializable view for the kitchen display."""
+        now = time.time()
+        return {
+            "item_id": self.item_id,
+            "order_id": self.order_id,
+            "menu_name": self.menu_name,
+            "quantity": self.quantity,
+            "table_number": self.table_number or "-",
+            "prep_minutes": round(self.prep_seconds / 60, 1),
+            "waiting_minutes": round(((self.started_at or now) - self.ordered_at) / 60, 1),
+        }
+
+class KitchenQueue:
+    """Priority queue of order items worked by a fixed number of cooks.
+
+    Each cook works one item at a time and marks it done with ``finish``.
+    Order status moves PENDING -> PREPARING when its first item is picked
+    up and PREPARING -> READY once every item has finished. Orders found
+    PREPARING at start were interrupted by a restart; their items go to
+    the front of the queue.
+    """
+
+    def __init__(self, cooks: int = 2, poll_interval: float = 5.0):
+        self.cooks = cooks
+        self.poll_interval = poll_interval
+        self.version = 0
+
+        self._heap: List = []
+        self._seq = itertools.count()
+        self._preparing: Dict[int, KitchenTicket] = {}
+        self._remaining: Dict[int, int] = {}
+        self._known_orders: set = set()
+        self._started_orders: set = set()
+        self._ready_orders: List[Dict] = []
+        self._changed: Optional[asyncio.Condition] = None
+        self._tasks: List[asyncio.Task] = []
+
+        # Statistics
+        self._started_at = time.time()
+        self._started_items = 0
+        self._completed_items = 0
+        self._completed_orders = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._total_turnaround = 0.0
+
+    async def start(self):
+        """Start cook workers and the new-order poller on the running loop."""
+        if self._tasks:
+            return
+        self._changed = asyncio.Condition()
+        self._started_at = time.time()
+        self._tasks = [asyncio.create_task(self._cook()) for _ in range(self.cooks)]
+        self._tasks.append(asyncio.create_task(self._poll_pending()))
+
+    async def stop(self):
+        """Cancel all background workers."""
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    async def submit(self, order_id: int, items: List[Dict], ordered_at: Optional[datetime] = None,
+                     table_number: Optional[int] = None, resumed: bool = False):
+        """Queue the items of one order.
+
+        Each item dict needs ``id``, ``menu_name``, ``quantity`` and
+        ``preparation_time`` (minutes, from ``MenuCafe``). A ``resumed``
+        order is already PREPARING: its items are taken before any new
+        work and its status is not written again.
+        """
+        if order_id in self._known_orders or not items:
+            return
+        self._known_orders.add(order_id)
+        if resumed:
+            self._started_orders.add(order_id)
+        ordered_ts = (ordered_at or datetime.now()).timestamp()
+        for item in items:
+            ticket = KitchenTicket(
+                item_id=item["id"],
+                order_id=order_id,
+                menu_name=item["menu_name"],
+                quantity=item["quantity"],
+                prep_seconds=float(item["preparation_time"] or 0) * 60,
+                ordered_at=ordered_ts,
+                table_number=table_number,
+            )
+            heapq.heappush(self._heap, ((not resumed, ticket.priority), next(self._seq), ticket))
+        self._remaining[order_id] = len(items)
+        await self._notify()
+
+    async def wait_for_change(self, since_version: int, timeout: float = 30.0) -> int:
+        """Block until the queue changes after ``since_version``."""
+        if self._changed is None:
+            return self.version
+        async with self._changed:
+            try:
+                await asyncio.wait_for(
+                    self._changed.wait_for(lambda: self.version != since_version),
+                    timeout,
+                )
+            except asyncio.TimeoutError:
+                pass
+        return self.version
+
+    def snapshot(self, limit: int = 50) -> Dict:
+        """Current queue, in-progress items and recently finished orders."""
+        queued = [entry[2] for entry in heapq.nsmallest(limit, self._heap)]
+        return {
+            "queued": [ticket.to_dict() for ticket in queued],
+            "preparing": [ticket.to_dict() for ticket in self._preparing.values()],
+            "ready": list(self._ready_orders),
+            "stats": self.stats(),
+        }
+
+    def stats(self) -> Dict:
+        """Throughput and wait-time statistics since start."""
+        elapsed_hours = max(time.time() - self._started_at, 1.0) / 3600
+        done = self._completed_items
+        started = self._started_items
+        return {
+            "queued": len(self._heap),
+            "preparing": len(self._preparing),
+            "completed_items": done,
+            "completed_orders": self._completed_orders,
+            "items_per_hour": round(done / elapsed_hours, 1),
+            "avg_wait_minutes": round(self._total_wait / started / 60, 1) if started else 0.0,
+            "max_wait_minutes": round(self._max_wait / 60, 1),
+            "avg_turnaround_minutes": round(self._total_turnaround / done / 60, 1) if done else 0.0,
+        }
+
+    async def _notify(self):
+        self.version += 1
+        if self._changed is not None:
+            async with self._changed:
+                self._changed.notify_all()
+
+    async def _next_ticket(self) -> KitchenTicket:
+        async with self._changed:
+            await self._changed.wait_for(lambda: bool(self._heap))
+            return heapq.heappop(self._heap)[2]
+
+    async def finish(self, item_id: int) -> bool:
+        """Mark an item being prepared as done (the cook's action).
+
+        Returns False if the item is not being prepared.
+        """
+        ticket = self._preparing.get(item_id)
+        if ticket is None or ticket.finished_at is not None:
+            return False
+        ticket.finished_at = time.time()
+        await self._notify()
+        return True
+
+    async def _set_status(self, order_id: int, status: OrderStatus) -> bool:
+        try:
+            await asyncio.to_thread(set_order_status, order_id, status)
+            return True
+        except Exception as e:
+            print(f"Error updating kitchen order {order_id}: {e}")
+            return False
+
+    async def _cook(self):
+        """Worker for one cook: a failed item is logged and the cook moves on."""
+        while True:
+            ticket = await self._next_ticket()
+            try:
+                await self._prepare(ticket)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._preparing.pop(ticket.item_id, None)
+                print(f"Error preparing kitchen item {ticket.item_id}: {e}")
+                await self._notify()
+
+    async def _prepare(self, ticket: KitchenTicket):
+        """Start an item, wait until the cook finishes it, then close out its order."""
+        ticket.started_at = time.time()
+        self._preparing[ticket.item_id] = ticket
+        wait = ticket.started_at - ticket.ordered_at
+        self._started_items += 1
+        self._total_wait += wait
+        self._max_wait = max(self._max_wait, wait)
+
+        if ticket.order_id not in self._started_orders:
+            self._started_orders.add(ticket.order_id)
+            await self._set_status(ticket.order_id, OrderStatus.PREPARING)
+        await self._notify()
+
+        async with self._changed:
+            await self._changed.wait_for(lambda: ticket.finished_at is not None)
+
+        self._preparing.pop(ticket.item_id, None)
+        self._completed_items += 1
+        self._total_turnaround += ticket.finished_at - ticket.ordered_at
+        self._remaining[ticket.order_id] -= 1
+        if self._remaining[ticket.order_id] == 0:
+            del self._remaining[ticket.order_id]
+            self._started_orders.discard(ticket.order_id)
+            self._completed_orders += 1
+            if await self._set_status(ticket.order_id, OrderStatus.READY):
+                # Now READY, so the poller will not return it again.
+                # If the write failed it stays known and is not cooked twice.
+                self._known_orders.discard(ticket.order_id)
+            self._ready_orders.insert(0, {
+                "order_id": ticket.order_id,
+                "table_number": ticket.table_number or "-",
+                "ready_at": datetime.now().strftime("%H:%M"),
+            })
+            del self._ready_orders[20:]
+        await self._notify()
+
+    async def _poll_pending(self):
+        """Pick up new PENDING orders, and PREPARING ones left by a restart, from the database."""
+        while True:
+            try:
+                pending = await asyncio.to_thread(load_pending_orders, self._known_orders)
+                for order in pending:
+                    await self.submit(
+                        order["id"], order["items"], order["order_date"], order["table_number"],
+                        resumed=order["status"] == OrderStatus.PREPARING,
+                    )
+            except Exception as e:
+                print(f"Error polling kitchen orders: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+def load_pending_orders(skip_ids: set) -> List[Dict]:
+    """Load PENDING and PREPARING orders with their items and preparation times."""
+    with rx.session() as session:
+        orders = session.query(Order).filter(
+            Order.status.in_([OrderStatus.PENDING, OrderStatus.PREPARING])
+        ).all()
+        orders = [order for order in orders if order.id not in skip_ids]
+        if not orders:
+            return []
+
+        order_ids = [order.id for order in orders]
+        rows = session.query(OrderItem, MenuCafe.preparation_time).join(
+            MenuCafe, MenuCafe.id == OrderItem.menu_id
+        ).filter(OrderItem.order_id.in_(order_ids)).all()
+
+        items_by_order: Dict[int, List[Dict]] = {}
+        for item, prep_time in rows:
+            items_by_order.setdefault(item.order_id, []).append({
+                "id": item.id,
+                "menu_name": item.menu_name,
+                "quantity": item.quantity,
+                "preparation_time": prep_time,
+            })
+
+        return [
+            {
+                "id": order.id,
+                "order_date": order.order_date,
+                "table_number": order.table_number,
+                "status": order.status,
+                "items": items_by_order.get(order.id, []),
+            }
+            for order in orders
+        ]
+
+def set_order_status(order_id: int, status: OrderStatus):
+    """Persist an order status change."""
+    with rx.session() as session:
+        order = session.query(Order).filter(Order.id == order_id).first()
+        if order:
+            order.status = status
+            session.commit()
+
+# Global kitchen queue instance
+kitchen_queue = KitchenQueue()
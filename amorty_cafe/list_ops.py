@@ -0,0 +1,59 @@
+"""In-place edits for table lists held in state, keyed by an ID column.
+
+Reflex sends a var's new value whenever it changes, so rebuilding a list
+after a save means re-querying and re-sending every row. These helpers
+change only the affected row in the list the state already holds (keep
+those lists window-sized, see components/virtual_table.py), so a save
+costs no reload query and the update stays bounded by the window.
+"""
+from typing import Any, Dict, List, Optional, Union
+
+# Rows are dicts keyed by column name, or columnar arrays keyed by index
+# (see columnar.py).
+Row = Union[Dict[str, Any], List[Any]]
+Key = Union[str, int]
+
+def _get(row: Row, key_field: Key) -> Any:
+    if isinstance(row, dict):
+        return row.get(key_field)
+    return row[key_field] if key_field < len(row) else None
+
+def row_index(rows: List[Row], key_field: Key, key: Any) -> int:
+    """Position of the row whose ``key_field`` equals ``key``, else -1."""
+    for i, row in enumerate(rows):
+        if _get(row, key_field) == key:
+            return i
+    return -1
+
+def insert_row(rows: List[Row], row: Row, key_field: Key,
+               position: Optional[int] = None) -> int:
+    """Insert ``row`` (or replace the row with the same key); returns its index."""
+    row = row.copy()
+    index = row_index(rows, key_field, _get(row, key_field))
+    if index >= 0:
+        rows[index] = row
+        return index
+    if position is None or position >= len(rows):
+        rows.append(row)
+        return len(rows) - 1
+    rows.insert(position, row)
+    return position
+
+def patch_row(rows: List[Row], key_field: Key, key: Any,
+              changes: Dict[Key, Any]) -> bool:
+    """Update only the changed columns of one row; False if it is not loaded."""
+    index = row_index(rows, key_field, key)
+    if index < 0:
+        return False
+    row = rows[index]
+    for col, value in changes.items():
+        if _get(row, col) != value:
+            row[col] = value
+    return True
+
+def remove_row(rows: List[Row], key_field: Key, key: Any) -> Optional[Row]:
+    """Remove one row by key; returns it, or None if it is not loaded."""
+    index = row_index(rows, key_field, key)
+    if index < 0:
+        return None
+    return rows.pop(index)
@@ -1,8 +1,11 @@
 """Database models for Amorty Cafe Management System."""
 import reflex as rx
+import sqlmodel
 from typing import Optional, List
 from datetime import datetime
 from enum import Enum
+from sqlalchemy import Index, event
+from .phone import keep_normalized
 
 class MembershipType(Enum):
     REGULAR = "Regular"
@@ -102,9 +105,22 @@ class User(rx.Model, table=True):
 
 class Customer(rx.Model, table=True):
     """Customer model."""
+    # The customers page filters on membership/status and sorts on these
+    # columns; names are explicit to stay within Oracle's 30 characters
+    __table_args__ = (
+        Index("ix_customer_name", "name"),
+        Index("ix_customer_membership", "membership_type"),
+        Index("ix_customer_status", "status"),
+        Index("ix_customer_join_date", "join_date"),
+        Index("ix_customer_spent", "total_spent"),
+        Index("ix_customer_points", "loyalty_points"),
+    )
+
     name: str
     email: str
     phone: str
+    # phone as 62... digits, set on every write (see phone.py)
+    phone_normalized: Optional[str] = None
     address: str
     membership_type: MembershipType = MembershipType.REGULAR
     join_date: datetime = datetime.now()
@@ -210,3 +226,29 @@ class RentalTransaction(rx.Model, table=True):
     employee_id: int
     employee_name: str
     payment_status: str = "Unpaid"
+
+class DailyLedger(rx.Model, table=True):
+    """End-of-day closing totals; written once per business day by closing.py."""
+    business_date: datetime = sqlmodel.Field(unique=True)
+    closed_at: datetime
+    revenue_total: float
+    payments_total: float
+    rental_total: float
+    transaksi_count: int
+    pembayaran_count: int
+    rental_count: int
+    rentals_closed: int
+    by_method: str = "{}"  # JSON string
+    by_employee: str = "{}"  # JSON string
+    by_table: str = "{}"  # JSON string
+    # sha256 of this day's totals and the previous day's checksum
+    prev_checksum: str = ""
+    checksum: str
+
+def _ledger_is_immutable(mapper, connection, target):
+    raise ValueError("DailyLedger rows cannot be changed or deleted")
+
+keep_normalized(Customer, "phone", "phone_normalized")
+event.listen(DailyLedger, "before_update", _ledger_is_immutable)
+event.listen(DailyLedger, "before_delete", _ledger_is_immutable)
+
@@ -1,22 +1,39 @@
 """Database models matching Rafi's Oracle schema."""
 import reflex as rx
-from typing import Optional
+import threading
+import sqlalchemy
+import sqlmodel
+from sqlalchemy.exc import IntegrityError
+from typing import Any, Callable, Dict, List, Optional
 from datetime import datetime
+from .phone import keep_normalized
 
 # Main Tables
+# ID_* keys are UNIQUE so FK columns can reference them; what a delete does
+# to the referencing rows is declared in integrity.RELATIONS.
+# Other indexes cover only the columns queries filter or sort on (foreign
+# keys, status/category, dates, names) and are named explicitly: Oracle
+# identifiers are limited to 30 characters.
 class Customer(rx.Model, table=True):
     """Customer table - Tabel pelanggan."""
     __tablename__ = "CUSTOMER"
+    __table_args__ = (sqlalchemy.Index("ix_cus_nama", "Nama_Customer"),)
 
-    ID_Customer: str
+    ID_Customer: str = sqlmodel.Field(unique=True)
     Nama_Customer: str
     Kontak_Customer: str
+    # Kontak_Customer as 62... digits, set on every write (see phone.py)
+    Kontak_Normal: Optional[str] = None
 
 class Karyawan(rx.Model, table=True):
     """Karyawan table - Tabel karyawan."""
     __tablename__ = "KARYAWAN"
+    __table_args__ = (
+        sqlalchemy.Index("ix_kar_nama", "Nama_Karyawan"),
+        sqlalchemy.Index("ix_kar_tanggal", "Tanggal_Masuk"),
+    )
 
-    ID_Karyawan: str
+    ID_Karyawan: str = sqlmodel.Field(unique=True)
     Nama_Karyawan: str
     Tanggal_Masuk: datetime
     Gaji: float
@@ -24,17 +41,26 @@ class Karyawan(rx.Model, table=True):
 class Meja(rx.Model, table=True):
     """Meja table - Tabel meja billiard."""
     __tablename__ = "MEJA"
+    __table_args__ = (
+        sqlalchemy.Index("ix_mj_nomor", "Nomor_Meja"),
+        sqlalchemy.Index("ix_mj_status", "Status_Meja"),
+        sqlalchemy.Index("ix_mj_karyawan", "ID_Karyawan"),
+    )
 
-    ID_Meja: str
+    ID_Meja: str = sqlmodel.Field(unique=True)
     Nomor_Meja: int
     Status_Meja: str = "AVAILABLE"  # AVAILABLE, DIPESAN, TERPAKAI
-    ID_Karyawan: Optional[str] = None  # FK to Karyawan
+    ID_Karyawan: Optional[str] = sqlmodel.Field(default=None, foreign_key="KARYAWAN.ID_Karyawan")  # FK to Karyawan
 
 class Menu(rx.Model, table=True):
     """Menu table - Tabel menu cafe."""
     __tablename__ = "MENU"
+    __table_args__ = (
+        sqlalchemy.Index("ix_mn_nama", "Nama_Menu"),
+        sqlalchemy.Index("ix_mn_kategori", "Kategori"),
+    )
 
-    ID_Menu: str
+    ID_Menu: str = sqlmodel.Field(unique=True)
     Nama_Menu: str
     Harga_Menu: float
     Kategori: str  # Makanan, Minuman
@@ -42,32 +68,52 @@ class Menu(rx.Model, table=True):
 class Pesanan(rx.Model, table=True):
     """Pesanan table - Tabel pesanan."""
     __tablename__ = "PESANAN"
-
-    ID_Pesanan: str
-    ID_Customer: str  # FK to Customer
-    ID_Karyawan: Optional[str] = None  # FK to Karyawan
+    __table_args__ = (
+        # Order history: a customer's orders newest first (see order_history.py)
+        sqlalchemy.Index("ix_pes_cus_waktu", "ID_Customer", "Waktu_Pesanan"),
+        sqlalchemy.Index("ix_pes_waktu", "Waktu_Pesanan"),
+        sqlalchemy.Index("ix_pes_karyawan", "ID_Karyawan"),
+        sqlalchemy.Index("ix_pes_menu", "ID_Menu"),
+        sqlalchemy.Index("ix_pes_meja", "ID_Meja"),
+    )
+
+    ID_Pesanan: str = sqlmodel.Field(unique=True)
+    ID_Customer: str = sqlmodel.Field(foreign_key="CUSTOMER.ID_Customer")  # FK to Customer
+    ID_Karyawan: Optional[str] = sqlmodel.Field(default=None, foreign_key="KARYAWAN.ID_Karyawan")  # FK to Karyawan
     Waktu_Pesanan: datetime
-    ID_Menu: str  # FK to Menu
-    ID_Meja: str  # FK to Meja
+    ID_Menu: str = sqlmodel.Field(foreign_key="MENU.ID_Menu")  # FK to Menu
+    ID_Meja: str = sqlmodel.Field(foreign_key="MEJA.ID_Meja")  # FK to Meja
 
 class Transaksi(rx.Model, table=True):
     """Transaksi table - Tabel transaksi."""
     __tablename__ = "TRANSAKSI"
-
-    ID_Transaksi: str
-    ID_Pesanan: str  # FK to Pesanan
+    __table_args__ = (
+        sqlalchemy.Index("ix_trx_pesanan", "ID_Pesanan"),
+        sqlalchemy.Index("ix_trx_tanggal", "Tanggal_Transaksi"),
+        sqlalchemy.Index("ix_trx_karyawan", "ID_Karyawan"),
+    )
+
+    ID_Transaksi: str = sqlmodel.Field(unique=True)
+    ID_Pesanan: str = sqlmodel.Field(foreign_key="PESANAN.ID_Pesanan")  # FK to Pesanan
     Total_Harga: float
     Tanggal_Transaksi: datetime
-    ID_Karyawan: str  # FK to Karyawan
+    ID_Karyawan: str = sqlmodel.Field(foreign_key="KARYAWAN.ID_Karyawan")  # FK to Karyawan
 
 class Pembayaran(rx.Model, table=True):
     """Pembayaran table - Tabel pembayaran."""
     __tablename__ = "PEMBAYARAN"
-
-    ID_Pembayaran: str
-    ID_Pesanan: str  # FK to Pesanan
-    ID_Transaksi: str  # FK to Transaksi
-    ID_Karyawan: str  # FK to Karyawan
+    __table_args__ = (
+        sqlalchemy.Index("ix_pb_pesanan", "ID_Pesanan"),
+        sqlalchemy.Index("ix_pb_transaksi", "ID_Transaksi"),
+        sqlalchemy.Index("ix_pb_karyawan", "ID_Karyawan"),
+        sqlalchemy.Index("ix_pb_metode", "Metode_Pembayaran"),
+        sqlalchemy.Index("ix_pb_tanggal", "Tanggal_Pembayaran"),
+    )
+
+    ID_Pembayaran: str = sqlmodel.Field(unique=True)
+    ID_Pesanan: str = sqlmodel.Field(foreign_key="PESANAN.ID_Pesanan")  # FK to Pesanan
+    ID_Transaksi: str = sqlmodel.Field(foreign_key="TRANSAKSI.ID_Transaksi")  # FK to Transaksi
+    ID_Karyawan: str = sqlmodel.Field(foreign_key="KARYAWAN.ID_Karyawan")  # FK to Karyawan
     Metode_Pembayaran: str
     Jumlah_Bayar: float
     Tanggal_Pembayaran: datetime
@@ -75,11 +121,18 @@ class Pembayaran(rx.Model, table=True):
 class Reservasi(rx.Model, table=True):
     """Reservasi table - Tabel reservasi meja."""
     __tablename__ = "RESERVASI"
-
-    ID_Reservasi: str
-    ID_Customer: str  # FK to Customer
-    ID_Meja: str  # FK to Meja
-    ID_Karyawan: str  # FK to Karyawan
+    __table_args__ = (
+        sqlalchemy.Index("ix_rsv_customer", "ID_Customer"),
+        sqlalchemy.Index("ix_rsv_meja", "ID_Meja"),
+        sqlalchemy.Index("ix_rsv_karyawan", "ID_Karyawan"),
+        sqlalchemy.Index("ix_rsv_tanggal", "Tanggal_Reservasi"),
+        sqlalchemy.Index("ix_rsv_status", "Status_Reservasi"),
+    )
+
+    ID_Reservasi: str = sqlmodel.Field(unique=True)
+    ID_Customer: str = sqlmodel.Field(foreign_key="CUSTOMER.ID_Customer")  # FK to Customer
+    ID_Meja: str = sqlmodel.Field(foreign_key="MEJA.ID_Meja")  # FK to Meja
+    ID_Karyawan: str = sqlmodel.Field(foreign_key="KARYAWAN.ID_Karyawan")  # FK to Karyawan
     Tanggal_Reservasi: datetime
     Waktu_Mulai: str  # Format: HH:MM
     Waktu_Selesai: str  # Format: HH:MM
@@ -99,17 +152,87 @@ def get_prefix_for_table(table_name: str) -> str:
         'KARYAWAN': 'KAR',
     }.get(table_name.upper(), 'ID')
 
-def generate_custom_id(table_name: str, prefix: str = None) -> str:
-    """Generate custom ID for table."""
-    if not prefix:
+# Model and ID column of each table, e.g. "CUSTOMER" -> (Customer, "ID_Customer")
+ID_FIELDS = {
+    model.__tablename__: (model, f"ID_{model.__name__}")
+    for model in (Customer, Karyawan, Meja, Menu, Pesanan, Transaksi, Pembayaran, Reservasi)
+}
+
+# Conflicting commits retried by commit_with_new_ids before giving up
+ID_ATTEMPTS = 3
+
+def highest_id_number(session, table_name: str, prefix: str) -> int:
+    """Largest n among the table's "<prefix><n>" IDs, 0 if there are none."""
+    model, field = ID_FIELDS[table_name]
+    column = getattr(model, field)
+    rows = (
+        session.query(column)
+        .filter(column.like(f"{prefix}%"))
+        .order_by(sqlalchemy.func.length(column).desc(), column.desc())
+        .limit(100)
+    )
+    for (value,) in rows:
+        number = value[len(prefix):]
+        if number.isdigit():
+            return int(number)
+    return 0
+
+class IdAllocator:
+    """Sequential "<prefix><n>" IDs per table, counted up in memory.
+
+    The counter starts after the highest ID in the table; ``reseed``
+    moves it past IDs other processes have written since.
+    """
+
+    def __init__(self):
+        self._next: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def next(self, session, table_name: str) -> str:
         prefix = get_prefix_for_table(table_name)
-    
-    # Simple ID generation - can be enhanced with database query
-    import random
-    return f"{prefix}{random.randint(1, 9999)}"
+        with self._lock:
+            if table_name not in self._next:
+                self._next[table_name] = highest_id_number(session, table_name, prefix) + 1
+            number = self._next[table_name]
+            self._next[table_name] = number + 1
+        return f"{prefix}{number}"
+
+    def reseed(self, session, table_name: str):
+        highest = highest_id_number(session, table_name, get_prefix_for_table(table_name))
+        with self._lock:
+            self._next[table_name] = max(self._next.get(table_name, 0), highest + 1)
+
+id_allocator = IdAllocator()
+
+def generate_custom_id(session, table_name: str) -> str:
+    """Next free ID for a table, e.g. CUS4 after CUS3."""
+    return id_allocator.next(session, table_name)
+
+def commit_with_new_ids(session, table_name: str, build: Callable[[Callable[[], str]], List[Any]],
+                        attempts: int = ID_ATTEMPTS) -> List[Any]:
+    """Add the items ``build(new_id)`` returns and commit them.
+
+    ``new_id()`` hands out the next ID of ``table_name``. If the commit
+    hits the UNIQUE key (another process used the same ID) it is rolled
+    back, the counter is moved past the table's IDs and ``build`` runs
+    again, so it must redo any other changes of the transaction too.
+    """
+    for attempt in range(attempts):
+        items = build(lambda: generate_custom_id(session, table_name))
+        session.add_all(items)
+        try:
+            session.commit()
+            return items
+        except IntegrityError:
+            session.rollback()
+            if attempt == attempts - 1:
+                raise
+            id_allocator.reseed(session, table_name)
 
 # Status options for dropdowns
 STATUS_MEJA_OPTIONS = ["AVAILABLE", "DIPESAN", "TERPAKAI"]
 STATUS_RESERVASI_OPTIONS = ["PENDING", "CONFIRMED", "CANCELLED", "COMPLETED"]
 KATEGORI_MENU_OPTIONS = ["Makanan", "Minuman"]
 METODE_PEMBAYARAN_OPTIONS = ["Cash", "Credit Card", "Debit Card", "Digital Wallet"]
+
+keep_normalized(Customer, "Kontak_Customer", "Kontak_Normal")
@@ -0,0 +1,122 @@
+"""Customer order history: one joined query per page and a per-customer cache.
+
+Pages are read newest first with keyset pagination on
+(Waktu_Pesanan, id), so page N costs the same as page 1 and inserts
+between requests never shift or repeat rows. Each row comes back with
+the menu name/price and table number from a single query joining MENU
+and MEJA.
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict
+
+import reflex as rx
+from sqlalchemy import and_, or_
+
+from .models_rafi import Meja, Menu, Pesanan
+
+PAGE_SIZE = 20
+
+def format_rupiah(amount: float) -> str:
+    """Amount as display text; Vars cannot be formatted in the browser."""
+    return f"Rp {amount or 0:,.0f}"
+
+def encode_cursor(waktu: datetime, row_id: int) -> str:
+    """Position after a row, as a string the browser state can hold."""
+    return f"{waktu.isoformat()}|{row_id}"
+
+def decode_cursor(cursor: str):
+    waktu, row_id = cursor.rsplit("|", 1)
+    return datetime.fromisoformat(waktu), int(row_id)
+
+def fetch_orders(customer_id: str, cursor: str = "", limit: int = PAGE_SIZE) -> Dict[str, Any]:
+    """One page of a customer's orders, newest first, after ``cursor``.
+
+    Returns {"orders": [...], "next_cursor": str}; next_cursor is "" on
+    the last page.
+    """
+    with rx.session() as session:
+        query = (
+            session.query(
+                Pesanan.id, Pesanan.ID_Pesanan, Pesanan.Waktu_Pesanan,
+                Pesanan.ID_Menu, Menu.Nama_Menu, Menu.Harga_Menu,
+                Pesanan.ID_Meja, Meja.Nomor_Meja,
+            )
+            .outerjoin(Menu, Menu.ID_Menu == Pesanan.ID_Menu)
+            .outerjoin(Meja, Meja.ID_Meja == Pesanan.ID_Meja)
+            .filter(Pesanan.ID_Customer == customer_id)
+        )
+        if cursor:
+            waktu, row_id = decode_cursor(cursor)
+            query = query.filter(or_(
+                Pesanan.Waktu_Pesanan < waktu,
+                and_(Pesanan.Waktu_Pesanan == waktu, Pesanan.id < row_id),
+            ))
+        rows = query.order_by(Pesanan.Waktu_Pesanan.desc(), Pesanan.id.desc()).limit(limit + 1).all()
+    orders = [
+        {
+            "ID_Pesanan": row.ID_Pesanan,
+            "Waktu_Pesanan": row.Waktu_Pesanan.strftime('%d-%m-%Y %H:%M'),
+            "ID_Menu": row.ID_Menu,
+            "Nama_Menu": row.Nama_Menu or row.ID_Menu,
+            "Harga_Menu": row.Harga_Menu or 0,
+            "Harga_Label": format_rupiah(row.Harga_Menu),
+            "ID_Meja": row.ID_Meja,
+            "Nomor_Meja": row.Nomor_Meja if row.Nomor_Meja is not None else row.ID_Meja,
+        }
+        for row in rows[:limit]
+    ]
+    next_cursor = ""
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_cursor(last.Waktu_Pesanan, last.id)
+    return {"orders": orders, "next_cursor": next_cursor}
+
+class OrderHistoryCache:
+    """Read-through cache of order pages per customer, LRU over customers.
+
+    A customer's pages are dropped together by ``invalidate`` when they
+    place an order; ``clear`` drops everything after admin edits. The TTL
+    bounds how stale menu names and prices can get.
+    """
+
+    def __init__(self, ttl: float = 120.0, max_customers: int = 2000):
+        self.ttl = ttl
+        self.max_customers = max_customers
+        self._customers: "OrderedDict[str, Dict[str, tuple]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def page(self, customer_id: str, cursor: str = "", limit: int = PAGE_SIZE) -> Dict[str, Any]:
+        """Cached page, fetched with ``fetch_orders`` on a miss."""
+        key = f"{cursor}#{limit}"
+        with self._lock:
+            pages = self._customers.get(customer_id)
+            entry = pages.get(key) if pages else None
+            if entry is not None and entry[0] > time.monotonic():
+                self._customers.move_to_end(customer_id)
+                return entry[1]
+        page = fetch_orders(customer_id, cursor, limit)
+        with self._lock:
+            pages = self._customers.pop(customer_id, None) or {}
+            pages[key] = (time.monotonic() + self.ttl, page)
+            self._customers[customer_id] = pages
+            while len(self._customers) > self.max_customers:
+                self._customers.popitem(last=False)
+        return page
+
+    def invalidate(self, customer_id: str):
+        """Forget one customer's pages after their orders changed."""
+        with self._lock:
+            self._customers.pop(customer_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._customers.clear()
+
+    def __len__(self) -> int:
+        return sum(len(pages) for pages in self._customers.values())
+
+# Shared by all sessions; submit_order and admin edits invalidate it
+order_history = OrderHistoryCache()
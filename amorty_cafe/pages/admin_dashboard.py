@@ -1,25 +1,411 @@
 """Comprehensive admin dashboard with all CRUD operations."""
+import asyncio
+import csv
+import io
+import itertools
+import os
+import uuid
 import reflex as rx
-from typing import List, Dict, Any, Optional
-from datetime import datetime, date
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime, date, timedelta
+from sqlalchemy import or_
 from ..components.layout import layout
-from ..auth import AuthState, require_admin
+from ..components import virtual_table
+from ..auth import AuthState, is_admin_session, require_admin
 from ..models_rafi import *
+from ..customer_cache import customer_ids, customer_phones
+from ..fk_lookup import FKLookup, row_label
+from ..search_index import search_index
+from ..phone import looks_like_phone
+from ..integrity import RestrictViolation, delete_cascade, scan_orphans
+from ..order_history import order_history
+from ..analytics import reports
+from ..pricing import menu_prices, recompute_transaksi, transaksi_total
+from ..reconciliation import run_reconciliation, summary
+from ..closing import close_day
+from ..columnar import decode_row, encode_row, encode_rows
+from ..prefetch import prefetched_pages, tab_transitions
+from ..list_ops import insert_row, patch_row, remove_row, row_index
 import json
 
+# Table definitions
+TABLE_CONFIGS = {
+    'CUSTOMER': {
+        'fields': ['ID_Customer', 'Nama_Customer', 'Kontak_Customer'],
+        'model': Customer
+    },
+    'KARYAWAN': {
+        'fields': ['ID_Karyawan', 'Nama_Karyawan', 'Tanggal_Masuk', 'Gaji'],
+        'model': Karyawan
+    },
+    'MEJA': {
+        'fields': ['ID_Meja', 'Nomor_Meja', 'Status_Meja', 'ID_Karyawan'],
+        'model': Meja
+    },
+    'MENU': {
+        'fields': ['ID_Menu', 'Nama_Menu', 'Harga_Menu', 'Kategori'],
+        'model': Menu
+    },
+    'PESANAN': {
+        'fields': ['ID_Pesanan', 'ID_Customer', 'ID_Karyawan', 'Waktu_Pesanan', 'ID_Menu', 'ID_Meja'],
+        'model': Pesanan
+    },
+    'PEMBAYARAN': {
+        'fields': ['ID_Pembayaran', 'ID_Pesanan', 'ID_Transaksi', 'ID_Karyawan', 'Metode_Pembayaran', 'Jumlah_Bayar', 'Tanggal_Pembayaran'],
+        'model': Pembayaran
+    },
+    'RESERVASI': {
+        'fields': ['ID_Reservasi', 'ID_Customer', 'ID_Meja', 'ID_Karyawan', 'Tanggal_Reservasi', 'Waktu_Mulai', 'Waktu_Selesai', 'Status_Reservasi'],
+        'model': Reservasi
+    },
+    'TRANSAKSI': {
+        'fields': ['ID_Transaksi', 'ID_Pesanan', 'Total_Harga', 'Tanggal_Transaksi', 'ID_Karyawan'],
+        'model': Transaksi
+    }
+}
+
+# Rows per chunk for background import/export
+CHUNK_SIZE = 500
+
+# Columns filtered through a select of their allowed values
+FILTER_CHOICES = {
+    "Status_Meja": STATUS_MEJA_OPTIONS,
+    "Kategori": KATEGORI_MENU_OPTIONS,
+    "Metode_Pembayaran": METODE_PEMBAYARAN_OPTIONS,
+    "Status_Reservasi": STATUS_RESERVASI_OPTIONS,
+}
+
+# Select value meaning "no filter" (selects cannot hold an empty value)
+ALL_VALUES = "SEMUA"
+
+# Money column per tab, for percentage changes
+AMOUNT_FIELDS = {
+    "KARYAWAN": "Gaji",
+    "MENU": "Harga_Menu",
+    "TRANSAKSI": "Total_Harga",
+    "PEMBAYARAN": "Jumlah_Bayar",
+}
+
+# Tables shown in customers' cached order history
+ORDER_TABLES = ("PESANAN", "MENU", "MEJA")
+
+# Tables read by the cached analytics reports
+REPORT_TABLES = ("PESANAN", "MENU", "TRANSAKSI")
+
+# Jobs started only after AdminDashboardState.confirm_action is confirmed
+CONFIRM_CLOSE_DAY = "close_day"
+CONFIRM_FIX_TOTALS = "fix_totals"
+
+# Scopes of a bulk operation
+BULK_SELECTED = "Terpilih"
+BULK_FILTERED = "Semua hasil filter"
+
+# ID column -> table holding it, for foreign key dropdowns
+FK_TABLES = {
+    "ID_Karyawan": "KARYAWAN",
+    "ID_Customer": "CUSTOMER",
+    "ID_Meja": "MEJA",
+    "ID_Menu": "MENU",
+    "ID_Pesanan": "PESANAN",
+    "ID_Transaksi": "TRANSAKSI",
+}
+
+# Columns shown next to the ID in foreign key pickers
+FK_LABELS = {
+    "KARYAWAN": ["Nama_Karyawan"],
+    "CUSTOMER": ["Nama_Customer"],
+    "MEJA": ["Nomor_Meja"],
+    "MENU": ["Nama_Menu"],
+    "PESANAN": [],
+    "TRANSAKSI": [],
+}
+
+# Matches returned to a foreign key picker per search
+FK_MATCHES = 8
+
+def fk_loader(table_name: str):
+    """Loader reading only the ID and label columns of a table."""
+    def load() -> List[Tuple[str, str]]:
+        config = TABLE_CONFIGS[table_name]
+        model_class = config['model']
+        fields = [config['fields'][0]] + FK_LABELS[table_name]
+        with rx.session() as session:
+            rows = session.query(*[getattr(model_class, field) for field in fields]).all()
+        return [(row[0], row_label(dict(zip(fields, row)), fields[1:])) for row in rows]
+    return load
+
+# Shared ID/label index for foreign key pickers
+fk_lookup = FKLookup()
+for _table_name in FK_LABELS:
+    fk_lookup.register(_table_name, fk_loader(_table_name))
+
+# Columns indexed by the global search, per tab (first column is the title)
+SEARCH_FIELDS = {
+    "CUSTOMER": ["Nama_Customer", "Kontak_Customer"],
+    "KARYAWAN": ["Nama_Karyawan"],
+    "MENU": ["Nama_Menu", "Kategori"],
+}
+
+def search_loader(table_name: str):
+    """Loader reading only the ID and searched columns of a table."""
+    def load() -> List[Tuple[str, List[Any]]]:
+        config = TABLE_CONFIGS[table_name]
+        model_class = config['model']
+        fields = [config['fields'][0]] + SEARCH_FIELDS[table_name]
+        with rx.session() as session:
+            rows = session.query(*[getattr(model_class, field) for field in fields]).all()
+        return [(row[0], list(row[1:])) for row in rows]
+    return load
+
+for _table_name in SEARCH_FIELDS:
+    search_index.register(_table_name, search_loader(_table_name))
+
+def phone_matches(query: str, limit: int = 10) -> List[Dict[str, str]]:
+    """Customers whose number is ``query`` or ends with it, as search results."""
+    ids = customer_phones.lookup(query, limit)
+    if not ids:
+        return []
+    with rx.session() as session:
+        found = {c.ID_Customer: c for c in session.query(Customer).filter(Customer.ID_Customer.in_(ids)).all()}
+    return [
+        {"kind": "CUSTOMER", "id": i, "title": found[i].Nama_Customer, "detail": found[i].Kontak_Customer}
+        for i in ids if i in found
+    ]
+
+def row_to_dict(item: Any, fields: List[str]) -> Dict[str, Any]:
+    """Table row for display, with dates formatted."""
+    item_dict = {}
+    for field in fields:
+        value = getattr(item, field, None)
+        if isinstance(value, datetime):
+            item_dict[field] = value.strftime('%d-%m-%Y')
+        else:
+            item_dict[field] = value
+    return item_dict
+
+def coerce_value(field: str, value: Any, default_now: bool = False) -> Any:
+    """Convert a form/CSV string to the column's type."""
+    if "tanggal" in field.lower() or "waktu" in field.lower():
+        if value:
+            try:
+                return datetime.strptime(value, "%d-%m-%Y")
+            except ValueError:
+                return datetime.strptime(value, "%Y-%m-%d")
+        return datetime.now() if default_now else value
+    if field in ["Gaji", "Harga_Menu", "Jumlah_Bayar", "Total_Harga"]:
+        return float(value) if value else 0.0
+    if field in ["Nomor_Meja"]:
+        return int(value) if value else 0
+    return value
+
+def sortable_fields(table_name: str) -> List[str]:
+    """Columns leading a database index (or unique key); only these can be sorted on."""
+    config = TABLE_CONFIGS[table_name]
+    table = config['model'].__table__
+    indexed = {list(index.columns)[0].name for index in table.indexes}
+    return [field for field in config['fields'] if field in indexed or table.c[field].unique]
+
+def is_date_field(field: str) -> bool:
+    return field.startswith("Tanggal")
+
+def filter_fields(table_name: str) -> List[str]:
+    """Indexed status/category, foreign key and date columns offered as filters."""
+    fields = TABLE_CONFIGS[table_name]['fields']
+    return [field for field in fields[1:]
+            if field in FILTER_CHOICES or field in FK_TABLES or is_date_field(field)]
+
+def filter_clauses(table_name: str, filters: Optional[Dict[str, str]] = None) -> List[Any]:
+    """SQL WHERE clauses for equality filters; dates match the whole day."""
+    model_class = TABLE_CONFIGS[table_name]['model']
+    allowed = filter_fields(table_name)
+    clauses = []
+    for field, value in (filters or {}).items():
+        if not value or field not in allowed:
+            continue
+        column = getattr(model_class, field)
+        if is_date_field(field):
+            day = datetime.strptime(value, "%Y-%m-%d")
+            clauses += [column >= day, column < day + timedelta(days=1)]
+        else:
+            clauses.append(column == value)
+    return clauses
+
+def row_matches(table_name: str, item: Any, filters: Optional[Dict[str, str]] = None) -> bool:
+    """Whether a model instance passes the filters, by the rules of ``filter_clauses``."""
+    allowed = filter_fields(table_name)
+    for field, value in (filters or {}).items():
+        if not value or field not in allowed:
+            continue
+        current = getattr(item, field, None)
+        if is_date_field(field):
+            if current is None or current.strftime("%Y-%m-%d") != value:
+                return False
+        elif current != value:
+            return False
+    return True
+
+def filtered_query(session, table_name: str, filters: Optional[Dict[str, str]] = None):
+    """Query for a table with the filters as SQL WHERE clauses."""
+    return session.query(TABLE_CONFIGS[table_name]['model']).filter(*filter_clauses(table_name, filters))
+
+def scope_clauses(table_name: str, ids: Optional[List[str]] = None,
+                  filters: Optional[Dict[str, str]] = None) -> List[Any]:
+    """WHERE clauses for a bulk operation: chosen IDs and/or the filters.
+
+    IDs go in IN lists of at most 1000 (Oracle's limit) joined by OR, so
+    the operation stays a single statement.
+    """
+    config = TABLE_CONFIGS[table_name]
+    clauses = filter_clauses(table_name, filters)
+    if ids is not None:
+        column = getattr(config['model'], config['fields'][0])
+        clauses.append(or_(*[column.in_(ids[i:i + 1000]) for i in range(0, len(ids), 1000)]))
+    return clauses
+
+def bulk_delete(table_name: str, ids: Optional[List[str]] = None,
+                filters: Optional[Dict[str, str]] = None) -> Dict[str, int]:
+    """Delete every row in scope, applying the delete policies in integrity.py.
+
+    One statement per affected table, all in one transaction; a
+    RestrictViolation rolls everything back. Returns rows affected per table.
+    """
+    with rx.session() as session:
+        try:
+            counts = delete_cascade(session, TABLE_CONFIGS[table_name]['model'],
+                                    scope_clauses(table_name, ids, filters))
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        return counts
+
+def bulk_update(table_name: str, values: Dict[str, Any], ids: Optional[List[str]] = None,
+                filters: Optional[Dict[str, str]] = None) -> int:
+    """Set columns on every row in scope with one UPDATE; returns the row count.
+
+    Values may be SQL expressions, e.g. {Menu.Harga_Menu: Menu.Harga_Menu * 1.1}.
+    """
+    model_class = TABLE_CONFIGS[table_name]['model']
+    values = {getattr(model_class, k) if isinstance(k, str) else k: v for k, v in values.items()}
+    with rx.session() as session:
+        count = (
+            session.query(model_class)
+            .filter(*scope_clauses(table_name, ids, filters))
+            .update(values, synchronize_session=False)
+        )
+        session.commit()
+        return count
+
+def scope_ids(table_name: str, ids: Optional[List[str]] = None,
+              filters: Optional[Dict[str, str]] = None) -> List[str]:
+    """IDs of the rows a bulk operation covers (read before it runs)."""
+    if ids is not None and not filters:
+        return list(ids)
+    config = TABLE_CONFIGS[table_name]
+    column = getattr(config['model'], config['fields'][0])
+    with rx.session() as session:
+        return [row[0] for row in session.query(column).filter(*scope_clauses(table_name, ids, filters))]
+
+def reindex_rows(table_name: str, ids: List[str]):
+    """Update the search index for ``ids`` only: re-put rows still there, remove the rest."""
+    config = TABLE_CONFIGS[table_name]
+    model_class = config['model']
+    column = getattr(model_class, config['fields'][0])
+    searched = [getattr(model_class, field) for field in SEARCH_FIELDS[table_name]]
+    found = {}
+    with rx.session() as session:
+        for i in range(0, len(ids), 1000):
+            for row in session.query(column, *searched).filter(column.in_(ids[i:i + 1000])):
+                found[row[0]] = list(row[1:])
+    for item_id in ids:
+        if item_id in found:
+            search_index.put(table_name, item_id, found[item_id])
+        else:
+            search_index.remove(table_name, item_id)
+
+def check_orphans() -> List[Dict[str, Any]]:
+    """Report child rows whose parent is missing (read-only)."""
+    with rx.session() as session:
+        return scan_orphans(session)
+
+def query_window(table_name: str, offset: int, limit: int,
+                 filters: Optional[Dict[str, str]] = None, sort_field: str = "",
+                 sort_desc: bool = False) -> Tuple[int, List[Dict[str, Any]]]:
+    """Matching row count and rows [offset, offset + limit) of a table.
+
+    Rows are ordered by ``sort_field`` (an indexed column) then id.
+    """
+    config = TABLE_CONFIGS[table_name]
+    model_class = config['model']
+    order = [model_class.id]
+    if sort_field in sortable_fields(table_name):
+        column = getattr(model_class, sort_field)
+        order.insert(0, column.desc() if sort_desc else column.asc())
+    with rx.session() as session:
+        query = filtered_query(session, table_name, filters)
+        total = query.count()
+        items = query.order_by(*order).offset(offset).limit(limit).all()
+        return total, [row_to_dict(item, config['fields']) for item in items]
+
+def query_chunk(table_name: str, after_id: int, limit: int) -> Tuple[int, List[Dict[str, Any]]]:
+    """Next ``limit`` rows with id > after_id (keyset paging for exports)."""
+    config = TABLE_CONFIGS[table_name]
+    model_class = config['model']
+    with rx.session() as session:
+        items = (
+            session.query(model_class)
+            .filter(model_class.id > after_id)
+            .order_by(model_class.id)
+            .limit(limit)
+            .all()
+        )
+        last_id = items[-1].id if items else after_id
+        return last_id, [row_to_dict(item, config['fields']) for item in items]
+
+def insert_chunk(table_name: str, rows: List[Dict[str, str]]) -> List[str]:
+    """Insert CSV rows in one transaction; returns the IDs written."""
+    config = TABLE_CONFIGS[table_name]
+    model_class = config['model']
+    fields = config['fields']
+    values = [{field: coerce_value(field, row.get(field, ""), default_now=True) for field in fields[1:]}
+              for row in rows]
+
+    def build(new_id):
+        return [model_class(**{fields[0]: row.get(fields[0]) or new_id()}, **item_data)
+                for row, item_data in zip(rows, values)]
+
+    with rx.session() as session:
+        items = commit_with_new_ids(session, table_name, build)
+        return [getattr(item, fields[0]) for item in items]
+
+def count_rows(table_name: str) -> int:
+    with rx.session() as session:
+        return session.query(TABLE_CONFIGS[table_name]['model']).count()
+
 class AdminDashboardState(rx.State):
     """Admin dashboard state management."""
     current_tab: str = "CUSTOMER"
     
-    # Data storage for each table
-    customers: List[Dict[str, Any]] = []
-    karyawan: List[Dict[str, Any]] = []
-    meja: List[Dict[str, Any]] = []
-    menu: List[Dict[str, Any]] = []
-    pesanan: List[Dict[str, Any]] = []
-    pembayaran: List[Dict[str, Any]] = []
-    reservasi: List[Dict[str, Any]] = []
-    transaksi: List[Dict[str, Any]] = []
+    # Only the loaded window of the current table is kept in state, as
+    # columnar arrays in the table's field order (see columnar.py)
+    rows: List[List[Any]] = []
+    dictionaries: Dict[str, List[Any]] = {}
+    total_rows: int = 0
+    window_start: int = 0
+    window_size: int = virtual_table.window_size()
+    
+    # Applied in SQL; total_rows counts matching rows only
+    filters: Dict[str, str] = {}
+    sort_field: str = ""
+    sort_desc: bool = False
+    
+    # Bulk operations: rows ticked in the table, or everything the filters match
+    selected_ids: List[str] = []
+    bulk_scope: str = BULK_SELECTED
+    bulk_field: str = ""
+    bulk_value: str = ""
+    bulk_percent: str = ""
+    bulk_message: str = ""
     
     # Form states
     is_dialog_open: bool = False
@@ -27,88 +413,577 @@ class AdminDashboardState(rx.State):
     form_data: Dict[str, Any] = {}
     selected_id: str = ""
     
-    # Table definitions
-    table_configs = {
-        'CUSTOMER': {
-            'fields': ['ID_Customer', 'Nama_Customer', 'Kontak_Customer'],
-            'model': Customer
-        },
-        'KARYAWAN': {
-            'fields': ['ID_Karyawan', 'Nama_Karyawan', 'Tanggal_Masuk', 'Gaji'],
-            'model': Karyawan
-        },
-        'MEJA': {
-            'fields': ['ID_Meja', 'Nomor_Meja', 'Status_Meja', 'ID_Karyawan'],
-            'model': Meja
-        },
-        'MENU': {
-            'fields': ['ID_Menu', 'Nama_Menu', 'Harga_Menu', 'Kategori'],
-            'model': Menu
-        },
-        'PESANAN': {
-            'fields': ['ID_Pesanan', 'ID_Customer', 'ID_Karyawan', 'Waktu_Pesanan', 'ID_Menu', 'ID_Meja'],
-            'model': Pesanan
-        },
-        'PEMBAYARAN': {
-            'fields': ['ID_Pembayaran', 'ID_Pesanan', 'ID_Transaksi', 'ID_Karyawan', 'Metode_Pembayaran', 'Jumlah_Bayar', 'Tanggal_Pembayaran'],
-            'model': Pembayaran
-        },
-        'RESERVASI': {
-            'fields': ['ID_Reservasi', 'ID_Customer', 'ID_Meja', 'ID_Karyawan', 'Tanggal_Reservasi', 'Waktu_Mulai', 'Waktu_Selesai', 'Status_Reservasi'],
-            'model': Reservasi
-        },
-        'TRANSAKSI': {
-            'fields': ['ID_Transaksi', 'ID_Pesanan', 'Total_Harga', 'Tanggal_Transaksi', 'ID_Karyawan'],
-            'model': Transaksi
-        }
-    }
+    # Foreign key pickers: typed text and top matches per field
+    fk_query: Dict[str, str] = {}
+    fk_options: Dict[str, List[Dict[str, str]]] = {}
+    
+    # Global search box
+    search_query: str = ""
+    search_results: List[Dict[str, str]] = []
     
-    def set_current_tab(self, tab: str):
-        """Set current active tab."""
+    # Background jobs (tab load, import, export). Each tab switch bumps
+    # load_generation; a job stops as soon as it sees a newer generation.
+    load_generation: int = 0
+    is_loading: bool = False
+    job_label: str = ""
+    job_progress: int = 0
+    
+    # Jobs that cannot be undone wait for a confirmation; the job checks
+    # and clears confirm_action itself, so it cannot be started directly
+    confirm_action: str = ""
+    confirm_message: str = ""
+    close_date: str = ""
+    
+    table_configs = TABLE_CONFIGS
+    
+    async def set_current_tab(self, tab: str):
+        """Set current active tab and load it in the background."""
+        # Only admin switches to real tabs train the prefetch predictor
+        if tab not in TABLE_CONFIGS or not await is_admin_session(self):
+            return
+        tab_transitions.record(self.current_tab, tab)
         self.current_tab = tab
-        self.load_table_data(tab)
+        self.filters = {}
+        self.sort_field = ""
+        self.sort_desc = False
+        self.selected_ids = []
+        self.bulk_field = ""
+        self.bulk_message = ""
+        return self.refresh_table(use_prefetch=True)
     
-    async def load_table_data(self, table_name: str):
-        """Load data for specific table."""
-        config = self.table_configs.get(table_name)
-        if not config:
+    def refresh_table(self, use_prefetch: bool = False):
+        """Start a background load of the current tab, cancelling older jobs.
+
+        With ``use_prefetch`` a page prefetched for this session is shown
+        immediately instead.
+        """
+        self.load_generation += 1
+        self.window_start = 0
+        self.window_size = virtual_table.window_size()
+        session = self.router.session.client_token
+        page = prefetched_pages.take(session, self.current_tab) if use_prefetch else None
+        if page is not None:
+            self.total_rows, rows = page
+            encoded = encode_rows(rows, TABLE_CONFIGS[self.current_tab]['fields'])
+            self.rows = encoded["rows"]
+            self.dictionaries = encoded["dictionaries"]
+            self.is_loading = False
+            return AdminDashboardState.prefetch_next(self.current_tab)
+        self.rows = []
+        self.is_loading = True
+        self.job_label = f"Memuat {self.current_tab}"
+        self.job_progress = 0
+        return AdminDashboardState.load_table_data(
+            self.current_tab, self.load_generation, self.filters, self.sort_field, self.sort_desc
+        )
+    
+    @rx.background
+    async def load_table_data(self, table_name: str, generation: int,
+                              filters: Optional[Dict[str, str]] = None, sort_field: str = "",
+                              sort_desc: bool = False):
+        """Load the first window of a table without locking the session."""
+        if table_name not in TABLE_CONFIGS:
             return
-            
+        async with self:
+            if not await is_admin_session(self):
+                return
         try:
-            with rx.session() as session:
-                model_class = config['model']
-                items = session.query(model_class).all()
-                
-                data = []
-                for item in items:
-                    item_dict = {}
-                    for field in config['fields']:
-                        value = getattr(item, field, None)
-                        if isinstance(value, datetime):
-                            item_dict[field] = value.strftime('%d-%m-%Y')
-                        else:
-                            item_dict[field] = value
-                    data.append(item_dict)
-                
-                # Store in appropriate state variable
-                setattr(self, table_name.lower(), data)
-                
+            total, rows = await asyncio.to_thread(
+                query_window, table_name, 0, virtual_table.window_size(), filters, sort_field, sort_desc
+            )
         except Exception as e:
             print(f"Error loading {table_name}: {e}")
+            total, rows = 0, []
+        async with self:
+            if generation != self.load_generation:
+                return
+            encoded = encode_rows(rows, TABLE_CONFIGS[table_name]['fields'])
+            self.rows = encoded["rows"]
+            self.dictionaries = encoded["dictionaries"]
+            self.total_rows = total
+            self.is_loading = False
+            self.job_progress = 100
+            return AdminDashboardState.prefetch_next(table_name)
+    
+    @rx.background
+    async def prefetch_next(self, table_name: str):
+        """Load the first page of the likely next tab into the session's cache."""
+        async with self:
+            if not await is_admin_session(self):
+                return
+            session = self.router.session.client_token
+        next_tab = tab_transitions.predict(table_name)
+        if next_tab not in TABLE_CONFIGS:
+            return
+        generation = prefetched_pages.generation(next_tab)
+        try:
+            page = await asyncio.to_thread(query_window, next_tab, 0, virtual_table.window_size())
+        except Exception as e:
+            print(f"Error prefetching {next_tab}: {e}")
+            return
+        prefetched_pages.put(session, next_tab, page, generation)
+    
+    def fetch_window(self, table_name: str):
+        """Load rows [window_start, window_start + window_size) of a table."""
+        if table_name not in TABLE_CONFIGS:
+            return
+        try:
+            self.total_rows, rows = query_window(
+                table_name, self.window_start, self.window_size, self.filters, self.sort_field, self.sort_desc
+            )
+            encoded = encode_rows(rows, TABLE_CONFIGS[table_name]['fields'])
+            self.rows = encoded["rows"]
+            self.dictionaries = encoded["dictionaries"]
+        except Exception as e:
+            print(f"Error loading {table_name}: {e}")
+    
+    @rx.background
+    async def export_table(self):
+        """Build the current table's CSV in chunks, with progress, and send it to this client.
+
+        The file is built in memory and only sent over this session's
+        socket, never written where other clients could fetch it.
+        """
+        async with self:
+            if not await is_admin_session(self):
+                return
+            table_name = self.current_tab
+            generation = self.load_generation
+            self.is_loading = True
+            self.job_label = f"Ekspor {table_name}"
+            self.job_progress = 0
+        fields = TABLE_CONFIGS[table_name]['fields']
+        buffer = io.StringIO()
+        try:
+            total = await asyncio.to_thread(count_rows, table_name)
+            written, last_id = 0, 0
+            writer = csv.DictWriter(buffer, fieldnames=fields)
+            writer.writeheader()
+            while True:
+                last_id, rows = await asyncio.to_thread(query_chunk, table_name, last_id, CHUNK_SIZE)
+                if not rows:
+                    break
+                writer.writerows(rows)
+                written += len(rows)
+                async with self:
+                    if generation != self.load_generation:
+                        return
+                    self.job_progress = min(100, written * 100 // max(total, 1))
+        except Exception as e:
+            print(f"Error exporting {table_name}: {e}")
+            async with self:
+                self.is_loading = False
+            return
+        async with self:
+            self.is_loading = False
+            self.job_progress = 100
+        return rx.download(data=buffer.getvalue(), filename=f"{table_name.lower()}.csv")
+    
+    @rx.background
+    async def check_integrity(self):
+        """Run the orphan scan over every relation and report what it found."""
+        async with self:
+            if not await is_admin_session(self):
+                return
+            self.is_loading = True
+            self.job_label = "Cek integritas"
+            self.job_progress = 0
+        try:
+            results = await asyncio.to_thread(check_orphans)
+        except Exception as e:
+            print(f"Error checking integrity: {e}")
+            results = None
+        async with self:
+            self.is_loading = False
+            self.job_progress = 100
+            if results is None:
+                self.bulk_message = "Gagal memeriksa integritas data."
+                return
+            broken = [f"{r['relation']}: {r['orphans']}" for r in results if r["orphans"]]
+            self.bulk_message = ("Data yatim: " + "; ".join(broken)) if broken else "Tidak ada data yatim."
+    
+    @rx.background
+    async def recompute_totals(self):
+        """Check today's Transaksi totals against menu prices; fixing needs a confirmation."""
+        async with self:
+            if not await is_admin_session(self):
+                return
+            self.is_loading = True
+            self.job_label = "Cek total transaksi"
+            self.job_progress = 0
+        try:
+            report = await asyncio.to_thread(recompute_transaksi, None, False)
+        except Exception as e:
+            print(f"Error checking totals: {e}")
+            report = None
+        async with self:
+            self.is_loading = False
+            self.job_progress = 100
+            if report is None:
+                self.bulk_message = "Gagal memeriksa total."
+                return
+            samples = ", ".join(
+                f"{s['ID_Transaksi']}: {s['stored'] or 0:,.0f} → {s['computed']:,.0f}" for s in report['samples'][:5]
+            )
+            self.bulk_message = (
+                f"{report['checked']} transaksi dicek, {report['mismatched']} total tidak cocok, "
+                f"{report['missing']} tanpa pesanan/menu." + (f" Contoh: {samples}" if samples else "")
+            )
+            if report['mismatched']:
+                self.confirm_action = CONFIRM_FIX_TOTALS
+                self.confirm_message = (
+                    f"Perbaiki {report['mismatched']} Total_Harga hari ini sesuai harga menu?"
+                )
+    
+    @rx.background
+    async def fix_totals(self):
+        """Rewrite today's mismatched Transaksi totals after the admin confirmed."""
+        async with self:
+            if not await is_admin_session(self):
+                return
+            if self.confirm_action != CONFIRM_FIX_TOTALS:
+                return
+            self.cancel_confirm()
+            self.is_loading = True
+            self.job_label = "Perbaiki total transaksi"
+            self.job_progress = 0
+        try:
+            report = await asyncio.to_thread(recompute_transaksi, None, True)
+        except Exception as e:
+            print(f"Error fixing totals: {e}")
+            report = None
+        async with self:
+            self.is_loading = False
+            self.job_progress = 100
+            if report is None:
+                self.bulk_message = "Gagal memperbaiki total."
+                return
+            self.bulk_message = f"{report['fixed']} total diperbaiki dari {report['checked']} transaksi."
+            if report['fixed']:
+                reports.clear()
+                prefetched_pages.invalidate("TRANSAKSI")
+                if self.current_tab == "TRANSAKSI":
+                    return AdminDashboardState.refresh_table
+    
+    @rx.background
+    async def reconcile_payments(self):
+        """Match a year of Pembayaran against Transaksi and report problems."""
+        async with self:
+            if not await is_admin_session(self):
+                return
+            self.is_loading = True
+            self.job_label = "Rekonsiliasi pembayaran"
+            self.job_progress = 0
+        try:
+            result = await asyncio.to_thread(run_reconciliation)
+        except Exception as e:
+            print(f"Error reconciling payments: {e}")
+            result = None
+        async with self:
+            self.is_loading = False
+            self.job_progress = 100
+            self.bulk_message = summary(result) if result is not None else "Gagal melakukan rekonsiliasi."
+    
+    def ask_close_day(self):
+        """Ask before closing yesterday: rentals are ended and the ledger is final."""
+        self.close_date = (date.today() - timedelta(days=1)).isoformat()
+        self.confirm_action = CONFIRM_CLOSE_DAY
+        self.confirm_message = (
+            f"Tutup hari {self.close_date}? Rental yang masih berjalan akan diselesaikan "
+            "dan ledger tidak bisa diubah lagi."
+        )
+    
+    def cancel_confirm(self):
+        self.confirm_action = ""
+        self.confirm_message = ""
+    
+    def run_confirmed(self):
+        """Start the job the admin just confirmed."""
+        jobs = {
+            CONFIRM_CLOSE_DAY: AdminDashboardState.close_today,
+            CONFIRM_FIX_TOTALS: AdminDashboardState.fix_totals,
+        }
+        return jobs.get(self.confirm_action)
+    
+    @rx.background
+    async def close_today(self):
+        """Run the confirmed end-of-day close; re-running shows the stored ledger."""
+        async with self:
+            if not await is_admin_session(self):
+                return
+            if self.confirm_action != CONFIRM_CLOSE_DAY or not self.close_date:
+                return
+            self.cancel_confirm()
+            day = date.fromisoformat(self.close_date)
+            self.is_loading = True
+            self.job_label = "Tutup hari"
+            self.job_progress = 0
+        try:
+            ledger = await asyncio.to_thread(close_day, day)
+        except ValueError as e:
+            async with self:
+                self.is_loading = False
+                self.bulk_message = f"Tidak bisa menutup: {e}."
+            return
+        except Exception as e:
+            print(f"Error closing day: {e}")
+            ledger = None
+        if ledger is not None and ledger["rentals_closed"]:
+            # Rentals ended at midnight change that day's utilization
+            reports.clear()
+        async with self:
+            self.is_loading = False
+            self.job_progress = 100
+            if ledger is None:
+                self.bulk_message = "Gagal menutup hari."
+                return
+            self.bulk_message = (
+                f"Tutup {ledger['business_date']}: pendapatan Rp {ledger['revenue_total']:,.0f}, "
+                f"pembayaran Rp {ledger['payments_total']:,.0f}, {ledger['rentals_closed']} rental ditutup."
+            )
+    
+    async def handle_import(self, files: List[rx.UploadFile]):
+        """Save one uploaded CSV under a generated name and import it in the background."""
+        if not await is_admin_session(self):
+            return
+        if len(files) != 1:
+            self.bulk_message = "Unggah tepat satu file CSV."
+            return
+        # The client's filename is never used as a path
+        path = rx.get_upload_dir() / "imports" / f"{uuid.uuid4().hex}.csv"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(await files[0].read())
+        return AdminDashboardState.import_table(self.current_tab, str(path))
+    
+    @rx.background
+    async def import_table(self, table_name: str, path: str):
+        """Insert CSV rows in chunks, one transaction per chunk, with progress.
+
+        New rows are added to the search index per chunk; the other caches
+        of the table are dropped once, after the last chunk.
+        """
+        async with self:
+            if not await is_admin_session(self):
+                return
+            generation = self.load_generation
+            self.is_loading = True
+            self.job_label = f"Impor {table_name}"
+            self.job_progress = 0
+        size = max(os.path.getsize(path), 1)
+        imported = 0
+        try:
+            with open(path, newline="", encoding="utf-8") as f:
+                reader = csv.DictReader(f)
+                while True:
+                    chunk = list(itertools.islice(reader, CHUNK_SIZE))
+                    if not chunk:
+                        break
+                    ids = await asyncio.to_thread(insert_chunk, table_name, chunk)
+                    imported += len(ids)
+                    if table_name == "CUSTOMER":
+                        customer_ids.add_many(ids)
+                    if table_name in SEARCH_FIELDS:
+                        for item_id, row in zip(ids, chunk):
+                            search_index.put(table_name, item_id,
+                                             [row.get(field, "") for field in SEARCH_FIELDS[table_name]])
+                    async with self:
+                        if generation != self.load_generation:
+                            # Rows already committed stay; the rest is skipped
+                            break
+                        self.job_progress = min(99, f.tell() * 100 // size)
+        except Exception as e:
+            print(f"Error importing {table_name}: {e}")
+        finally:
+            os.remove(path)
+        if imported:
+            if table_name == "CUSTOMER":
+                customer_phones.invalidate()
+            fk_lookup.invalidate(table_name)
+            if table_name in ORDER_TABLES:
+                order_history.clear()
+            if table_name in REPORT_TABLES:
+                reports.clear()
+            if table_name == "MENU":
+                menu_prices.invalidate()
+            prefetched_pages.invalidate(table_name)
+        async with self:
+            if generation != self.load_generation:
+                return
+            self.is_loading = False
+            self.job_progress = 100
+            if table_name == self.current_tab:
+                return self.refresh_table()
+    
+    def set_filter(self, field: str, value: str):
+        """Filter the current table on a column and reload from the top."""
+        if value and value != ALL_VALUES:
+            self.filters[field] = value
+        else:
+            self.filters.pop(field, None)
+        return [self.refresh_table(), virtual_table.scroll_to_top(self.current_tab.lower())]
+    
+    def toggle_sort(self, field: str):
+        """Sort by a column; clicking it again reverses the order."""
+        if self.sort_field == field:
+            self.sort_desc = not self.sort_desc
+        else:
+            self.sort_field = field
+            self.sort_desc = False
+        return [self.refresh_table(), virtual_table.scroll_to_top(self.current_tab.lower())]
+    
+    def toggle_selected(self, item_id: str):
+        """Tick or untick a row for a bulk operation."""
+        if item_id in self.selected_ids:
+            self.selected_ids.remove(item_id)
+        else:
+            self.selected_ids.append(item_id)
+    
+    def clear_selection(self):
+        self.selected_ids = []
+    
+    def _bulk_scope(self) -> Optional[Dict[str, Any]]:
+        """IDs/filters for the chosen scope, or None (with a message) if empty."""
+        if self.bulk_scope == BULK_FILTERED:
+            if not self.filters:
+                self.bulk_message = "Pilih minimal satu filter terlebih dahulu."
+                return None
+            return {"ids": None, "filters": dict(self.filters)}
+        if not self.selected_ids:
+            self.bulk_message = "Belum ada data yang dipilih."
+            return None
+        return {"ids": list(self.selected_ids), "filters": None}
+    
+    def _drop_caches(self, table_name: str, search_ids: Optional[List[str]] = None):
+        """Forget cached rows of a table changed by a bulk or cascading write.
+
+        ``search_ids`` are the rows whose searched columns may have changed;
+        only those are re-indexed. Without it (cascades) the table's search
+        rows are reloaded.
+        """
+        if table_name == "CUSTOMER":
+            customer_ids.invalidate()
+            customer_phones.invalidate()
+        fk_lookup.invalidate(table_name)
+        if table_name in SEARCH_FIELDS:
+            if search_ids is None:
+                search_index.invalidate(table_name)
+            elif search_ids:
+                reindex_rows(table_name, search_ids)
+        if table_name in ORDER_TABLES:
+            order_history.clear()
+        if table_name in REPORT_TABLES:
+            reports.clear()
+        if table_name == "MENU":
+            menu_prices.invalidate()
+        prefetched_pages.invalidate(table_name)
+    
+    def _after_bulk(self, table_name: str, count: int, action: str, search_ids: List[str]):
+        """Drop caches for the table and reload it once."""
+        self._drop_caches(table_name, search_ids)
+        self.selected_ids = []
+        self.bulk_message = f"{count} data {action}."
+        return self.refresh_table()
+    
+    async def bulk_delete_items(self):
+        """Delete the scope (and cascaded child rows) in one transaction."""
+        if not await is_admin_session(self):
+            return
+        scope = self._bulk_scope()
+        if scope is None:
+            return
+        table_name = self.current_tab
+        try:
+            search_ids = scope_ids(table_name, **scope) if table_name in SEARCH_FIELDS else []
+            counts = bulk_delete(table_name, **scope)
+        except RestrictViolation as e:
+            self.bulk_message = f"Tidak bisa dihapus: {e}."
+            return
+        except Exception as e:
+            print(f"Error bulk deleting {table_name}: {e}")
+            self.bulk_message = "Gagal menghapus data."
+            return
+        for other, count in counts.items():
+            if other != table_name and count:
+                self._drop_caches(other)
+        return self._after_bulk(table_name, counts.get(table_name, 0), "dihapus", search_ids)
+    
+    async def bulk_update_items(self):
+        """Set one column on the scope with a single UPDATE statement."""
+        if not await is_admin_session(self):
+            return
+        scope = self._bulk_scope()
+        table_name = self.current_tab
+        if scope is None or self.bulk_field not in TABLE_CONFIGS[table_name]['fields'][1:]:
+            return
+        try:
+            value = coerce_value(self.bulk_field, self.bulk_value)
+            searched = self.bulk_field in SEARCH_FIELDS.get(table_name, [])
+            search_ids = scope_ids(table_name, **scope) if searched else []
+            count = bulk_update(table_name, {self.bulk_field: value}, **scope)
+        except Exception as e:
+            print(f"Error bulk updating {table_name}: {e}")
+            self.bulk_message = "Gagal mengubah data."
+            return
+        return self._after_bulk(table_name, count, "diubah", search_ids)
+    
+    async def bulk_adjust_amount(self):
+        """Change the tab's money column by a percentage, e.g. all Minuman +10%."""
+        if not await is_admin_session(self):
+            return
+        scope = self._bulk_scope()
+        table_name = self.current_tab
+        field = AMOUNT_FIELDS.get(table_name)
+        if scope is None or field is None:
+            return
+        try:
+            factor = 1 + float(self.bulk_percent) / 100
+            column = getattr(TABLE_CONFIGS[table_name]['model'], field)
+            count = bulk_update(table_name, {column: column * factor}, **scope)
+        except Exception as e:
+            print(f"Error adjusting {field}: {e}")
+            self.bulk_message = "Persentase tidak valid."
+            return
+        # Money columns are not searched
+        return self._after_bulk(table_name, count, "diubah", [])
+    
+    async def scroll_table(self, scroll_top: float):
+        """Fetch a new window when scrolling leaves the loaded rows."""
+        if not await is_admin_session(self):
+            return
+        window = virtual_table.next_window(
+            scroll_top or 0, self.total_rows, self.window_start, len(self.rows)
+        )
+        if window is not None:
+            self.window_start, self.window_size = window
+            self.fetch_window(self.current_tab)
+    
+    @rx.var
+    def top_spacer(self) -> str:
+        return virtual_table.spacer_px(self.window_start)
+    
+    @rx.var
+    def bottom_spacer(self) -> str:
+        return virtual_table.spacer_px(self.total_rows - self.window_start - len(self.rows))
     
     def open_add_dialog(self):
         """Open dialog for adding new item."""
         fields = self.table_configs[self.current_tab]['fields']
         self.editing_item = {}
         self.form_data = {field: "" for field in fields[1:]}  # Skip ID field
+        self._reset_fk_pickers()
         self.is_dialog_open = True
     
-    def open_edit_dialog(self, item: Dict[str, Any]):
+    def open_edit_dialog(self, item_id: str):
         """Open dialog for editing item."""
         fields = self.table_configs[self.current_tab]['fields']
+        index = row_index(self.rows, 0, item_id)
+        if index < 0:
+            return
+        item = decode_row(self.rows[index], fields, self.dictionaries)
         self.editing_item = item
         self.form_data = {field: str(item.get(field, "")) for field in fields[1:]}
         self.selected_id = item.get(fields[0], "")
+        self._reset_fk_pickers()
         self.is_dialog_open = True
     
     def close_dialog(self):
@@ -118,16 +993,67 @@ class AdminDashboardState(rx.State):
         self.form_data = {}
         self.selected_id = ""
     
-    def set_form_field(self, field: str, value: str):
-        """Set form field value."""
-        self.form_data[field] = value
+    def _reset_fk_pickers(self):
+        """Show the current value in each foreign key picker of the form."""
+        fk_fields = [field for field in self.form_data if field in FK_TABLES]
+        self.fk_query = {field: self.form_data[field] for field in fk_fields}
+        self.fk_options = {field: [] for field in fk_fields}
+    
+    async def search_fk(self, field: str, query: str):
+        """Top matches for what was typed into a foreign key picker."""
+        if not await is_admin_session(self):
+            return
+        self.form_data[field] = query
+        self.fk_query[field] = query
+        self.fk_options[field] = fk_lookup.search(FK_TABLES[field], query, FK_MATCHES) if query else []
+    
+    async def search(self, query: str):
+        """Top matches across customers, staff and menu for the search box."""
+        if not await is_admin_session(self):
+            return
+        self.search_query = query
+        if looks_like_phone(query):
+            self.search_results = phone_matches(query)
+        else:
+            self.search_results = search_index.search(query, 10, kinds=SEARCH_FIELDS) if query else []
+    
+    async def open_search_result(self, kind: str):
+        """Show the tab a search result belongs to."""
+        self.search_query = ""
+        self.search_results = []
+        return await self.set_current_tab(kind)
     
-    async def save_item(self):
-        """Save item to database."""
+    async def pick_fk(self, field: str, item_id: str):
+        """Use a suggested ID and close the suggestion list."""
+        if not await is_admin_session(self):
+            return
+        self.form_data[field] = item_id
+        self.fk_query[field] = item_id
+        self.fk_options[field] = []
+        if self.current_tab == "TRANSAKSI" and field == "ID_Pesanan":
+            self._fill_total()
+    
+    def _fill_total(self):
+        """Set Total_Harga from the chosen Pesanan's menu price."""
+        try:
+            total = transaksi_total(self.form_data.get("ID_Pesanan", ""))
+        except Exception as e:
+            print(f"Error computing total: {e}")
+            return
+        if total is not None:
+            self.form_data["Total_Harga"] = str(total)
+    
+    async def save_item(self, form_data: Dict[str, Any]):
+        """Save the submitted form to the database."""
+        if not await is_admin_session(self):
+            return
+        self.form_data = {**self.form_data, **form_data}
         try:
             config = self.table_configs[self.current_tab]
             model_class = config['model']
             fields = config['fields']
+            if self.current_tab == "TRANSAKSI" and not str(self.form_data.get("Total_Harga", "")).strip():
+                self._fill_total()
             
             with rx.session() as session:
                 if self.editing_item:
@@ -138,85 +1064,83 @@ class AdminDashboardState(rx.State):
                     
                     if item:
                         for field in fields[1:]:
-                            value = self.form_data.get(field, "")
-                            if "tanggal" in field.lower() or "waktu" in field.lower():
-                                if value:
-                                    try:
-                                        value = datetime.strptime(value, "%d-%m-%Y")
-                                    except ValueError:
-                                        value = datetime.strptime(value, "%Y-%m-%d")
-                            elif field in ["Gaji", "Harga_Menu", "Jumlah_Bayar", "Total_Harga"]:
-                                value = float(value) if value else 0.0
-                            elif field in ["Nomor_Meja"]:
-                                value = int(value) if value else 0
-                            
-                            setattr(item, field, value)
+                            setattr(item, field, coerce_value(field, self.form_data.get(field, "")))
+                    session.commit()
                 else:
-                    # Create new item
-                    new_id = generate_custom_id(self.current_tab)
-                    
-                    item_data = {fields[0]: new_id}
-                    for field in fields[1:]:
-                        value = self.form_data.get(field, "")
-                        if "tanggal" in field.lower() or "waktu" in field.lower():
-                            if value:
-                                try:
-                                    value = datetime.strptime(value, "%d-%m-%Y")
-                                except ValueError:
-                                    value = datetime.strptime(value, "%Y-%m-%d")
-                            else:
-                                value = datetime.now()
-                        elif field in ["Gaji", "Harga_Menu", "Jumlah_Bayar", "Total_Harga"]:
-                            value = float(value) if value else 0.0
-                        elif field in ["Nomor_Meja"]:
-                            value = int(value) if value else 0
-                        
-                        item_data[field] = value
-                    
-                    new_item = model_class(**item_data)
-                    session.add(new_item)
+                    # Create new item; a new ID is drawn if another process took this one
+                    values = {field: coerce_value(field, self.form_data.get(field, ""), default_now=True)
+                              for field in fields[1:]}
+                    item, = commit_with_new_ids(
+                        session, self.current_tab,
+                        lambda new_id: [model_class(**{fields[0]: new_id()}, **values)]
+                    )
+                    new_id = getattr(item, fields[0])
                 
-                session.commit()
+                if item is None:
+                    self.close_dialog()
+                    return
+                item_dict = row_to_dict(item, fields)
+                if self.current_tab in FK_LABELS:
+                    fk_lookup.put(self.current_tab, item_dict[fields[0]], row_label(item_dict, FK_LABELS[self.current_tab]))
+                if self.current_tab == "CUSTOMER":
+                    customer_phones.put(item_dict[fields[0]], item_dict["Kontak_Customer"])
+                if self.current_tab in SEARCH_FIELDS:
+                    search_index.put(self.current_tab, item_dict[fields[0]],
+                                     [item_dict[field] for field in SEARCH_FIELDS[self.current_tab]])
+                if self.current_tab in ORDER_TABLES:
+                    order_history.clear()
+                if self.current_tab in REPORT_TABLES:
+                    reports.clear()
+                if self.current_tab == "MENU":
+                    menu_prices.invalidate()
+                prefetched_pages.invalidate(self.current_tab)
+                row = encode_row(item_dict, fields, self.dictionaries)
+                if self.editing_item:
+                    patch_row(self.rows, 0, self.selected_id, dict(enumerate(row)))
+                else:
+                    if self.current_tab == "CUSTOMER":
+                        customer_ids.add(new_id)
+                    if row_matches(self.current_tab, item, self.filters):
+                        # Rows are ordered by id, so a new row only shows when the window reaches the end
+                        at_end = not self.sort_field and self.window_start + len(self.rows) >= self.total_rows
+                        self.total_rows += 1
+                        if at_end:
+                            insert_row(self.rows, row, 0)
                 self.close_dialog()
-                await self.load_table_data(self.current_tab)
                 
         except Exception as e:
             print(f"Error saving item: {e}")
+            self.bulk_message = "Gagal menyimpan data."
     
     async def delete_item(self, item_id: str):
-        """Delete item from database."""
+        """Delete item from database, cascading to its child rows."""
+        if not await is_admin_session(self):
+            return
         try:
-            config = self.table_configs[self.current_tab]
-            model_class = config['model']
-            fields = config['fields']
-            
-            with rx.session() as session:
-                item = session.query(model_class).filter(
-                    getattr(model_class, fields[0]) == item_id
-                ).first()
-                
-                if item:
-                    session.delete(item)
-                    session.commit()
-                    await self.load_table_data(self.current_tab)
+            counts = bulk_delete(self.current_tab, ids=[item_id])
+            if counts.get(self.current_tab):
+                if self.current_tab == "CUSTOMER":
+                    customer_ids.discard(item_id)
+                    customer_phones.remove(item_id)
+                fk_lookup.remove(self.current_tab, item_id)
+                search_index.remove(self.current_tab, item_id)
+                if self.current_tab in ORDER_TABLES:
+                    order_history.clear()
+                if self.current_tab in REPORT_TABLES:
+                    reports.clear()
+                if self.current_tab == "MENU":
+                    menu_prices.invalidate()
+                prefetched_pages.invalidate(self.current_tab)
+                self.total_rows -= 1
+                remove_row(self.rows, 0, item_id)
+            for other, count in counts.items():
+                if other != self.current_tab and count:
+                    self._drop_caches(other)
                     
+        except RestrictViolation as e:
+            self.bulk_message = f"Tidak bisa dihapus: {e}."
         except Exception as e:
             print(f"Error deleting item: {e}")
-    
-    def get_fk_options(self, field: str) -> List[str]:
-        """Get foreign key options for dropdown."""
-        fk_map = {
-            "ID_Karyawan": self.karyawan,
-            "ID_Customer": self.customers,
-            "ID_Meja": self.meja,
-            "ID_Menu": self.menu,
-            "ID_Pesanan": self.pesanan,
-            "ID_Transaksi": self.transaksi,
-        }
-        
-        data = fk_map.get(field, [])
-        field_key = field
-        return [item.get(field_key, "") for item in data if item.get(field_key)]
 
 def table_tab_button(tab_name: str, label: str) -> rx.Component:
     """Create tab button."""
@@ -233,6 +1157,46 @@ def table_tab_button(tab_name: str, label: str) -> rx.Component:
         variant="outline"
     )
 
+def form_input(field_name: str, **props) -> rx.Component:
+    """Uncontrolled form input prefilled from AdminDashboardState.form_data.
+
+    Typing sends no events; the value arrives with the form submit. The
+    key remounts the input when the server changes its value, e.g. the
+    Total_Harga filled in after picking a Pesanan.
+    """
+    return rx.input(
+        name=field_name,
+        default_value=AdminDashboardState.form_data.get(field_name, ""),
+        key=AdminDashboardState.form_data.get(field_name, ""),
+        class_name="bg-slate-700 border-slate-600 text-white",
+        **props
+    )
+
+def fk_picker(field_name: str) -> rx.Component:
+    """Typeahead for a foreign key: only the top matches are fetched."""
+    return rx.vstack(
+        rx.text(field_name, class_name="text-sm font-medium text-slate-300"),
+        rx.input(
+            name=field_name,
+            placeholder=f"Cari {field_name} atau nama",
+            value=AdminDashboardState.fk_query[field_name],
+            on_change=lambda value: AdminDashboardState.search_fk(field_name, value),
+            debounce_timeout=250,
+            class_name="bg-slate-700 border-slate-600 text-white"
+        ),
+        rx.foreach(
+            AdminDashboardState.fk_options[field_name],
+            lambda option: rx.button(
+                rx.text(option["id"], " — ", option["label"]),
+                on_click=lambda: AdminDashboardState.pick_fk(field_name, option["id"]),
+                type="button",
+                variant="ghost",
+                class_name="w-full justify-start text-sm text-slate-200 hover:bg-slate-600"
+            )
+        ),
+        class_name="space-y-1"
+    )
+
 def form_field(field_name: str, field_type: str = "text") -> rx.Component:
     """Create form field based on field name and type."""
     
@@ -242,8 +1206,8 @@ def form_field(field_name: str, field_type: str = "text") -> rx.Component:
             rx.text(field_name, class_name="text-sm font-medium text-slate-300"),
             rx.select(
                 ["Makanan", "Minuman"],
-                value=AdminDashboardState.form_data.get(field_name, "Makanan"),
-                on_change=lambda value: AdminDashboardState.set_form_field(field_name, value),
+                name=field_name,
+                default_value=AdminDashboardState.form_data.get(field_name, "Makanan"),
                 class_name="bg-slate-700 border-slate-600 text-white"
             ),
             class_name="space-y-1"
@@ -253,8 +1217,8 @@ def form_field(field_name: str, field_type: str = "text") -> rx.Component:
             rx.text(field_name, class_name="text-sm font-medium text-slate-300"),
             rx.select(
                 ["AVAILABLE", "DIPESAN", "TERPAKAI"],
-                value=AdminDashboardState.form_data.get(field_name, "AVAILABLE"),
-                on_change=lambda value: AdminDashboardState.set_form_field(field_name, value),
+                name=field_name,
+                default_value=AdminDashboardState.form_data.get(field_name, "AVAILABLE"),
                 class_name="bg-slate-700 border-slate-600 text-white"
             ),
             class_name="space-y-1"
@@ -264,8 +1228,8 @@ def form_field(field_name: str, field_type: str = "text") -> rx.Component:
             rx.text(field_name, class_name="text-sm font-medium text-slate-300"),
             rx.select(
                 ["PENDING", "CONFIRMED", "CANCELLED", "COMPLETED"],
-                value=AdminDashboardState.form_data.get(field_name, "PENDING"),
-                on_change=lambda value: AdminDashboardState.set_form_field(field_name, value),
+                name=field_name,
+                default_value=AdminDashboardState.form_data.get(field_name, "PENDING"),
                 class_name="bg-slate-700 border-slate-600 text-white"
             ),
             class_name="space-y-1"
@@ -275,34 +1239,18 @@ def form_field(field_name: str, field_type: str = "text") -> rx.Component:
             rx.text(field_name, class_name="text-sm font-medium text-slate-300"),
             rx.select(
                 ["Cash", "Credit Card", "Debit Card", "Digital Wallet"],
-                value=AdminDashboardState.form_data.get(field_name, "Cash"),
-                on_change=lambda value: AdminDashboardState.set_form_field(field_name, value),
-                class_name="bg-slate-700 border-slate-600 text-white"
-            ),
-            class_name="space-y-1"
-        )
-    elif any(fk in field_name for fk in ["ID_Karyawan", "ID_Customer", "ID_Meja", "ID_Menu", "ID_Pesanan", "ID_Transaksi"]):
-        # Foreign key fields
-        options = AdminDashboardState.get_fk_options(field_name)
-        return rx.vstack(
-            rx.text(field_name, class_name="text-sm font-medium text-slate-300"),
-            rx.select(
-                options,
-                value=AdminDashboardState.form_data.get(field_name, ""),
-                on_change=lambda value: AdminDashboardState.set_form_field(field_name, value),
+                name=field_name,
+                default_value=AdminDashboardState.form_data.get(field_name, "Cash"),
                 class_name="bg-slate-700 border-slate-600 text-white"
             ),
             class_name="space-y-1"
         )
+    elif field_name in FK_TABLES:
+        return fk_picker(field_name)
     elif "tanggal" in field_name.lower() or "waktu" in field_name.lower():
         return rx.vstack(
             rx.text(field_name, class_name="text-sm font-medium text-slate-300"),
-            rx.input(
-                type="date",
-                value=AdminDashboardState.form_data.get(field_name, ""),
-                on_change=lambda value: AdminDashboardState.set_form_field(field_name, value),
-                class_name="bg-slate-700 border-slate-600 text-white"
-            ),
+            form_input(field_name, type="date"),
             class_name="space-y-1"
         )
     else:
@@ -310,13 +1258,7 @@ def form_field(field_name: str, field_type: str = "text") -> rx.Component:
         input_type = "number" if field_name in ["Gaji", "Harga_Menu", "Jumlah_Bayar", "Total_Harga", "Nomor_Meja"] else "text"
         return rx.vstack(
             rx.text(field_name, class_name="text-sm font-medium text-slate-300"),
-            rx.input(
-                type=input_type,
-                placeholder=f"Masukkan {field_name}",
-                value=AdminDashboardState.form_data.get(field_name, ""),
-                on_change=lambda value: AdminDashboardState.set_form_field(field_name, value),
-                class_name="bg-slate-700 border-slate-600 text-white"
-            ),
+            form_input(field_name, type=input_type, placeholder=f"Masukkan {field_name}"),
             class_name="space-y-1"
         )
 
@@ -345,31 +1287,37 @@ def data_form() -> rx.Component:
                         class_name="flex justify-between items-center w-full"
                     ),
                     
-                    rx.vstack(
-                        *[
-                            form_field(field) 
-                            for field in AdminDashboardState.table_configs[AdminDashboardState.current_tab]['fields'][1:]
-                        ],
-                        class_name="space-y-4 w-full max-h-96 overflow-y-auto"
-                    ),
-                    
-                    rx.hstack(
-                        rx.button(
-                            "Batal",
-                            on_click=AdminDashboardState.close_dialog,
-                            class_name="border-slate-600 text-slate-300 hover:bg-slate-700",
-                            variant="outline"
+                    # Uncontrolled form: typing sends nothing, submit sends every field at once
+                    rx.form(
+                        rx.vstack(
+                            *[
+                                form_field(field) 
+                                for field in AdminDashboardState.table_configs[AdminDashboardState.current_tab]['fields'][1:]
+                            ],
+                            class_name="space-y-4 w-full max-h-96 overflow-y-auto"
                         ),
-                        rx.button(
-                            rx.cond(
-                                AdminDashboardState.editing_item,
-                                "Update",
-                                "Tambah"
+                        
+                        rx.hstack(
+                            rx.button(
+                                "Batal",
+                                type="button",
+                                on_click=AdminDashboardState.close_dialog,
+                                class_name="border-slate-600 text-slate-300 hover:bg-slate-700",
+                                variant="outline"
+                            ),
+                            rx.button(
+                                rx.cond(
+                                    AdminDashboardState.editing_item,
+                                    "Update",
+                                    "Tambah"
+                                ),
+                                type="submit",
+                                class_name="bg-blue-600 hover:bg-blue-700 text-white"
                             ),
-                            on_click=AdminDashboardState.save_item,
-                            class_name="bg-blue-600 hover:bg-blue-700 text-white"
+                            class_name="flex justify-end space-x-2 pt-4"
                         ),
-                        class_name="flex justify-end space-x-2 pt-4"
+                        on_submit=AdminDashboardState.save_item,
+                        class_name="space-y-6 w-full"
                     ),
                     
                     class_name="space-y-6"
@@ -380,16 +1328,133 @@ def data_form() -> rx.Component:
         )
     )
 
+def filter_bar(tab_name: str) -> rx.Component:
+    """Filter controls for one tab; filtering happens in the SQL query."""
+    controls = []
+    for field in filter_fields(tab_name):
+        if field in FILTER_CHOICES:
+            control = rx.select(
+                [ALL_VALUES] + FILTER_CHOICES[field],
+                value=AdminDashboardState.filters.get(field, ALL_VALUES),
+                on_change=lambda value, field=field: AdminDashboardState.set_filter(field, value),
+                class_name="bg-slate-700 border-slate-600 text-white"
+            )
+        elif is_date_field(field):
+            control = rx.input(
+                type="date",
+                value=AdminDashboardState.filters.get(field, ""),
+                on_change=lambda value, field=field: AdminDashboardState.set_filter(field, value),
+                class_name="bg-slate-700 border-slate-600 text-white"
+            )
+        else:
+            control = rx.input(
+                placeholder=field,
+                value=AdminDashboardState.filters.get(field, ""),
+                on_change=lambda value, field=field: AdminDashboardState.set_filter(field, value),
+                debounce_timeout=300,
+                class_name="bg-slate-700 border-slate-600 text-white w-32"
+            )
+        controls.append(rx.vstack(
+            rx.text(field, class_name="text-xs text-slate-400"),
+            control,
+            class_name="space-y-1"
+        ))
+    return rx.hstack(*controls, class_name="flex flex-wrap gap-3 p-3")
+
+def bulk_bar(tab_name: str) -> rx.Component:
+    """Bulk delete/update of the ticked rows or of everything filtered."""
+    input_class = "bg-slate-700 border-slate-600 text-white"
+    controls = [
+        rx.select(
+            [BULK_SELECTED, BULK_FILTERED],
+            value=AdminDashboardState.bulk_scope,
+            on_change=AdminDashboardState.set_bulk_scope,
+            class_name=input_class
+        ),
+        rx.text(AdminDashboardState.selected_ids.length(), " dipilih", class_name="text-xs text-slate-400"),
+        rx.select(
+            TABLE_CONFIGS[tab_name]['fields'][1:],
+            placeholder="Kolom",
+            value=AdminDashboardState.bulk_field,
+            on_change=AdminDashboardState.set_bulk_field,
+            class_name=input_class
+        ),
+        rx.input(
+            placeholder="Nilai baru",
+            value=AdminDashboardState.bulk_value,
+            on_change=AdminDashboardState.set_bulk_value,
+            class_name=input_class + " w-32"
+        ),
+        rx.button("Ubah", on_click=AdminDashboardState.bulk_update_items,
+                  class_name="bg-blue-600 hover:bg-blue-700 text-white"),
+    ]
+    if tab_name in AMOUNT_FIELDS:
+        controls += [
+            rx.input(
+                placeholder=f"{AMOUNT_FIELDS[tab_name]} %",
+                type="number",
+                value=AdminDashboardState.bulk_percent,
+                on_change=AdminDashboardState.set_bulk_percent,
+                class_name=input_class + " w-28"
+            ),
+            rx.button("Terapkan %", on_click=AdminDashboardState.bulk_adjust_amount,
+                      class_name="bg-blue-600 hover:bg-blue-700 text-white"),
+        ]
+    controls += [
+        rx.button("Hapus", on_click=AdminDashboardState.bulk_delete_items,
+                  class_name="bg-red-600 hover:bg-red-700 text-white"),
+        rx.text(AdminDashboardState.bulk_message, class_name="text-xs text-slate-400"),
+    ]
+    return rx.hstack(*controls, class_name="flex flex-wrap items-center gap-2 px-3")
+
+def table_window(tab_name: str) -> rx.Component:
+    """Filter bar, bulk actions and windowed table for one tab."""
+    fields = TABLE_CONFIGS[tab_name]['fields']
+    return rx.vstack(filter_bar(tab_name), bulk_bar(tab_name), virtual_table.virtual_table(
+        tab_name.lower(),
+        AdminDashboardState.rows,
+        fields,
+        AdminDashboardState.top_spacer,
+        AdminDashboardState.bottom_spacer,
+        AdminDashboardState.scroll_table,
+        AdminDashboardState.window_start,
+        AdminDashboardState.total_rows,
+        dictionaries=AdminDashboardState.dictionaries,
+        on_sort=AdminDashboardState.toggle_sort,
+        sort_field=AdminDashboardState.sort_field,
+        sort_desc=AdminDashboardState.sort_desc,
+        sortable=sortable_fields(tab_name),
+        actions=lambda item: rx.hstack(
+            rx.checkbox(
+                checked=AdminDashboardState.selected_ids.contains(item[0]),
+                on_change=lambda _: AdminDashboardState.toggle_selected(item[0]),
+            ),
+            rx.button(
+                rx.icon(tag="edit", size=16),
+                on_click=lambda: AdminDashboardState.open_edit_dialog(item[0]),
+                class_name="h-8 w-8 p-0 text-slate-400 hover:text-yellow-400 bg-transparent border-none",
+                variant="ghost"
+            ),
+            rx.button(
+                rx.icon(tag="trash_2", size=16),
+                on_click=lambda: AdminDashboardState.delete_item(item[0]),
+                class_name="h-8 w-8 p-0 text-slate-400 hover:text-red-400 bg-transparent border-none",
+                variant="ghost"
+            ),
+            class_name="flex items-center space-x-2"
+        ),
+        header_class="text-slate-300 font-semibold text-left py-3 px-4 bg-slate-800",
+        cell_class="text-slate-200 py-3 px-4",
+    ), class_name="w-full")
+
 def data_table() -> rx.Component:
     """Data table component."""
-    current_data = getattr(AdminDashboardState, AdminDashboardState.current_tab.lower())
-    fields = AdminDashboardState.table_configs[AdminDashboardState.current_tab]['fields']
-    
     return rx.box(
         rx.vstack(
             rx.hstack(
                 rx.heading(f"Data {AdminDashboardState.current_tab}", class_name="text-2xl font-bold text-white"),
                 rx.hstack(
+                    rx.text(AdminDashboardState.total_rows, " data", class_name="text-slate-400 text-sm"),
                     rx.button(
                         rx.hstack(
                             rx.icon(tag="plus", size=16),
@@ -405,51 +1470,111 @@ def data_table() -> rx.Component:
                             rx.text("Refresh"),
                             class_name="flex items-center space-x-2"
                         ),
-                        on_click=lambda: AdminDashboardState.load_table_data(AdminDashboardState.current_tab),
+                        on_click=AdminDashboardState.refresh_table,
+                        class_name="bg-slate-600 hover:bg-slate-700 text-white"
+                    ),
+                    rx.button(
+                        rx.hstack(
+                            rx.icon(tag="download", size=16),
+                            rx.text("Ekspor CSV"),
+                            class_name="flex items-center space-x-2"
+                        ),
+                        on_click=AdminDashboardState.export_table,
+                        class_name="bg-slate-600 hover:bg-slate-700 text-white"
+                    ),
+                    rx.button(
+                        rx.hstack(
+                            rx.icon(tag="shield_check", size=16),
+                            rx.text("Cek Integritas"),
+                            class_name="flex items-center space-x-2"
+                        ),
+                        on_click=AdminDashboardState.check_integrity,
                         class_name="bg-slate-600 hover:bg-slate-700 text-white"
                     ),
+                    rx.button(
+                        rx.hstack(
+                            rx.icon(tag="book_lock", size=16),
+                            rx.text("Tutup Hari"),
+                            class_name="flex items-center space-x-2"
+                        ),
+                        on_click=AdminDashboardState.ask_close_day,
+                        class_name="bg-slate-600 hover:bg-slate-700 text-white"
+                    ),
+                    rx.cond(
+                        AdminDashboardState.current_tab == "TRANSAKSI",
+                        rx.button(
+                            rx.hstack(
+                                rx.icon(tag="calculator", size=16),
+                                rx.text("Hitung Ulang Total"),
+                                class_name="flex items-center space-x-2"
+                            ),
+                            on_click=AdminDashboardState.recompute_totals,
+                            class_name="bg-slate-600 hover:bg-slate-700 text-white"
+                        )
+                    ),
+                    rx.cond(
+                        (AdminDashboardState.current_tab == "TRANSAKSI") | (AdminDashboardState.current_tab == "PEMBAYARAN"),
+                        rx.button(
+                            rx.hstack(
+                                rx.icon(tag="git_compare", size=16),
+                                rx.text("Rekonsiliasi"),
+                                class_name="flex items-center space-x-2"
+                            ),
+                            on_click=AdminDashboardState.reconcile_payments,
+                            class_name="bg-slate-600 hover:bg-slate-700 text-white"
+                        )
+                    ),
+                    rx.upload(
+                        rx.button(
+                            rx.hstack(
+                                rx.icon(tag="upload", size=16),
+                                rx.text("Impor CSV"),
+                                class_name="flex items-center space-x-2"
+                            ),
+                            class_name="bg-slate-600 hover:bg-slate-700 text-white"
+                        ),
+                        id="import_csv",
+                        accept={"text/csv": [".csv"]},
+                        max_files=1,
+                        on_drop=AdminDashboardState.handle_import(rx.upload_files(upload_id="import_csv")),
+                        border="none",
+                        padding="0",
+                    ),
                     class_name="flex items-center space-x-2"
                 ),
                 class_name="flex justify-between items-center w-full"
             ),
             
-            rx.box(
-                rx.table(
-                    rx.thead(
-                        rx.tr(
-                            *[rx.th(field, class_name="text-slate-300 font-semibold text-left py-3 px-4") for field in fields],
-                            rx.th("Actions", class_name="text-slate-300 font-semibold text-left py-3 px-4"),
-                            class_name="bg-slate-700/30 border-slate-700"
-                        )
-                    ),
-                    rx.tbody(
-                        rx.foreach(
-                            current_data,
-                            lambda item: rx.tr(
-                                *[rx.td(item[field], class_name="text-slate-200 py-3 px-4") for field in fields],
-                                rx.td(
-                                    rx.hstack(
-                                        rx.button(
-                                            rx.icon(tag="edit", size=16),
-                                            on_click=lambda: AdminDashboardState.open_edit_dialog(item),
-                                            class_name="h-8 w-8 p-0 text-slate-400 hover:text-yellow-400 bg-transparent border-none",
-                                            variant="ghost"
-                                        ),
-                                        rx.button(
-                                            rx.icon(tag="trash_2", size=16),
-                                            on_click=lambda: AdminDashboardState.delete_item(item[fields[0]]),
-                                            class_name="h-8 w-8 p-0 text-slate-400 hover:text-red-400 bg-transparent border-none",
-                                            variant="ghost"
-                                        ),
-                                        class_name="flex items-center space-x-2"
-                                    ),
-                                    class_name="text-slate-200 py-3 px-4"
-                                ),
-                                class_name="border-slate-700 hover:bg-slate-700/20 transition-colors"
-                            )
-                        )
+            # Confirmation of a job that cannot be undone
+            rx.cond(
+                AdminDashboardState.confirm_action != "",
+                rx.hstack(
+                    rx.text(AdminDashboardState.confirm_message, class_name="text-amber-300 text-sm"),
+                    rx.button("Ya", on_click=AdminDashboardState.run_confirmed,
+                              class_name="bg-red-600 hover:bg-red-700 text-white"),
+                    rx.button("Batal", on_click=AdminDashboardState.cancel_confirm,
+                              class_name="bg-slate-600 hover:bg-slate-700 text-white"),
+                    class_name="flex items-center space-x-2 w-full"
+                )
+            ),
+            
+            # Progress of the running background job
+            rx.cond(
+                AdminDashboardState.is_loading,
+                rx.vstack(
+                    rx.text(
+                        AdminDashboardState.job_label, "... ", AdminDashboardState.job_progress, "%",
+                        class_name="text-slate-400 text-sm"
                     ),
-                    class_name="w-full"
+                    rx.progress(value=AdminDashboardState.job_progress, class_name="w-full"),
+                    class_name="w-full space-y-1"
+                )
+            ),
+            
+            rx.box(
+                rx.match(
+                    AdminDashboardState.current_tab,
+                    *[(tab_name, table_window(tab_name)) for tab_name in TABLE_CONFIGS],
                 ),
                 class_name="rounded-md border border-slate-700 overflow-x-auto"
             ),
@@ -459,13 +1584,38 @@ def data_table() -> rx.Component:
         class_name="bg-slate-800/50 border-slate-700 rounded-lg p-6"
     )
 
+def search_result(result: Dict[str, str]) -> rx.Component:
+    """One global search hit; clicking opens its tab."""
+    return rx.button(
+        rx.hstack(
+            rx.text(result["kind"], class_name="text-xs text-blue-400 w-24"),
+            rx.text(result["id"], class_name="text-xs text-slate-400 w-20"),
+            rx.text(result["title"], class_name="text-sm text-white"),
+            rx.text(result["detail"], class_name="text-xs text-slate-400"),
+            class_name="items-center space-x-3"
+        ),
+        on_click=lambda: AdminDashboardState.open_search_result(result["kind"]),
+        variant="ghost",
+        class_name="w-full justify-start hover:bg-slate-700"
+    )
+
+def global_search() -> rx.Component:
+    """Search box over customers, staff and menu."""
+    return rx.box(
+        rx.input(
+            placeholder="Cari customer, karyawan, menu atau kontak...",
+            value=AdminDashboardState.search_query,
+            on_change=AdminDashboardState.search,
+            debounce_timeout=250,
+            class_name="bg-slate-700 border-slate-600 text-white w-full"
+        ),
+        rx.foreach(AdminDashboardState.search_results, search_result),
+        class_name="bg-slate-800/50 border-slate-700 rounded-lg p-4 space-y-1"
+    )
+
 @require_admin
 def admin_dashboard_page() -> rx.Component:
     """Admin dashboard page."""
-    
-    # Load initial data
-    AdminDashboardState.load_table_data(AdminDashboardState.current_tab)
-    
     return layout(
         rx.vstack(
             rx.vstack(
@@ -474,6 +1624,8 @@ def admin_dashboard_page() -> rx.Component:
                 class_name="text-center space-y-2"
             ),
             
+            global_search(),
+            
             # Tab Navigation
             rx.box(
                 rx.hstack(
@@ -496,6 +1648,7 @@ def admin_dashboard_page() -> rx.Component:
             # Form Dialog
             data_form(),
             
+            on_mount=AdminDashboardState.refresh_table,
             class_name="space-y-6"
         )
     )
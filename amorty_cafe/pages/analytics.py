@@ -0,0 +1,161 @@
+"""Admin analytics page: revenue by hour and day, top menu, table utilization."""
+import asyncio
+import reflex as rx
+from typing import List, Dict, Any
+from datetime import date, timedelta
+from ..components.layout import layout
+from ..auth import is_admin_session, require_admin
+from ..analytics import sales_report
+
+class AnalyticsState(rx.State):
+    """Analytics state; reports are computed off the event loop and cached by range."""
+    start_date: str = ""
+    end_date: str = ""
+    revenue_by_hour: List[Dict[str, Any]] = []
+    revenue_by_day: List[Dict[str, Any]] = []
+    top_menu: List[Dict[str, Any]] = []
+    utilization: List[Dict[str, Any]] = []
+    totals: Dict[str, Any] = {}
+    is_loading: bool = False
+    error: str = ""
+
+    def set_start_date(self, value: str):
+        self.start_date = value
+        return AnalyticsState.load_report
+
+    def set_end_date(self, value: str):
+        self.end_date = value
+        return AnalyticsState.load_report
+
+    @rx.background
+    async def load_report(self):
+        """Load the report for the chosen range (default: last 7 days)."""
+        async with self:
+            if not await is_admin_session(self):
+                return
+            if not self.end_date:
+                self.end_date = date.today().isoformat()
+            self.is_loading = True
+            self.error = ""
+            start_text, end_text = self.start_date, self.end_date
+        try:
+            # The dates come from the client, so a bad one must not leave is_loading set
+            end = date.fromisoformat(end_text)
+            start = date.fromisoformat(start_text) if start_text else end - timedelta(days=6)
+            if start > end:
+                raise ValueError("start after end")
+            report = await asyncio.to_thread(sales_report, start, end)
+        except Exception as e:
+            print(f"Error loading analytics: {e}")
+            async with self:
+                self.is_loading = False
+                self.error = "Gagal memuat analitik. Periksa rentang tanggal."
+            return
+        async with self:
+            if not self.start_date:
+                self.start_date = start.isoformat()
+            self.revenue_by_hour = report["revenue_by_hour"]
+            self.revenue_by_day = report["revenue_by_day"]
+            self.top_menu = report["top_menu"]
+            self.utilization = report["utilization"]
+            self.totals = report["totals"]
+            self.is_loading = False
+
+def stat_box(label: str, value) -> rx.Component:
+    """Create a statistic box."""
+    return rx.box(
+        rx.text(label, class_name="text-slate-400 text-sm"),
+        rx.text(value, class_name="text-white text-2xl font-bold"),
+        class_name="bg-slate-800/50 border border-slate-700 rounded-lg p-4"
+    )
+
+def chart_card(title: str, chart: rx.Component) -> rx.Component:
+    """Wrap a chart in a titled card."""
+    return rx.box(
+        rx.vstack(
+            rx.heading(title, class_name="text-lg font-semibold text-white"),
+            chart,
+            class_name="space-y-4 w-full"
+        ),
+        class_name="bg-slate-800/50 border border-slate-700 rounded-lg p-6 w-full"
+    )
+
+def bar_chart(data, x_key: str, bars: List[tuple], layout_kind: str = "horizontal") -> rx.Component:
+    """Bar chart with one bar series per (data_key, color)."""
+    return rx.recharts.bar_chart(
+        *[rx.recharts.bar(data_key=key, fill=color, stack_id="a") for key, color in bars],
+        rx.recharts.x_axis(data_key=x_key),
+        rx.recharts.y_axis(),
+        rx.recharts.graphing_tooltip(),
+        rx.recharts.legend(),
+        data=data,
+        width="100%",
+        height=300,
+    )
+
+def menu_row(item: Dict[str, Any]) -> rx.Component:
+    return rx.hstack(
+        rx.text(item["name"], class_name="text-white flex-1"),
+        rx.text(item["orders"], class_name="text-slate-300 w-16 text-right"),
+        rx.text(f"Rp {item['revenue']}", class_name="text-green-400 w-32 text-right"),
+        class_name="flex w-full border-b border-slate-700 py-2"
+    )
+
+@require_admin
+def analytics_page() -> rx.Component:
+    """Analytics page."""
+    return layout(
+        rx.vstack(
+            rx.vstack(
+                rx.heading("Analitik Penjualan", class_name="text-3xl font-bold text-white"),
+                rx.text("Pendapatan per jam dan hari, menu terlaris, dan utilisasi meja billiard",
+                        class_name="text-slate-400"),
+                class_name="text-center space-y-2"
+            ),
+
+            rx.hstack(
+                rx.text("Dari", class_name="text-slate-300"),
+                rx.input(type="date", value=AnalyticsState.start_date,
+                         on_change=AnalyticsState.set_start_date,
+                         class_name="bg-slate-700 border-slate-600 text-white"),
+                rx.text("Sampai", class_name="text-slate-300"),
+                rx.input(type="date", value=AnalyticsState.end_date,
+                         on_change=AnalyticsState.set_end_date,
+                         class_name="bg-slate-700 border-slate-600 text-white"),
+                rx.cond(AnalyticsState.is_loading, rx.spinner()),
+                class_name="flex items-center gap-3"
+            ),
+            rx.cond(AnalyticsState.error != "", rx.text(AnalyticsState.error, class_name="text-red-400")),
+
+            rx.grid(
+                stat_box("Pesanan", AnalyticsState.totals["orders"]),
+                stat_box("Pendapatan Menu", AnalyticsState.totals["menu_revenue"]),
+                stat_box("Total Transaksi", AnalyticsState.totals["transaksi_revenue"]),
+                stat_box("Pendapatan Rental", AnalyticsState.totals["rental_revenue"]),
+                columns="4",
+                spacing="4",
+                class_name="grid-cols-2 lg:grid-cols-4 gap-4 w-full"
+            ),
+
+            chart_card("Pendapatan per Jam",
+                       bar_chart(AnalyticsState.revenue_by_hour, "hour", [("menu", "#3b82f6"), ("rental", "#22c55e")])),
+            chart_card("Transaksi per Hari",
+                       bar_chart(AnalyticsState.revenue_by_day, "day", [("revenue", "#f59e0b")])),
+            chart_card("Utilisasi Meja (%)",
+                       bar_chart(AnalyticsState.utilization, "table", [("utilization", "#a855f7")])),
+            chart_card(
+                "Menu Terlaris",
+                rx.vstack(
+                    rx.hstack(
+                        rx.text("Menu", class_name="text-slate-400 flex-1"),
+                        rx.text("Pesanan", class_name="text-slate-400 w-16 text-right"),
+                        rx.text("Pendapatan", class_name="text-slate-400 w-32 text-right"),
+                        class_name="flex w-full"
+                    ),
+                    rx.foreach(AnalyticsState.top_menu, menu_row),
+                    class_name="w-full"
+                )
+            ),
+            class_name="space-y-6"
+        )
+    )
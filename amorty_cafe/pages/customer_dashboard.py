@@ -5,6 +5,7 @@ from datetime import datetime
 from ..components.layout import layout
 from ..auth import AuthState
 from ..models_rafi import *
+from ..order_history import format_rupiah, order_history
 
 class CustomerDashboardState(rx.State):
     """Customer dashboard state management."""
@@ -15,6 +16,8 @@ class CustomerDashboardState(rx.State):
     menu_items: List[Dict[str, Any]] = []
     meja_list: List[Dict[str, Any]] = []
     my_orders: List[Dict[str, Any]] = []
+    # Keyset cursor of the next order page; "" when all are loaded
+    orders_cursor: str = ""
     
     # Order form
     selected_menu_id: str = ""
@@ -23,22 +26,28 @@ class CustomerDashboardState(rx.State):
     order_success: str = ""
     order_error: str = ""
     
-    def set_current_tab(self, tab: str):
-        """Set current active tab."""
+    async def set_current_tab(self, tab: str):
+        """Set current active tab and reload its data."""
         self.current_tab = tab
         if tab == "MENU":
-            self.load_menu_items()
+            await self.load_menu_items()
         elif tab == "MEJA":
-            self.load_meja_list()
+            await self.load_meja_list()
         elif tab == "PESANAN":
-            self.load_my_orders()
+            await self.load_my_orders()
     
-    def set_customer_id(self, customer_id: str):
-        """Set customer ID from auth state."""
-        self.customer_id = customer_id
-        self.load_menu_items()
-        self.load_meja_list()
-        self.load_my_orders()
+    async def load_dashboard(self):
+        """Page on_load: load menu, tables and the customer's orders.
+
+        The customer ID is the `sub` claim of the verified session token,
+        never a value sent by the client.
+        """
+        auth = await self.get_state(AuthState)
+        claims = auth.token_claims
+        self.customer_id = claims["sub"] if claims.get("role") == "customer" else ""
+        await self.load_menu_items()
+        await self.load_meja_list()
+        await self.load_my_orders()
     
     async def load_menu_items(self):
         """Load available menu items."""
@@ -50,6 +59,7 @@ class CustomerDashboardState(rx.State):
                         "ID_Menu": menu.ID_Menu,
                         "Nama_Menu": menu.Nama_Menu,
                         "Harga_Menu": menu.Harga_Menu,
+                        "Harga_Label": format_rupiah(menu.Harga_Menu),
                         "Kategori": menu.Kategori
                     }
                     for menu in menus
@@ -74,26 +84,26 @@ class CustomerDashboardState(rx.State):
             print(f"Error loading meja: {e}")
     
     async def load_my_orders(self):
-        """Load customer's orders."""
+        """Load the newest page of the customer's orders, with menu and table names."""
         if not self.customer_id:
             return
             
         try:
-            with rx.session() as session:
-                orders = session.query(Pesanan).filter(
-                    Pesanan.ID_Customer == self.customer_id
-                ).all()
-                
-                self.my_orders = [
-                    {
-                        "ID_Pesanan": order.ID_Pesanan,
-                        "ID_Customer": order.ID_Customer,
-                        "Waktu_Pesanan": order.Waktu_Pesanan.strftime('%d-%m-%Y %H:%M'),
-                        "ID_Menu": order.ID_Menu,
-                        "ID_Meja": order.ID_Meja
-                    }
-                    for order in orders
-                ]
+            page = order_history.page(self.customer_id)
+            self.my_orders = page["orders"]
+            self.orders_cursor = page["next_cursor"]
+        except Exception as e:
+            print(f"Error loading orders: {e}")
+    
+    async def load_more_orders(self):
+        """Append the next (older) page of orders."""
+        if not self.customer_id or not self.orders_cursor:
+            return
+        
+        try:
+            page = order_history.page(self.customer_id, self.orders_cursor)
+            self.my_orders = self.my_orders + page["orders"]
+            self.orders_cursor = page["next_cursor"]
         except Exception as e:
             print(f"Error loading orders: {e}")
     
@@ -125,27 +135,26 @@ class CustomerDashboardState(rx.State):
         
         try:
             with rx.session() as session:
-                # Generate new order ID
-                new_id = generate_custom_id("PESANAN")
-                
-                # Create new order
-                new_order = Pesanan(
-                    ID_Pesanan=new_id,
-                    ID_Customer=self.customer_id,
-                    ID_Karyawan=None,
-                    Waktu_Pesanan=datetime.now(),
-                    ID_Menu=self.selected_menu_id,
-                    ID_Meja=self.selected_meja_id
-                )
-                
-                session.add(new_order)
-                
-                # Update table status
-                meja = session.query(Meja).filter(Meja.ID_Meja == self.selected_meja_id).first()
-                if meja:
-                    meja.Status_Meja = "DIPESAN"
+                def build(new_id):
+                    # Update table status
+                    meja = session.query(Meja).filter(Meja.ID_Meja == self.selected_meja_id).first()
+                    if meja:
+                        meja.Status_Meja = "DIPESAN"
+                    
+                    # Create new order
+                    return [Pesanan(
+                        ID_Pesanan=new_id(),
+                        ID_Customer=self.customer_id,
+                        ID_Karyawan=None,
+                        Waktu_Pesanan=datetime.now(),
+                        ID_Menu=self.selected_menu_id,
+                        ID_Meja=self.selected_meja_id
+                    )]
                 
-                session.commit()
+                # Retried with a fresh order ID if another process took this one
+                new_order, = commit_with_new_ids(session, "PESANAN", build)
+                new_id = new_order.ID_Pesanan
+                order_history.invalidate(self.customer_id)
                 
                 self.order_success = f"Pesanan berhasil dibuat dengan ID: {new_id}"
                 self.order_error = ""
@@ -169,7 +178,7 @@ def menu_card(menu: Dict[str, Any]) -> rx.Component:
                     class_name="space-y-1 flex-1"
                 ),
                 rx.vstack(
-                    rx.text(f"Rp {menu['Harga_Menu']:,.0f}", class_name="text-green-400 text-xl font-bold"),
+                    rx.text(menu["Harga_Label"], class_name="text-green-400 text-xl font-bold"),
                     rx.button(
                         "Pesan",
                         on_click=lambda: CustomerDashboardState.open_order_dialog(menu["ID_Menu"]),
@@ -219,10 +228,11 @@ def order_card(order: Dict[str, Any]) -> rx.Component:
                 class_name="flex justify-between items-center w-full"
             ),
             rx.hstack(
-                rx.text(f"Menu: {order['ID_Menu']}", class_name="text-slate-300 text-sm"),
-                rx.text(f"Meja: {order['ID_Meja']}", class_name="text-slate-300 text-sm"),
+                rx.text(f"Menu: {order['Nama_Menu']}", class_name="text-slate-300 text-sm"),
+                rx.text(f"Meja {order['Nomor_Meja']}", class_name="text-slate-300 text-sm"),
                 class_name="flex justify-between w-full"
             ),
+            rx.text(order["Harga_Label"], class_name="text-green-400 text-sm"),
             class_name="space-y-2"
         ),
         class_name="bg-slate-700/50 border border-slate-600 rounded-lg p-4"
@@ -330,18 +340,13 @@ def tab_button(tab_name: str, label: str, icon: str) -> rx.Component:
     )
 
 def customer_dashboard_page() -> rx.Component:
-    """Customer dashboard page."""
-    
-    # Set customer ID from auth state
-    customer_id = AuthState.current_user.get("id", "") if AuthState.current_user else ""
-    CustomerDashboardState.set_customer_id(customer_id)
-    
+    """Customer dashboard page; register with on_load=CustomerDashboardState.load_dashboard."""
     return layout(
         rx.vstack(
             # Header
             rx.vstack(
                 rx.heading("Customer Dashboard", class_name="text-3xl font-bold text-white"),
-                rx.text(f"Selamat datang, {customer_id}", class_name="text-slate-400"),
+                rx.text(f"Selamat datang, {CustomerDashboardState.customer_id}", class_name="text-slate-400"),
                 class_name="text-center space-y-2"
             ),
             
@@ -405,9 +410,17 @@ def customer_dashboard_page() -> rx.Component:
                     rx.vstack(
                         rx.heading("Pesanan Saya", class_name="text-2xl font-bold text-white"),
                         rx.cond(
-                            len(CustomerDashboardState.my_orders) > 0,
+                            CustomerDashboardState.my_orders.length() > 0,
                             rx.vstack(
-                                *[order_card(order) for order in CustomerDashboardState.my_orders],
+                                rx.foreach(CustomerDashboardState.my_orders, order_card),
+                                rx.cond(
+                                    CustomerDashboardState.orders_cursor != "",
+                                    rx.button(
+                                        "Muat pesanan lama",
+                                        on_click=CustomerDashboardState.load_more_orders,
+                                        class_name="bg-slate-600 hover:bg-slate-700 text-white w-full"
+                                    )
+                                ),
                                 class_name="space-y-4"
                             ),
                             rx.text("Belum ada pesanan", class_name="text-slate-400 text-center py-8")
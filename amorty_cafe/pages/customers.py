@@ -2,13 +2,82 @@
 import reflex as rx
 from typing import List, Dict, Any
 from ..components.layout import layout
-from ..auth import AuthState, require_admin
+from ..auth import AuthState, is_admin_session, require_admin
 from ..models import Customer, MembershipType, CustomerStatus
+from ..list_ops import insert_row, patch_row, remove_row
+from ..search_index import search_index
+from ..phone import PhoneIndex, looks_like_phone
 import json
 
+def customer_to_row(customer: Customer) -> Dict[str, Any]:
+    """Customer as a table row."""
+    return {
+        "id": customer.id,
+        "name": customer.name,
+        "email": customer.email,
+        "phone": customer.phone,
+        "address": customer.address,
+        "membership_type": customer.membership_type.value,
+        "join_date": customer.join_date.strftime("%Y-%m-%d"),
+        "total_spent": customer.total_spent,
+        "loyalty_points": customer.loyalty_points,
+        "status": customer.status.value
+    }
+
+# Customers shown for a search
+SEARCH_LIMIT = 50
+
+# Search hits checked against the membership/status filters, so a
+# filtered search can still fill SEARCH_LIMIT rows
+FILTERED_SEARCH_HITS = 500
+
+# Customers per page
+PAGE_SIZE = 50
+
+# Indexed columns the table can be sorted on, by header label
+SORT_COLUMNS = {
+    "Name": "name",
+    "Membership": "membership_type",
+    "Total Spent": "total_spent",
+    "Loyalty Points": "loyalty_points",
+    "Join Date": "join_date",
+}
+
+# Select value meaning "no filter"
+ALL_VALUES = "All"
+
+def member_loader():
+    """Searchable fields of every customer: name, email and phone."""
+    with rx.session() as session:
+        rows = session.query(Customer.id, Customer.name, Customer.email, Customer.phone).all()
+    return [(row[0], list(row[1:])) for row in rows]
+
+search_index.register("member", member_loader)
+
+def load_member_phones():
+    """(id, normalised phone) for every customer."""
+    with rx.session() as session:
+        return session.query(Customer.id, Customer.phone_normalized).all()
+
+# Exact and last-digits phone lookups for the search box
+member_phones = PhoneIndex(load_member_phones)
+
 class CustomerState(rx.State):
     """Customer management state."""
     customers: List[Dict[str, Any]] = []
+    search_query: str = ""
+    
+    # One page of the filtered, sorted table; all applied in SQL
+    page: int = 0
+    total_customers: int = 0
+    membership_filter: str = ALL_VALUES
+    status_filter: str = ALL_VALUES
+    sort_field: str = ""
+    sort_desc: bool = False
+    
+    # Rows ticked for bulk delete / membership change
+    selected_ids: List[int] = []
+    bulk_membership: str = "Regular"
     is_dialog_open: bool = False
     editing_customer: Dict[str, Any] = {}
     form_data: Dict[str, Any] = {
@@ -21,25 +90,92 @@ class CustomerState(rx.State):
         "loyalty_points": 0
     }
     
+    def _filter_clauses(self) -> List[Any]:
+        """SQL clauses for the membership and status filters."""
+        clauses = []
+        if self.membership_filter != ALL_VALUES:
+            clauses.append(Customer.membership_type == MembershipType(self.membership_filter))
+        if self.status_filter != ALL_VALUES:
+            clauses.append(Customer.status == CustomerStatus(self.status_filter))
+        return clauses
+    
+    def _matches_filters(self, row: Dict[str, Any]) -> bool:
+        """Whether a customer row passes the membership and status filters."""
+        return (self.membership_filter in (ALL_VALUES, row["membership_type"])
+                and self.status_filter in (ALL_VALUES, row["status"]))
+    
+    def _reload(self):
+        """Re-run the current search, or reload the page without one."""
+        if self.search_query.strip():
+            return CustomerState.search_customers(self.search_query)
+        return CustomerState.load_customers
+    
     async def load_customers(self):
-        """Load customers from database."""
+        """Load the current page of customers matching the filters."""
+        if not await is_admin_session(self):
+            return
         with rx.session() as session:
-            customers = session.query(Customer).all()
-            self.customers = [
-                {
-                    "id": customer.id,
-                    "name": customer.name,
-                    "email": customer.email,
-                    "phone": customer.phone,
-                    "address": customer.address,
-                    "membership_type": customer.membership_type.value,
-                    "join_date": customer.join_date.strftime("%Y-%m-%d"),
-                    "total_spent": customer.total_spent,
-                    "loyalty_points": customer.loyalty_points,
-                    "status": customer.status.value
-                }
-                for customer in customers
-            ]
+            query = session.query(Customer).filter(*self._filter_clauses())
+            order = [Customer.id]
+            # sort_field comes from the client; only the indexed columns are allowed
+            if self.sort_field in SORT_COLUMNS.values():
+                column = getattr(Customer, self.sort_field)
+                order.insert(0, column.desc() if self.sort_desc else column.asc())
+            self.total_customers = query.count()
+            customers = query.order_by(*order).offset(self.page * PAGE_SIZE).limit(PAGE_SIZE).all()
+            self.customers = [customer_to_row(customer) for customer in customers]
+    
+    def set_membership_filter(self, value: str):
+        self.membership_filter = value
+        self.page = 0
+        return self._reload()
+    
+    def set_status_filter(self, value: str):
+        self.status_filter = value
+        self.page = 0
+        return self._reload()
+    
+    def toggle_sort(self, field: str):
+        """Sort by a column; clicking it again reverses the order."""
+        if field not in SORT_COLUMNS.values():
+            return
+        if self.sort_field == field:
+            self.sort_desc = not self.sort_desc
+        else:
+            self.sort_field = field
+            self.sort_desc = False
+        self.page = 0
+        return CustomerState.load_customers
+    
+    def next_page(self):
+        if (self.page + 1) * PAGE_SIZE < self.total_customers:
+            self.page += 1
+            return CustomerState.load_customers
+    
+    def prev_page(self):
+        if self.page > 0:
+            self.page -= 1
+            return CustomerState.load_customers
+    
+    async def search_customers(self, query: str):
+        """Show only the top matches for name, email or phone that pass the filters."""
+        if not await is_admin_session(self):
+            return
+        self.search_query = query
+        if not query.strip():
+            return CustomerState.load_customers
+        clauses = self._filter_clauses()
+        hits = FILTERED_SEARCH_HITS if clauses else SEARCH_LIMIT
+        if looks_like_phone(query):
+            ids = [int(i) for i in member_phones.lookup(query, hits)]
+        else:
+            ids = [int(hit["id"]) for hit in search_index.search(query, hits, kinds=["member"])]
+        found = {}
+        if ids:
+            with rx.session() as session:
+                found = {c.id: c for c in session.query(Customer).filter(Customer.id.in_(ids), *clauses).all()}
+        self.customers = [customer_to_row(found[i]) for i in ids if i in found][:SEARCH_LIMIT]
+        self.total_customers = len(self.customers)
     
     def open_add_dialog(self):
         """Open dialog for adding new customer."""
@@ -80,6 +216,8 @@ class CustomerState(rx.State):
     
     async def save_customer(self):
         """Save customer to database."""
+        if not await is_admin_session(self):
+            return
         with rx.session() as session:
             if self.editing_customer:
                 # Update existing customer
@@ -106,17 +244,68 @@ class CustomerState(rx.State):
                 session.add(customer)
             
             session.commit()
+            if customer:
+                session.refresh(customer)
+                search_index.put("member", customer.id, [customer.name, customer.email, customer.phone])
+                member_phones.put(customer.id, customer.phone)
+                row = customer_to_row(customer)
+                if self.editing_customer:
+                    patch_row(self.customers, "id", customer.id, row)
+                elif self._matches_filters(row):
+                    insert_row(self.customers, row, "id")
+                    self.total_customers += 1
             self.close_dialog()
-            await self.load_customers()
     
     async def delete_customer(self, customer_id: int):
         """Delete customer from database."""
+        if not await is_admin_session(self):
+            return
         with rx.session() as session:
             customer = session.query(Customer).filter(Customer.id == customer_id).first()
             if customer:
                 session.delete(customer)
                 session.commit()
-                await self.load_customers()
+                search_index.remove("member", customer_id)
+                member_phones.remove(customer_id)
+                if remove_row(self.customers, "id", customer_id) is not None:
+                    self.total_customers -= 1
+    
+    def toggle_selected(self, customer_id: int):
+        if customer_id in self.selected_ids:
+            self.selected_ids.remove(customer_id)
+        else:
+            self.selected_ids.append(customer_id)
+    
+    async def bulk_delete_customers(self):
+        """Delete every ticked customer with one DELETE, then reload once."""
+        if not await is_admin_session(self):
+            return
+        if not self.selected_ids:
+            return
+        ids = list(self.selected_ids)
+        with rx.session() as session:
+            session.query(Customer).filter(Customer.id.in_(ids)).delete(synchronize_session=False)
+            session.commit()
+        for customer_id in ids:
+            search_index.remove("member", customer_id)
+            member_phones.remove(customer_id)
+        self.selected_ids = []
+        return self._reload()
+    
+    async def bulk_set_membership(self):
+        """Set the membership of every ticked customer with one UPDATE."""
+        if not await is_admin_session(self):
+            return
+        if not self.selected_ids:
+            return
+        with rx.session() as session:
+            session.query(Customer).filter(Customer.id.in_(self.selected_ids)).update(
+                {Customer.membership_type: MembershipType(self.bulk_membership)},
+                synchronize_session=False,
+            )
+            session.commit()
+        self.selected_ids = []
+        return self._reload()
 
 def membership_badge(membership_type: str) -> rx.Component:
     """Create membership badge."""
@@ -144,6 +333,13 @@ def membership_badge(membership_type: str) -> rx.Component:
 def customer_row(customer: Dict[str, Any]) -> rx.Component:
     """Create customer table row."""
     return rx.tr(
+        rx.td(
+            rx.checkbox(
+                checked=CustomerState.selected_ids.contains(customer["id"]),
+                on_change=lambda _: CustomerState.toggle_selected(customer["id"]),
+            ),
+            class_name="py-4 px-4"
+        ),
         rx.td(customer["name"], class_name="text-slate-200 py-4 px-4"),
         rx.td(customer["email"], class_name="text-slate-200 py-4 px-4"),
         rx.td(customer["phone"], class_name="text-slate-200 py-4 px-4"),
@@ -309,6 +505,54 @@ def customer_form() -> rx.Component:
         )
     )
 
+def sort_header(label: str) -> rx.Component:
+    """Column header; indexed columns sort on click."""
+    class_name = "text-slate-300 font-semibold text-left py-3 px-4"
+    field = SORT_COLUMNS.get(label)
+    if field is None:
+        return rx.th(label, class_name=class_name)
+    return rx.th(
+        label,
+        rx.cond(CustomerState.sort_field == field, rx.cond(CustomerState.sort_desc, " ▼", " ▲"), ""),
+        on_click=lambda: CustomerState.toggle_sort(field),
+        class_name=class_name + " cursor-pointer select-none"
+    )
+
+def customer_filters() -> rx.Component:
+    """Membership and status filters, bulk actions and paging."""
+    return rx.hstack(
+        rx.select(
+            [ALL_VALUES] + [m.value for m in MembershipType],
+            value=CustomerState.membership_filter,
+            on_change=CustomerState.set_membership_filter,
+            class_name="bg-slate-700 border-slate-600 text-white"
+        ),
+        rx.select(
+            [ALL_VALUES] + [s.value for s in CustomerStatus],
+            value=CustomerState.status_filter,
+            on_change=CustomerState.set_status_filter,
+            class_name="bg-slate-700 border-slate-600 text-white"
+        ),
+        rx.text(CustomerState.selected_ids.length(), " selected", class_name="text-sm text-slate-400"),
+        rx.select(
+            [m.value for m in MembershipType],
+            value=CustomerState.bulk_membership,
+            on_change=CustomerState.set_bulk_membership,
+            class_name="bg-slate-700 border-slate-600 text-white"
+        ),
+        rx.button("Set membership", on_click=CustomerState.bulk_set_membership,
+                  class_name="bg-blue-600 hover:bg-blue-700 text-white"),
+        rx.button("Delete selected", on_click=CustomerState.bulk_delete_customers,
+                  class_name="bg-red-600 hover:bg-red-700 text-white"),
+        rx.spacer(),
+        rx.button("Prev", on_click=CustomerState.prev_page, variant="outline",
+                  class_name="border-slate-600 text-slate-300"),
+        rx.text("Page ", CustomerState.page + 1, class_name="text-sm text-slate-400"),
+        rx.button("Next", on_click=CustomerState.next_page, variant="outline",
+                  class_name="border-slate-600 text-slate-300"),
+        class_name="flex items-center space-x-2 w-full"
+    )
+
 @require_admin
 def customers_page() -> rx.Component:
     """Customers management page."""
@@ -334,6 +578,9 @@ def customers_page() -> rx.Component:
                                 rx.icon(tag="search", size=16, class_name="absolute left-3 top-1/2 transform -translate-y-1/2 text-slate-400"),
                                 rx.input(
                                     placeholder="Search customers...",
+                                    value=CustomerState.search_query,
+                                    on_change=CustomerState.search_customers,
+                                    debounce_timeout=250,
                                     class_name="pl-10 bg-slate-700/50 border-slate-600 text-white placeholder-slate-400 w-64"
                                 ),
                                 class_name="relative"
@@ -352,18 +599,14 @@ def customers_page() -> rx.Component:
                         class_name="flex flex-col sm:flex-row justify-between items-start sm:items-center space-y-4 sm:space-y-0"
                     ),
                     
+                    customer_filters(),
+                    
                     rx.box(
                         rx.table(
                             rx.thead(
                                 rx.tr(
-                                    rx.th("Name", class_name="text-slate-300 font-semibold text-left py-3 px-4"),
-                                    rx.th("Email", class_name="text-slate-300 font-semibold text-left py-3 px-4"),
-                                    rx.th("Phone", class_name="text-slate-300 font-semibold text-left py-3 px-4"),
-                                    rx.th("Membership", class_name="text-slate-300 font-semibold text-left py-3 px-4"),
-                                    rx.th("Total Spent", class_name="text-slate-300 font-semibold text-left py-3 px-4"),
-                                    rx.th("Loyalty Points", class_name="text-slate-300 font-semibold text-left py-3 px-4"),
-                                    rx.th("Join Date", class_name="text-slate-300 font-semibold text-left py-3 px-4"),
-                                    rx.th("Actions", class_name="text-slate-300 font-semibold text-left py-3 px-4"),
+                                    *[sort_header(label) for label in
+                                      ["", "Name", "Email", "Phone", "Membership", "Total Spent", "Loyalty Points", "Join Date", "Actions"]],
                                     class_name="bg-slate-700/30 border-slate-700"
                                 )
                             ),
@@ -386,7 +629,7 @@ def customers_page() -> rx.Component:
                                 class_name="text-sm text-slate-400"
                             ),
                             rx.text(
-                                f"Total: {len(CustomerState.customers)} records",
+                                "Total: ", CustomerState.total_customers, " records",
                                 class_name="text-sm text-slate-400"
                             ),
                             class_name="flex justify-between items-center mt-4"
@@ -0,0 +1,159 @@
+"""Kitchen display page showing the live order queue."""
+import time
+import reflex as rx
+from typing import List, Dict, Any
+from ..components.layout import layout
+from ..auth import is_admin_session, require_admin
+from ..kitchen import kitchen_queue
+
+# The open page pings this often; a watcher with no ping for
+# HEARTBEAT_MISSES intervals belongs to a closed tab and stops.
+HEARTBEAT_SECONDS = 10
+HEARTBEAT_MISSES = 3
+
+class KitchenState(rx.State):
+    """Kitchen display state, fed by the shared kitchen queue."""
+    queued: List[Dict[str, Any]] = []
+    preparing: List[Dict[str, Any]] = []
+    ready: List[Dict[str, Any]] = []
+    stats: Dict[str, Any] = {}
+    is_watching: bool = False
+    last_seen: float = 0.0
+
+    def _apply_snapshot(self):
+        snapshot = kitchen_queue.snapshot()
+        self.queued = snapshot["queued"]
+        self.preparing = snapshot["preparing"]
+        self.ready = snapshot["ready"]
+        self.stats = snapshot["stats"]
+
+    @rx.background
+    async def watch_queue(self):
+        """Push queue changes to the display until the page is left."""
+        async with self:
+            if self.is_watching or not await is_admin_session(self):
+                return
+            self.is_watching = True
+            self.last_seen = time.time()
+
+        await kitchen_queue.start()
+        version = -1
+        while True:
+            async with self:
+                if time.time() - self.last_seen > HEARTBEAT_SECONDS * HEARTBEAT_MISSES:
+                    # Client went away without unmounting the page
+                    self.is_watching = False
+                if not self.is_watching:
+                    return
+                self._apply_snapshot()
+            version = await kitchen_queue.wait_for_change(version, timeout=HEARTBEAT_SECONDS)
+
+    def heartbeat(self, _now: str = ""):
+        """Sent periodically by the open page."""
+        self.last_seen = time.time()
+
+    def stop_watching(self):
+        """Stop the background watcher."""
+        self.is_watching = False
+
+    async def finish_item(self, item_id: int):
+        """Cook marks an item as done."""
+        if not await is_admin_session(self):
+            return
+        await kitchen_queue.finish(item_id)
+
+def ticket_card(ticket: Dict[str, Any]) -> rx.Component:
+    """Create a kitchen ticket card."""
+    return rx.box(
+        rx.hstack(
+            rx.vstack(
+                rx.text(f"{ticket['quantity']}x {ticket['menu_name']}", class_name="text-white font-semibold"),
+                rx.text(f"Order #{ticket['order_id']} • Meja {ticket['table_number']}", class_name="text-slate-400 text-sm"),
+                class_name="space-y-1"
+            ),
+            rx.vstack(
+                rx.text(f"{ticket['prep_minutes']} mnt", class_name="text-blue-400 text-sm"),
+                rx.text(f"tunggu {ticket['waiting_minutes']} mnt", class_name="text-slate-400 text-xs"),
+                class_name="items-end space-y-1"
+            ),
+            class_name="flex justify-between items-start w-full"
+        ),
+        class_name="bg-slate-700/50 border border-slate-600 rounded-lg p-3"
+    )
+
+def preparing_card(ticket: Dict[str, Any]) -> rx.Component:
+    """Ticket being cooked, with the button that finishes it."""
+    return rx.vstack(
+        ticket_card(ticket),
+        rx.button(
+            "Selesai",
+            on_click=KitchenState.finish_item(ticket["item_id"]),
+            class_name="bg-green-600 hover:bg-green-700 text-white w-full"
+        ),
+        class_name="space-y-2 w-full"
+    )
+
+def ready_card(order: Dict[str, Any]) -> rx.Component:
+    """Create a ready order card."""
+    return rx.box(
+        rx.hstack(
+            rx.text(f"Order #{order['order_id']}", class_name="text-white font-semibold"),
+            rx.text(f"Meja {order['table_number']} • {order['ready_at']}", class_name="text-green-400 text-sm"),
+            class_name="flex justify-between items-center w-full"
+        ),
+        class_name="bg-green-900/20 border border-green-500/30 rounded-lg p-3"
+    )
+
+def queue_column(title: str, items, render) -> rx.Component:
+    """Create a kitchen display column."""
+    return rx.box(
+        rx.vstack(
+            rx.heading(title, class_name="text-xl font-bold text-white"),
+            rx.foreach(items, render),
+            class_name="space-y-3"
+        ),
+        class_name="bg-slate-800/50 border-slate-700 rounded-lg p-4 flex-1"
+    )
+
+def stat_box(label: str, value) -> rx.Component:
+    """Create a statistic box."""
+    return rx.box(
+        rx.text(label, class_name="text-slate-400 text-sm"),
+        rx.text(value, class_name="text-white text-2xl font-bold"),
+        class_name="bg-slate-800/50 border border-slate-700 rounded-lg p-4"
+    )
+
+@require_admin
+def kitchen_page() -> rx.Component:
+    """Kitchen display page."""
+    return layout(
+        rx.vstack(
+            rx.vstack(
+                rx.heading("Dapur", class_name="text-3xl font-bold text-white"),
+                rx.text("Antrian pesanan berdasarkan waktu persiapan dan umur pesanan", class_name="text-slate-400"),
+                class_name="text-center space-y-2"
+            ),
+
+            rx.grid(
+                stat_box("Dalam Antrian", KitchenState.stats["queued"]),
+                stat_box("Item / Jam", KitchenState.stats["items_per_hour"]),
+                stat_box("Rata-rata Tunggu (mnt)", KitchenState.stats["avg_wait_minutes"]),
+                stat_box("Tunggu Maks (mnt)", KitchenState.stats["max_wait_minutes"]),
+                columns="4",
+                spacing="4",
+                class_name="grid-cols-2 lg:grid-cols-4 gap-4"
+            ),
+
+            rx.hstack(
+                queue_column("Antrian", KitchenState.queued, ticket_card),
+                queue_column("Sedang Dimasak", KitchenState.preparing, preparing_card),
+                queue_column("Siap Diantar", KitchenState.ready, ready_card),
+                class_name="flex flex-col lg:flex-row gap-4 w-full items-start"
+            ),
+
+            rx.moment(interval=HEARTBEAT_SECONDS * 1000, on_change=KitchenState.heartbeat, display="none"),
+
+            on_unmount=KitchenState.stop_watching,
+            class_name="space-y-6"
+        )
+    )
@@ -4,23 +4,18 @@ from ..auth import AuthState
 
 class LoginFormState(rx.State):
     """Login form state."""
-    username: str = ""
-    password: str = ""
     role: str = "customer"  # customer or admin
     
-    def set_username(self, value: str):
-        self.username = value
-    
-    def set_password(self, value: str):
-        self.password = value
-    
     def set_role(self, value: str):
         self.role = value
     
-    async def handle_login(self):
-        """Handle login form submission."""
-        if self.username and self.password:
-            await AuthState.login(self.username, self.password)
+    async def handle_login(self, form_data: dict):
+        """Handle login form submission (one event per completed form)."""
+        username = form_data.get("username", "")
+        password = form_data.get("password", "")
+        if username and password:
+            auth_state = await self.get_state(AuthState)
+            return await auth_state.login(username, password)
 
 def login_page() -> rx.Component:
     """Login page component."""
@@ -61,104 +56,107 @@ def login_page() -> rx.Component:
                 
                 # Login Form
                 rx.box(
-                    rx.vstack(
-                        rx.heading(
-                            "Sign In",
-                            class_name="text-2xl font-bold text-white text-center mb-6"
-                        ),
-                        
-                        # Role Selection
+                    rx.form(
                         rx.vstack(
-                            rx.text("Login as:", class_name="text-sm font-medium text-slate-300"),
-                            rx.hstack(
-                                rx.button(
-                                    "Customer",
-                                    on_click=lambda: LoginFormState.set_role("customer"),
-                                    class_name=f"""
-                                        px-4 py-2 rounded-lg transition-all duration-200
-                                        {'bg-blue-600 text-white' if LoginFormState.role == 'customer' else 'bg-slate-700 text-slate-300 hover:bg-slate-600'}
+                            rx.heading(
+                                "Sign In",
+                                class_name="text-2xl font-bold text-white text-center mb-6"
+                            ),
+                        
+                            # Role Selection
+                            rx.vstack(
+                                rx.text("Login as:", class_name="text-sm font-medium text-slate-300"),
+                                rx.hstack(
+                                    rx.button(
+                                        "Customer",
+                                        type="button",
+                                        on_click=lambda: LoginFormState.set_role("customer"),
+                                        class_name=f"""
+                                            px-4 py-2 rounded-lg transition-all duration-200
+                                            {'bg-blue-600 text-white' if LoginFormState.role == 'customer' else 'bg-slate-700 text-slate-300 hover:bg-slate-600'}
+                                        """,
+                                        variant="outline"
+                                    ),
+                                    rx.button(
+                                        "Admin",
+                                        type="button",
+                                        on_click=lambda: LoginFormState.set_role("admin"),
+                                        class_name=f"""
+                                            px-4 py-2 rounded-lg transition-all duration-200
+                                            {'bg-blue-600 text-white' if LoginFormState.role == 'admin' else 'bg-slate-700 text-slate-300 hover:bg-slate-600'}
+                                        """,
+                                        variant="outline"
+                                    ),
+                                    class_name="flex space-x-2"
+                                ),
+                                class_name="space-y-2"
+                            ),
+                        
+                            # Username Field
+                            rx.vstack(
+                                rx.text("Username", class_name="text-sm font-medium text-slate-300"),
+                                rx.input(
+                                    placeholder="Enter your username",
+                                    name="username",
+                                    class_name="""
+                                        bg-slate-700/50 border-slate-600 text-white placeholder-slate-400
+                                        focus:border-blue-500 focus:ring-1 focus:ring-blue-500
                                     """,
-                                    variant="outline"
+                                    type="text"
                                 ),
-                                rx.button(
-                                    "Admin",
-                                    on_click=lambda: LoginFormState.set_role("admin"),
-                                    class_name=f"""
-                                        px-4 py-2 rounded-lg transition-all duration-200
-                                        {'bg-blue-600 text-white' if LoginFormState.role == 'admin' else 'bg-slate-700 text-slate-300 hover:bg-slate-600'}
+                                class_name="space-y-1"
+                            ),
+                        
+                            # Password Field
+                            rx.vstack(
+                                rx.text("Password", class_name="text-sm font-medium text-slate-300"),
+                                rx.input(
+                                    placeholder="Enter your password",
+                                    name="password",
+                                    class_name="""
+                                        bg-slate-700/50 border-slate-600 text-white placeholder-slate-400
+                                        focus:border-blue-500 focus:ring-1 focus:ring-blue-500
                                     """,
-                                    variant="outline"
+                                    type="password"
                                 ),
-                                class_name="flex space-x-2"
+                                class_name="space-y-1"
                             ),
-                            class_name="space-y-2"
-                        ),
                         
-                        # Username Field
-                        rx.vstack(
-                            rx.text("Username", class_name="text-sm font-medium text-slate-300"),
-                            rx.input(
-                                placeholder="Enter your username",
-                                value=LoginFormState.username,
-                                on_change=LoginFormState.set_username,
-                                class_name="""
-                                    bg-slate-700/50 border-slate-600 text-white placeholder-slate-400
-                                    focus:border-blue-500 focus:ring-1 focus:ring-blue-500
-                                """,
-                                type="text"
+                            # Error Message
+                            rx.cond(
+                                AuthState.login_error != "",
+                                rx.text(
+                                    AuthState.login_error,
+                                    class_name="text-red-400 text-sm text-center"
+                                )
                             ),
-                            class_name="space-y-1"
-                        ),
                         
-                        # Password Field
-                        rx.vstack(
-                            rx.text("Password", class_name="text-sm font-medium text-slate-300"),
-                            rx.input(
-                                placeholder="Enter your password",
-                                value=LoginFormState.password,
-                                on_change=LoginFormState.set_password,
+                            # Login Button
+                            rx.button(
+                                "Sign In",
+                                type="submit",
                                 class_name="""
-                                    bg-slate-700/50 border-slate-600 text-white placeholder-slate-400
-                                    focus:border-blue-500 focus:ring-1 focus:ring-blue-500
+                                    w-full bg-gradient-to-r from-blue-600 to-blue-700 hover:from-blue-700 hover:to-blue-800
+                                    text-white font-medium py-3 rounded-lg transition-all duration-200
+                                    shadow-lg hover:shadow-blue-600/25
                                 """,
-                                type="password"
+                                size="3"
                             ),
-                            class_name="space-y-1"
-                        ),
-                        
-                        # Error Message
-                        rx.cond(
-                            AuthState.login_error != "",
-                            rx.text(
-                                AuthState.login_error,
-                                class_name="text-red-400 text-sm text-center"
-                            )
-                        ),
-                        
-                        # Login Button
-                        rx.button(
-                            "Sign In",
-                            on_click=LoginFormState.handle_login,
-                            class_name="""
-                                w-full bg-gradient-to-r from-blue-600 to-blue-700 hover:from-blue-700 hover:to-blue-800
-                                text-white font-medium py-3 rounded-lg transition-all duration-200
-                                shadow-lg hover:shadow-blue-600/25
-                            """,
-                            size="3"
-                        ),
                         
-                        # Sign Up Link
-                        rx.hstack(
-                            rx.text("Don't have an account?", class_name="text-sm text-slate-400"),
-                            rx.link(
-                                "Sign up",
-                                href="/signup",
-                                class_name="text-sm text-blue-400 hover:text-blue-300 font-medium"
+                            # Sign Up Link
+                            rx.hstack(
+                                rx.text("Don't have an account?", class_name="text-sm text-slate-400"),
+                                rx.link(
+                                    "Sign up",
+                                    href="/signup",
+                                    class_name="text-sm text-blue-400 hover:text-blue-300 font-medium"
+                                ),
+                                class_name="justify-center"
                             ),
-                            class_name="justify-center"
-                        ),
                         
-                        class_name="space-y-4"
+                            class_name="space-y-4"
+                        ),
+                        on_submit=LoginFormState.handle_login,
                     ),
                     class_name="""
                         bg-slate-800/60 backdrop-blur-lg border border-slate-700/50 rounded-2xl p-8
@@ -1,66 +1,58 @@
 """Enhanced login page with admin/customer role selection."""
 import reflex as rx
 from ..auth import AuthState
-from ..models_rafi import Customer
+from ..customer_cache import customer_ids
+from ..rate_limit import check_login_attempt, login_succeeded
 
 class LoginFormState(rx.State):
     """Enhanced login form state with role selection."""
-    username: str = ""
-    password: str = ""
     role: str = "Customer"  # Customer or Admin
     login_error: str = ""
     is_loading: bool = False
     
-    def set_username(self, value: str):
-        self.username = value
-        self.login_error = ""
-    
-    def set_password(self, value: str):
-        self.password = value
-        self.login_error = ""
-    
     def set_role(self, value: str):
         self.role = value
         self.login_error = ""
-        # Clear password field when switching to customer
-        if value == "Customer":
-            self.password = ""
     
-    async def handle_login(self):
-        """Handle login with role-based authentication."""
+    async def handle_login(self, form_data: dict):
+        """Handle login with role-based authentication.
+
+        Inputs are uncontrolled, so the whole form arrives in one event.
+        """
         self.is_loading = True
         self.login_error = ""
+        username = form_data.get("username", "").strip()
+        # The password field is only rendered for admins
+        password = form_data.get("password", "")
         
-        if not self.username:
+        if not username:
             self.login_error = "Username/ID Customer harus diisi"
             self.is_loading = False
             return
         
+        self.login_error = check_login_attempt(self.router.session.client_ip, username)
+        if self.login_error:
+            self.is_loading = False
+            return
+        
         try:
             if self.role == "Admin":
                 # Admin login with hardcoded credentials
-                if self.username == "admin" and self.password == "admin":
-                    AuthState.current_user = {
-                        "id": "admin",
-                        "username": "admin",
-                        "role": "admin",
-                        "name": "Administrator"
-                    }
-                    AuthState.is_authenticated = True
+                if username == "admin" and password == "admin":
+                    auth_state = await self.get_state(AuthState)
+                    login_succeeded(self.router.session.client_ip, username)
+                    auth_state.start_session("admin", "admin", "Administrator")
                     self.is_loading = False
                     return rx.redirect("/admin-dashboard")
                 else:
                     self.login_error = "Username atau password admin salah"
             else:
                 # Customer login - verify ID exists in database
-                if await self.verify_customer(self.username):
-                    AuthState.current_user = {
-                        "id": self.username,
-                        "username": self.username,
-                        "role": "customer",
-                        "name": f"Customer {self.username}"
-                    }
-                    AuthState.is_authenticated = True
+                customer_id = await self.verify_customer(username)
+                if customer_id:
+                    auth_state = await self.get_state(AuthState)
+                    login_succeeded(self.router.session.client_ip, username)
+                    auth_state.start_session(customer_id, "customer", f"Customer {customer_id}")
                     self.is_loading = False
                     return rx.redirect("/customer-dashboard")
                 else:
@@ -71,15 +63,13 @@ class LoginFormState(rx.State):
         
         self.is_loading = False
     
-    async def verify_customer(self, customer_id: str) -> bool:
-        """Verify customer ID exists in database."""
+    async def verify_customer(self, customer_id: str) -> str:
+        """Normalized customer ID if it exists (in-memory ID cache), else ""."""
         try:
-            with rx.session() as session:
-                customer = session.query(Customer).filter(Customer.ID_Customer == customer_id).first()
-                return customer is not None
+            return await customer_ids.verify_async(customer_id)
         except Exception as e:
             print(f"Error verifying customer: {e}")
-            return False
+            return ""
 
 def role_selector() -> rx.Component:
     """Role selection component."""
@@ -92,6 +82,7 @@ def role_selector() -> rx.Component:
                     rx.text("Customer"),
                     class_name="flex items-center space-x-2"
                 ),
+                type="button",
                 on_click=lambda: LoginFormState.set_role("Customer"),
                 class_name=f"""
                     px-4 py-3 rounded-lg transition-all duration-200 flex-1
@@ -106,6 +97,7 @@ def role_selector() -> rx.Component:
                     rx.text("Admin"),
                     class_name="flex items-center space-x-2"
                 ),
+                type="button",
                 on_click=lambda: LoginFormState.set_role("Admin"),
                 class_name=f"""
                     px-4 py-3 rounded-lg transition-all duration-200 flex-1
@@ -121,117 +113,119 @@ def role_selector() -> rx.Component:
 
 def login_form() -> rx.Component:
     """Enhanced login form."""
-    return rx.vstack(
-        # Role Selection
-        role_selector(),
-        
-        # Username/ID Field
+    return rx.form(
         rx.vstack(
-            rx.text(
-                rx.cond(
-                    LoginFormState.role == "Admin",
-                    "Username",
-                    "ID Customer"
-                ),
-                class_name="text-sm font-medium text-slate-300"
-            ),
-            rx.input(
-                placeholder=rx.cond(
-                    LoginFormState.role == "Admin",
-                    "Masukkan username admin",
-                    "Masukkan ID Customer (contoh: CUS1)"
-                ),
-                value=LoginFormState.username,
-                on_change=LoginFormState.set_username,
-                class_name="""
-                    bg-slate-700/50 border-slate-600 text-white placeholder-slate-400
-                    focus:border-blue-500 focus:ring-1 focus:ring-blue-500
-                """,
-                type="text"
-            ),
-            class_name="space-y-2"
-        ),
+            # Role Selection
+            role_selector(),
         
-        # Password Field (only for Admin)
-        rx.cond(
-            LoginFormState.role == "Admin",
+            # Username/ID Field
             rx.vstack(
-                rx.text("Password", class_name="text-sm font-medium text-slate-300"),
+                rx.text(
+                    rx.cond(
+                        LoginFormState.role == "Admin",
+                        "Username",
+                        "ID Customer"
+                    ),
+                    class_name="text-sm font-medium text-slate-300"
+                ),
                 rx.input(
-                    placeholder="Masukkan password admin",
-                    value=LoginFormState.password,
-                    on_change=LoginFormState.set_password,
+                    placeholder=rx.cond(
+                        LoginFormState.role == "Admin",
+                        "Masukkan username admin",
+                        "Masukkan ID Customer (contoh: CUS1)"
+                    ),
+                    name="username",
                     class_name="""
                         bg-slate-700/50 border-slate-600 text-white placeholder-slate-400
                         focus:border-blue-500 focus:ring-1 focus:ring-blue-500
                     """,
-                    type="password"
+                    type="text"
                 ),
                 class_name="space-y-2"
-            )
-        ),
+            ),
         
-        # Error Message
-        rx.cond(
-            LoginFormState.login_error != "",
-            rx.box(
-                rx.hstack(
-                    rx.icon(tag="alert_circle", size=16, class_name="text-red-400"),
-                    rx.text(
-                        LoginFormState.login_error,
-                        class_name="text-red-400 text-sm"
+            # Password Field (only for Admin)
+            rx.cond(
+                LoginFormState.role == "Admin",
+                rx.vstack(
+                    rx.text("Password", class_name="text-sm font-medium text-slate-300"),
+                    rx.input(
+                        placeholder="Masukkan password admin",
+                        name="password",
+                        class_name="""
+                            bg-slate-700/50 border-slate-600 text-white placeholder-slate-400
+                            focus:border-blue-500 focus:ring-1 focus:ring-blue-500
+                        """,
+                        type="password"
                     ),
-                    class_name="flex items-center space-x-2"
-                ),
-                class_name="p-3 bg-red-900/20 border border-red-500/30 rounded-lg"
-            )
-        ),
+                    class_name="space-y-2"
+                )
+            ),
         
-        # Login Button
-        rx.button(
+            # Error Message
             rx.cond(
-                LoginFormState.is_loading,
-                rx.hstack(
-                    rx.spinner(size="4"),
-                    rx.text("Masuk..."),
-                    class_name="flex items-center space-x-2"
-                ),
-                rx.hstack(
-                    rx.icon(tag="log_in", size=16),
-                    rx.text("Masuk"),
-                    class_name="flex items-center space-x-2"
+                LoginFormState.login_error != "",
+                rx.box(
+                    rx.hstack(
+                        rx.icon(tag="alert_circle", size=16, class_name="text-red-400"),
+                        rx.text(
+                            LoginFormState.login_error,
+                            class_name="text-red-400 text-sm"
+                        ),
+                        class_name="flex items-center space-x-2"
+                    ),
+                    class_name="p-3 bg-red-900/20 border border-red-500/30 rounded-lg"
                 )
             ),
-            on_click=LoginFormState.handle_login,
-            disabled=LoginFormState.is_loading,
-            class_name="""
-                w-full bg-gradient-to-r from-blue-600 to-blue-700 hover:from-blue-700 hover:to-blue-800
-                text-white font-medium py-3 rounded-lg transition-all duration-200
-                shadow-lg hover:shadow-blue-600/25 disabled:opacity-50 disabled:cursor-not-allowed
-            """,
-            size="3"
-        ),
         
-        # Info Box
-        rx.box(
-            rx.vstack(
-                rx.hstack(
-                    rx.icon(tag="info", size=16, class_name="text-blue-400"),
-                    rx.text("Info Login", class_name="font-medium text-blue-400"),
-                    class_name="flex items-center space-x-2"
+            # Login Button
+            rx.button(
+                rx.cond(
+                    LoginFormState.is_loading,
+                    rx.hstack(
+                        rx.spinner(size="4"),
+                        rx.text("Masuk..."),
+                        class_name="flex items-center space-x-2"
+                    ),
+                    rx.hstack(
+                        rx.icon(tag="log_in", size=16),
+                        rx.text("Masuk"),
+                        class_name="flex items-center space-x-2"
+                    )
                 ),
+                type="submit",
+                disabled=LoginFormState.is_loading,
+                class_name="""
+                    w-full bg-gradient-to-r from-blue-600 to-blue-700 hover:from-blue-700 hover:to-blue-800
+                    text-white font-medium py-3 rounded-lg transition-all duration-200
+                    shadow-lg hover:shadow-blue-600/25 disabled:opacity-50 disabled:cursor-not-allowed
+                """,
+                size="3"
+            ),
+        
+            # Info Box
+            rx.box(
                 rx.vstack(
-                    rx.text("• Admin: username=admin, password=admin", class_name="text-xs text-slate-400"),
-                    rx.text("• Customer: gunakan ID Customer dari database", class_name="text-xs text-slate-400"),
-                    rx.text("• Contoh ID Customer: CUS1, CUS2, dst.", class_name="text-xs text-slate-400"),
-                    class_name="space-y-1"
+                    rx.hstack(
+                        rx.icon(tag="info", size=16, class_name="text-blue-400"),
+                        rx.text("Info Login", class_name="font-medium text-blue-400"),
+                        class_name="flex items-center space-x-2"
+                    ),
+                    rx.vstack(
+                        rx.text("• Admin: username=admin, password=admin", class_name="text-xs text-slate-400"),
+                        rx.text("• Customer: gunakan ID Customer dari database", class_name="text-xs text-slate-400"),
+                        rx.text("• Contoh ID Customer: CUS1, CUS2, dst.", class_name="text-xs text-slate-400"),
+                        class_name="space-y-1"
+                    ),
+                    class_name="space-y-2"
                 ),
-                class_name="space-y-2"
+                class_name="p-3 bg-blue-900/20 border border-blue-500/30 rounded-lg"
             ),
-            class_name="p-3 bg-blue-900/20 border border-blue-500/30 rounded-lg"
-        ),
         
-        class_name="space-y-4 w-full"
+            class_name="space-y-4 w-full"
+        ),
+        on_submit=LoginFormState.handle_login,
+        class_name="w-full"
     )
 
 def login_page() -> rx.Component:
@@ -4,35 +4,19 @@ from ..auth import AuthState
 
 class SignupFormState(rx.State):
     """Signup form state."""
-    username: str = ""
-    email: str = ""
-    password: str = ""
-    confirm_password: str = ""
-    role: str = "customer"
     
-    def set_username(self, value: str):
-        self.username = value
-    
-    def set_email(self, value: str):
-        self.email = value
-    
-    def set_password(self, value: str):
-        self.password = value
-    
-    def set_confirm_password(self, value: str):
-        self.confirm_password = value
-    
-    def set_role(self, value: str):
-        self.role = value
-    
-    async def handle_signup(self):
-        """Handle signup form submission."""
-        if self.password != self.confirm_password:
-            AuthState.signup_error = "Passwords do not match"
+    async def handle_signup(self, form_data: dict):
+        """Handle signup form submission (one event per completed form)."""
+        username = form_data.get("username", "")
+        email = form_data.get("email", "")
+        password = form_data.get("password", "")
+        auth_state = await self.get_state(AuthState)
+        if password != form_data.get("confirm_password", ""):
+            auth_state.signup_error = "Passwords do not match"
             return
         
-        if self.username and self.email and self.password:
-            await AuthState.signup(self.username, self.email, self.password, self.role)
+        if username and email and password:
+            return await auth_state.signup(username, email, password)
 
 def signup_page() -> rx.Component:
     """Signup page component."""
@@ -69,131 +53,103 @@ def signup_page() -> rx.Component:
                 
                 # Signup Form
                 rx.box(
-                    rx.vstack(
-                        # Role Selection
+                    rx.form(
                         rx.vstack(
-                            rx.text("Account Type:", class_name="text-sm font-medium text-slate-300"),
-                            rx.hstack(
-                                rx.button(
-                                    "Customer",
-                                    on_click=lambda: SignupFormState.set_role("customer"),
-                                    class_name=f"""
-                                        px-4 py-2 rounded-lg transition-all duration-200
-                                        {'bg-blue-600 text-white' if SignupFormState.role == 'customer' else 'bg-slate-700 text-slate-300 hover:bg-slate-600'}
+                            # Username Field
+                            rx.vstack(
+                                rx.text("Username", class_name="text-sm font-medium text-slate-300"),
+                                rx.input(
+                                    placeholder="Choose a username",
+                                    name="username",
+                                    class_name="""
+                                        bg-slate-700/50 border-slate-600 text-white placeholder-slate-400
+                                        focus:border-blue-500 focus:ring-1 focus:ring-blue-500
                                     """,
-                                    variant="outline"
+                                    type="text"
                                 ),
-                                rx.button(
-                                    "Admin",
-                                    on_click=lambda: SignupFormState.set_role("admin"),
-                                    class_name=f"""
-                                        px-4 py-2 rounded-lg transition-all duration-200
-                                        {'bg-blue-600 text-white' if SignupFormState.role == 'admin' else 'bg-slate-700 text-slate-300 hover:bg-slate-600'}
+                                class_name="space-y-1"
+                            ),
+                        
+                            # Email Field
+                            rx.vstack(
+                                rx.text("Email", class_name="text-sm font-medium text-slate-300"),
+                                rx.input(
+                                    placeholder="Enter your email",
+                                    name="email",
+                                    class_name="""
+                                        bg-slate-700/50 border-slate-600 text-white placeholder-slate-400
+                                        focus:border-blue-500 focus:ring-1 focus:ring-blue-500
                                     """,
-                                    variant="outline"
+                                    type="email"
                                 ),
-                                class_name="flex space-x-2"
+                                class_name="space-y-1"
                             ),
-                            class_name="space-y-2"
-                        ),
                         
-                        # Username Field
-                        rx.vstack(
-                            rx.text("Username", class_name="text-sm font-medium text-slate-300"),
-                            rx.input(
-                                placeholder="Choose a username",
-                                value=SignupFormState.username,
-                                on_change=SignupFormState.set_username,
-                                class_name="""
-                                    bg-slate-700/50 border-slate-600 text-white placeholder-slate-400
-                                    focus:border-blue-500 focus:ring-1 focus:ring-blue-500
-                                """,
-                                type="text"
+                            # Password Field
+                            rx.vstack(
+                                rx.text("Password", class_name="text-sm font-medium text-slate-300"),
+                                rx.input(
+                                    placeholder="Create a password",
+                                    name="password",
+                                    class_name="""
+                                        bg-slate-700/50 border-slate-600 text-white placeholder-slate-400
+                                        focus:border-blue-500 focus:ring-1 focus:ring-blue-500
+                                    """,
+                                    type="password"
+                                ),
+                                class_name="space-y-1"
                             ),
-                            class_name="space-y-1"
-                        ),
                         
-                        # Email Field
-                        rx.vstack(
-                            rx.text("Email", class_name="text-sm font-medium text-slate-300"),
-                            rx.input(
-                                placeholder="Enter your email",
-                                value=SignupFormState.email,
-                                on_change=SignupFormState.set_email,
-                                class_name="""
-                                    bg-slate-700/50 border-slate-600 text-white placeholder-slate-400
-                                    focus:border-blue-500 focus:ring-1 focus:ring-blue-500
-                                """,
-                                type="email"
+                            # Confirm Password Field
+                            rx.vstack(
+                                rx.text("Confirm Password", class_name="text-sm font-medium text-slate-300"),
+                                rx.input(
+                                    placeholder="Confirm your password",
+                                    name="confirm_password",
+                                    class_name="""
+                                        bg-slate-700/50 border-slate-600 text-white placeholder-slate-400
+                                        focus:border-blue-500 focus:ring-1 focus:ring-blue-500
+                                    """,
+                                    type="password"
+                                ),
+                                class_name="space-y-1"
                             ),
-                            class_name="space-y-1"
-                        ),
                         
-                        # Password Field
-                        rx.vstack(
-                            rx.text("Password", class_name="text-sm font-medium text-slate-300"),
-                            rx.input(
-                                placeholder="Create a password",
-                                value=SignupFormState.password,
-                                on_change=SignupFormState.set_password,
-                                class_name="""
-                                    bg-slate-700/50 border-slate-600 text-white placeholder-slate-400
-                                    focus:border-blue-500 focus:ring-1 focus:ring-blue-500
-                                """,
-                                type="password"
+                            # Error Message
+                            rx.cond(
+                                AuthState.signup_error != "",
+                                rx.text(
+                                    AuthState.signup_error,
+                                    class_name="text-red-400 text-sm text-center"
+                                )
                             ),
-                            class_name="space-y-1"
-                        ),
                         
-                        # Confirm Password Field
-                        rx.vstack(
-                            rx.text("Confirm Password", class_name="text-sm font-medium text-slate-300"),
-                            rx.input(
-                                placeholder="Confirm your password",
-                                value=SignupFormState.confirm_password,
-                                on_change=SignupFormState.set_confirm_password,
+                            # Signup Button
+                            rx.button(
+                                "Create Account",
+                                type="submit",
                                 class_name="""
-                                    bg-slate-700/50 border-slate-600 text-white placeholder-slate-400
-                                    focus:border-blue-500 focus:ring-1 focus:ring-blue-500
+                                    w-full bg-gradient-to-r from-green-600 to-green-700 hover:from-green-700 hover:to-green-800
+                                    text-white font-medium py-3 rounded-lg transition-all duration-200
+                                    shadow-lg hover:shadow-green-600/25
                                 """,
-                                type="password"
+                                size="3"
                             ),
-                            class_name="space-y-1"
-                        ),
-                        
-                        # Error Message
-                        rx.cond(
-                            AuthState.signup_error != "",
-                            rx.text(
-                                AuthState.signup_error,
-                                class_name="text-red-400 text-sm text-center"
-                            )
-                        ),
-                        
-                        # Signup Button
-                        rx.button(
-                            "Create Account",
-                            on_click=SignupFormState.handle_signup,
-                            class_name="""
-                                w-full bg-gradient-to-r from-green-600 to-green-700 hover:from-green-700 hover:to-green-800
-                                text-white font-medium py-3 rounded-lg transition-all duration-200
-                                shadow-lg hover:shadow-green-600/25
-                            """,
-                            size="3"
-                        ),
                         
-                        # Login Link
-                        rx.hstack(
-                            rx.text("Already have an account?", class_name="text-sm text-slate-400"),
-                            rx.link(
-                                "Sign in",
-                                href="/login",
-                                class_name="text-sm text-blue-400 hover:text-blue-300 font-medium"
+                            # Login Link
+                            rx.hstack(
+                                rx.text("Already have an account?", class_name="text-sm text-slate-400"),
+                                rx.link(
+                                    "Sign in",
+                                    href="/login",
+                                    class_name="text-sm text-blue-400 hover:text-blue-300 font-medium"
+                                ),
+                                class_name="justify-center"
                             ),
-                            class_name="justify-center"
-                        ),
                         
-                        class_name="space-y-4"
+                            class_name="space-y-4"
+                        ),
+                        on_submit=SignupFormState.handle_signup,
                     ),
                     class_name="""
                         bg-slate-800/60 backdrop-blur-lg border border-slate-700/50 rounded-2xl p-8
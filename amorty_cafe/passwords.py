@@ -0,0 +1,84 @@
+"""Password hashing with bcrypt, run off the event loop in a process pool."""
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import bcrypt
+
+# bcrypt cost factor: each +1 doubles the CPU time of a hash/verify.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Worker processes used for hashing; defaults to one per CPU.
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", str(os.cpu_count() or 1)))
+
+_executor: Optional[ProcessPoolExecutor] = None
+_dummy_hash: Optional[str] = None
+
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
+    """Hash a password synchronously (blocks the calling thread)."""
+    salt = bcrypt.gensalt(rounds=rounds or BCRYPT_ROUNDS)
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+
+def verify_password(password: str, hashed_password: str) -> bool:
+    """Check a password against a bcrypt hash synchronously."""
+    try:
+        return bcrypt.checkpw(password.encode("utf-8"), hashed_password.encode("utf-8"))
+    except ValueError:
+        return False
+
+def get_executor() -> ProcessPoolExecutor:
+    """Get the shared hashing process pool."""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=PASSWORD_WORKERS)
+    return _executor
+
+async def hash_password_async(password: str, rounds: Optional[int] = None) -> str:
+    """Hash a password in the process pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), hash_password, password, rounds)
+
+async def verify_password_async(password: str, hashed_password: Optional[str]) -> bool:
+    """Verify a password in the process pool without blocking the event loop.
+
+    When ``hashed_password`` is None (unknown user) a dummy hash is still
+    checked so response time does not reveal whether the user exists.
+    """
+    global _dummy_hash
+    loop = asyncio.get_running_loop()
+    if hashed_password is None:
+        if _dummy_hash is None:
+            _dummy_hash = await hash_password_async("dummy-password")
+        await loop.run_in_executor(get_executor(), verify_password, password, _dummy_hash)
+        return False
+    return await loop.run_in_executor(get_executor(), verify_password, password, hashed_password)
+
+def benchmark_logins(worker_counts: List[int] = (1, 2, 4), logins: int = 32,
+                     rounds: Optional[int] = None) -> List[Dict]:
+    """Measure verified logins per second for different pool sizes."""
+    hashed = hash_password("benchmark-password", rounds)
+    results = []
+    for workers in worker_counts:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Warm up the worker processes before timing.
+            list(pool.map(verify_password, ["x"] * workers, [hashed] * workers))
+            start = time.perf_counter()
+            list(pool.map(verify_password, ["benchmark-password"] * logins, [hashed] * logins))
+            elapsed = time.perf_counter() - start
+        per_second = logins / elapsed
+        results.append({
+            "workers": workers,
+            "rounds": rounds or BCRYPT_ROUNDS,
+            "logins_per_second": round(per_second, 1),
+            "logins_per_second_per_worker": round(per_second / workers, 1),
+        })
+    return results
+
+if __name__ == "__main__":
+    for row in benchmark_logins():
+        print(
+            f"workers={row['workers']} rounds={row['rounds']}: "
+            f"{row['logins_per_second']} logins/s "
+            f"({row['logins_per_second_per_worker']} per worker)"
+        )
@@ -0,0 +1,235 @@
+"""Phone number normalisation, a normalised DB column and an exact/suffix index.
+
+Numbers are stored as typed (``081234567890``, ``+62 812-3456-7890``);
+every one is also kept in a normalised form with the country code and
+digits only (``6281234567890``). Lookups go through ``PhoneIndex``, a
+sorted array of reversed numbers, so exact and last-digits lookups are
+both a binary search.
+"""
+import bisect
+import re
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, inspect, text
+
+COUNTRY_CODE = "62"
+
+# Shortest "last digits" query answered
+MIN_SUFFIX = 4
+
+# Between the reversed number and the ID in an index entry; sorts before digits
+_SEPARATOR = "\x00"
+
+_NON_DIGIT = re.compile(r"\D")
+
+def normalize_phone(raw) -> str:
+    """Digits with country code: "0812-3456-7890" / "+62 812..." -> "62812...".
+
+    Returns "" for values too short to be a phone number.
+    """
+    digits = _NON_DIGIT.sub("", str(raw or ""))
+    if digits.startswith("00"):
+        digits = digits[2:]
+    elif digits.startswith("0"):
+        digits = COUNTRY_CODE + digits[1:]
+    elif digits.startswith("8"):
+        digits = COUNTRY_CODE + digits
+    return digits if len(digits) >= MIN_SUFFIX + 2 else ""
+
+def keep_normalized(model, raw_field: str, normal_field: str):
+    """Fill ``normal_field`` from ``raw_field`` on every insert and update."""
+    def fill(mapper, connection, target):
+        setattr(target, normal_field, normalize_phone(getattr(target, raw_field, None)) or None)
+    event.listen(model, "before_insert", fill)
+    event.listen(model, "before_update", fill)
+
+def add_normalized_column(engine, model, normal_field: str) -> bool:
+    """Migration: add the normalised column (and any index on it) to an existing table.
+
+    ``create_all`` only creates missing tables, so databases created
+    before the column existed need this once. Returns True if it added
+    the column.
+    """
+    table = model.__table__
+    column = table.c[normal_field]
+    existing = {col["name"] for col in inspect(engine).get_columns(table.name)}
+    added = False
+    if column.name not in existing:
+        preparer = engine.dialect.identifier_preparer
+        with engine.begin() as conn:
+            conn.execute(text(
+                f"ALTER TABLE {preparer.format_table(table)} "
+                f"ADD {preparer.format_column(column)} {column.type.compile(engine.dialect)}"
+            ))
+        added = True
+    for index in table.indexes:
+        if column in index.columns:
+            index.create(engine, checkfirst=True)
+    return added
+
+def backfill(session, model, raw_field: str, normal_field: str, batch: int = 1000) -> int:
+    """Recompute the normalised column for every row, one batch per commit.
+
+    Pages by id (keyset), so it is safe to re-run and never rescans rows.
+    Returns the number of rows changed.
+    """
+    changed = 0
+    last_id = 0
+    while True:
+        rows = (
+            session.query(model)
+            .filter(model.id > last_id)
+            .order_by(model.id)
+            .limit(batch)
+            .all()
+        )
+        if not rows:
+            return changed
+        for row in rows:
+            normalized = normalize_phone(getattr(row, raw_field)) or None
+            if getattr(row, normal_field) != normalized:
+                setattr(row, normal_field, normalized)
+                changed += 1
+        session.commit()
+        last_id = rows[-1].id
+
+class PhoneIndex:
+    """Sorted array of reversed normalised numbers, for exact and suffix lookups.
+
+    Each entry is one string, the number's digits reversed plus the ID
+    (``"0987654321826\x00CUS1"``), so a number ending in given digits is
+    a prefix match and both lookups are a binary search. That is about
+    one short string per customer instead of a hash entry per suffix.
+    Loaded with a single query through ``loader`` (pairs of ID and
+    phone), kept in sync by CRUD through ``put``/``remove`` and reloaded
+    after ``ttl`` seconds to pick up writes from other processes.
+    """
+
+    def __init__(self, loader: Callable[[], Iterable[Tuple[str, str]]], ttl: float = 300.0):
+        self.loader = loader
+        self.ttl = ttl
+        self._entries: List[str] = []
+        self._keys: Dict[str, str] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _entry(item_id: str, normalized: str) -> str:
+        return f"{normalized[::-1]}{_SEPARATOR}{item_id}"
+
+    def refresh(self):
+        """Reload every number from the loader."""
+        keys = {}
+        for item_id, phone in self.loader():
+            normalized = normalize_phone(phone)
+            if normalized:
+                item_id = str(item_id)
+                keys[item_id] = self._entry(item_id, normalized)
+        entries = sorted(keys.values())
+        with self._lock:
+            self._entries, self._keys = entries, keys
+            self._loaded_at = time.monotonic()
+
+    def _ensure_fresh(self):
+        loaded_at = self._loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at > self.ttl:
+            self.refresh()
+
+    def _remove(self, item_id: str):
+        key = self._keys.pop(item_id, None)
+        if key is None:
+            return
+        i = bisect.bisect_left(self._entries, key)
+        if i < len(self._entries) and self._entries[i] == key:
+            del self._entries[i]
+
+    def put(self, item_id, phone):
+        """Record a new or changed number."""
+        item_id = str(item_id)
+        normalized = normalize_phone(phone)
+        with self._lock:
+            self._remove(item_id)
+            if normalized:
+                key = self._entry(item_id, normalized)
+                self._keys[item_id] = key
+                bisect.insort(self._entries, key)
+
+    def remove(self, item_id):
+        with self._lock:
+            self._remove(str(item_id))
+
+    def invalidate(self):
+        """Force a reload on the next lookup."""
+        self._loaded_at = None
+
+    def _prefixed(self, prefix: str, limit: int) -> List[str]:
+        """IDs of the entries starting with ``prefix``, in sorted order."""
+        self._ensure_fresh()
+        entries = self._entries
+        ids = []
+        i = bisect.bisect_left(entries, prefix)
+        while i < len(entries) and len(ids) < limit and entries[i].startswith(prefix):
+            ids.append(entries[i].split(_SEPARATOR, 1)[1])
+            i += 1
+        return ids
+
+    def exact(self, phone, limit: int = 10) -> List[str]:
+        """IDs whose number equals ``phone`` in any format."""
+        normalized = normalize_phone(phone)
+        if not normalized:
+            return []
+        return self._prefixed(normalized[::-1] + _SEPARATOR, limit)
+
+    def suffix(self, digits, limit: int = 10) -> List[str]:
+        """IDs whose number ends with ``digits`` (at least 4 digits)."""
+        digits = _NON_DIGIT.sub("", str(digits or ""))
+        if len(digits) < MIN_SUFFIX:
+            return []
+        return self._prefixed(digits[::-1], limit)
+
+    def lookup(self, query, limit: int = 10) -> List[str]:
+        """Exact match for a full number, otherwise a last-digits match."""
+        return self.exact(query, limit) or self.suffix(query, limit)
+
+def looks_like_phone(query) -> bool:
+    """True for input that is mostly digits, e.g. "0812 3456" or "+62..."."""
+    query = str(query or "").strip()
+    digits = len(_NON_DIGIT.sub("", query))
+    return digits >= MIN_SUFFIX and digits >= len(query.replace(" ", "").replace("-", "")) - 1
+
+def benchmark(customers: int = 1_000_000, lookups: int = 100_000) -> Dict[str, float]:
+    """Build an index of random numbers; report its memory and lookup times."""
+    import random
+    import tracemalloc
+    rng = random.Random(0)
+    formats = ["0{}", "+62{}", "62{}", "+62 {}"]
+    phones = [(f"CUS{i}", rng.choice(formats).format(f"8{rng.randint(10**9, 10**10 - 1)}"))
+              for i in range(1, customers + 1)]
+    index = PhoneIndex(lambda: phones, ttl=float("inf"))
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    index.refresh()
+    build_s = time.perf_counter() - start
+    bytes_per_customer = (tracemalloc.get_traced_memory()[0] - before) / customers
+    tracemalloc.stop()
+
+    sample = [rng.choice(phones)[1] for _ in range(lookups)]
+    start = time.perf_counter()
+    for phone in sample:
+        index.exact(phone)
+    exact_us = (time.perf_counter() - start) / lookups * 1e6
+
+    start = time.perf_counter()
+    for phone in sample:
+        index.suffix(phone[-6:])
+    suffix_us = (time.perf_counter() - start) / lookups * 1e6
+    return {"customers": customers, "build_s": round(build_s, 1),
+            "bytes_per_customer": round(bytes_per_customer, 1),
+            "exact_us": round(exact_us, 2), "suffix_us": round(suffix_us, 2)}
+
+if __name__ == "__main__":
+    print(benchmark())
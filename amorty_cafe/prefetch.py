@@ -0,0 +1,95 @@
+"""Predict the admin's next tab and keep prefetched first pages per session."""
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Optional
+
+# Configured tab flow (weights act as prior counts for the learned model).
+DEFAULT_TRANSITIONS = {
+    "CUSTOMER": {"PESANAN": 5},
+    "PESANAN": {"TRANSAKSI": 5},
+    "TRANSAKSI": {"PEMBAYARAN": 5},
+    "MEJA": {"RESERVASI": 3},
+    "RESERVASI": {"MEJA": 2},
+}
+
+class TabTransitions:
+    """First-order transition counts between tabs, seeded with priors."""
+
+    def __init__(self, priors: Dict[str, Dict[str, int]] = DEFAULT_TRANSITIONS,
+                 min_probability: float = 0.3):
+        self.min_probability = min_probability
+        self.counts: Dict[str, Counter] = {
+            tab: Counter(targets) for tab, targets in priors.items()
+        }
+
+    def record(self, from_tab: str, to_tab: str):
+        """Learn from one observed tab switch."""
+        if from_tab and to_tab and from_tab != to_tab:
+            self.counts.setdefault(from_tab, Counter())[to_tab] += 1
+
+    def predict(self, tab: str) -> Optional[str]:
+        """Most likely next tab, if it is likely enough to be worth loading."""
+        targets = self.counts.get(tab)
+        if not targets:
+            return None
+        next_tab, count = targets.most_common(1)[0]
+        if count / sum(targets.values()) < self.min_probability:
+            return None
+        return next_tab
+
+class PrefetchStore:
+    """Per-session LRU of prefetched tab pages with a TTL.
+
+    At most ``tabs_per_session`` tabs are kept per session and at most
+    ``max_sessions`` sessions, so memory is bounded by
+    max_sessions * tabs_per_session pages.
+
+    Each tab has a generation shared by all sessions; ``invalidate``
+    bumps it after a write, which retires every session's page of that
+    tab at once. Pages are stored with the generation read before their
+    query, so a page loaded across a write is never served.
+    """
+
+    def __init__(self, tabs_per_session: int = 3, ttl: float = 60.0, max_sessions: int = 1000):
+        self.tabs_per_session = tabs_per_session
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, OrderedDict[str, tuple]]" = OrderedDict()
+        self._generations: Counter = Counter()
+
+    def generation(self, tab: str) -> int:
+        """Current generation of a tab; read it before querying a page."""
+        return self._generations[tab]
+
+    def invalidate(self, tab: str):
+        """Retire every session's cached page of a tab after the table changed."""
+        self._generations[tab] += 1
+
+    def put(self, session: str, tab: str, value: Any, generation: int):
+        """Cache a page queried at ``generation`` (dropped if the tab changed since)."""
+        if generation != self._generations[tab]:
+            return
+        tabs = self._sessions.pop(session, None) or OrderedDict()
+        tabs.pop(tab, None)
+        tabs[tab] = (time.monotonic() + self.ttl, generation, value)
+        while len(tabs) > self.tabs_per_session:
+            tabs.popitem(last=False)
+        self._sessions[session] = tabs
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+    def take(self, session: str, tab: str) -> Optional[Any]:
+        """Pop a fresh prefetched page, or None on miss, expiry or a newer generation."""
+        tabs = self._sessions.get(session)
+        if not tabs:
+            return None
+        entry = tabs.pop(tab, None)
+        if entry is None or entry[0] < time.monotonic() or entry[1] != self._generations[tab]:
+            return None
+        return entry[2]
+
+    def __len__(self) -> int:
+        return sum(len(tabs) for tabs in self._sessions.values())
+
+tab_transitions = TabTransitions()
+prefetched_pages = PrefetchStore()
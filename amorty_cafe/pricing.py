@@ -0,0 +1,194 @@
+"""Transaction totals computed from orders and menu prices.
+
+Rafi's schema: a Pesanan is one menu item, so a Transaksi's total is
+the Harga_Menu of its Pesanan's ID_Menu. Prices come from ``menu_prices``,
+a map loaded with one query and reloaded after a TTL, so totals for
+thousands of transactions cost one Pesanan query per 1000 IDs and no
+per-row menu lookups.
+
+Main schema (models.py): an Order's total is the sum of its OrderItem
+lines minus ``Order.discount`` plus ``Order.tax`` (both amounts in Rp).
+"""
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+import reflex as rx
+from sqlalchemy import func
+
+from . import models
+from .models_rafi import Menu, Pesanan, Transaksi
+
+# Oracle allows at most 1000 items in an IN list
+IN_CHUNK = 1000
+
+# Totals closer than this count as equal (float rounding)
+TOLERANCE = 0.5
+
+class PriceMap:
+    """ID_Menu -> Harga_Menu for every menu item, refreshed after ``ttl``."""
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._prices: Dict[str, float] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        with rx.session() as session:
+            rows = session.query(Menu.ID_Menu, Menu.Harga_Menu).all()
+        with self._lock:
+            self._prices = {menu_id: price for menu_id, price in rows}
+            self._loaded_at = time.monotonic()
+
+    def _ensure_fresh(self):
+        loaded_at = self._loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at > self.ttl:
+            self.refresh()
+
+    def get(self, menu_id: str) -> Optional[float]:
+        self._ensure_fresh()
+        return self._prices.get(menu_id)
+
+    def invalidate(self):
+        """Force a reload after a menu price changed."""
+        self._loaded_at = None
+
+# Shared price map; admin edits to MENU invalidate it
+menu_prices = PriceMap()
+
+def chunks(items: List[Any], size: int = IN_CHUNK) -> Iterable[List[Any]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+def transaksi_totals(pesanan_ids: Iterable[str]) -> Dict[str, Optional[float]]:
+    """Total_Harga for each Pesanan ID; None if the order or its menu is missing."""
+    ids = list(dict.fromkeys(pesanan_ids))
+    totals: Dict[str, Optional[float]] = dict.fromkeys(ids)
+    with rx.session() as session:
+        for chunk in chunks(ids):
+            rows = session.query(Pesanan.ID_Pesanan, Pesanan.ID_Menu).filter(Pesanan.ID_Pesanan.in_(chunk)).all()
+            for pesanan_id, menu_id in rows:
+                totals[pesanan_id] = menu_prices.get(menu_id)
+    return totals
+
+def transaksi_total(pesanan_id: str) -> Optional[float]:
+    return transaksi_totals([pesanan_id]).get(pesanan_id)
+
+def order_totals(order_ids: Iterable[int]) -> Dict[int, float]:
+    """Sum of item lines minus discount plus tax, for each Order id with items.
+
+    One grouped query over OrderItem and one over Order per 1000 IDs.
+    Orders without item lines are left out rather than totalled as 0.
+    """
+    ids = list(dict.fromkeys(order_ids))
+    totals: Dict[int, float] = {}
+    with rx.session() as session:
+        for chunk in chunks(ids):
+            subtotals = dict(
+                session.query(
+                    models.OrderItem.order_id,
+                    func.sum(models.OrderItem.quantity * models.OrderItem.unit_price),
+                )
+                .filter(models.OrderItem.order_id.in_(chunk))
+                .group_by(models.OrderItem.order_id)
+                .all()
+            )
+            orders = (
+                session.query(models.Order.id, models.Order.discount, models.Order.tax)
+                .filter(models.Order.id.in_(chunk))
+                .all()
+            )
+            for order_id, discount, tax in orders:
+                if order_id not in subtotals:
+                    continue
+                totals[order_id] = max(0.0, (subtotals[order_id] or 0.0) - (discount or 0.0) + (tax or 0.0))
+    return totals
+
+def day_range(day: date):
+    start = datetime(day.year, day.month, day.day)
+    return start, start + timedelta(days=1)
+
+def recompute_transaksi(day: Optional[date] = None, fix: bool = False,
+                        batch: int = 5000) -> Dict[str, Any]:
+    """Check stored Total_Harga against computed totals for one day's Transaksi.
+
+    Streams the day by keyset on id, one totals batch per page. With
+    ``fix`` mismatched rows are updated in the same pass. Returns counts
+    and the first mismatches.
+    """
+    start, end = day_range(day or date.today())
+    checked, mismatched, missing, fixed, last_id = 0, 0, 0, 0, 0
+    samples: List[Dict[str, Any]] = []
+    while True:
+        with rx.session() as session:
+            rows = (
+                session.query(Transaksi.id, Transaksi.ID_Transaksi, Transaksi.ID_Pesanan, Transaksi.Total_Harga)
+                .filter(Transaksi.Tanggal_Transaksi >= start, Transaksi.Tanggal_Transaksi < end,
+                        Transaksi.id > last_id)
+                .order_by(Transaksi.id)
+                .limit(batch)
+                .all()
+            )
+        if not rows:
+            break
+        last_id = rows[-1].id
+        checked += len(rows)
+        computed = transaksi_totals(row.ID_Pesanan for row in rows)
+        updates = []
+        for row in rows:
+            total = computed.get(row.ID_Pesanan)
+            if total is None:
+                missing += 1
+                continue
+            if abs((row.Total_Harga or 0.0) - total) <= TOLERANCE:
+                continue
+            mismatched += 1
+            if len(samples) < 20:
+                samples.append({"ID_Transaksi": row.ID_Transaksi, "stored": row.Total_Harga, "computed": total})
+            updates.append({"id": row.id, "Total_Harga": total})
+        if fix and updates:
+            with rx.session() as session:
+                session.bulk_update_mappings(Transaksi, updates)
+                session.commit()
+            fixed += len(updates)
+    return {"checked": checked, "mismatched": mismatched, "missing": missing,
+            "fixed": fixed, "samples": samples}
+
+def recompute_orders(day: Optional[date] = None, fix: bool = False,
+                     batch: int = 5000) -> Dict[str, Any]:
+    """Check stored Order.total_amount against ``order_totals`` for one day."""
+    start, end = day_range(day or date.today())
+    checked, mismatched, fixed, last_id = 0, 0, 0, 0
+    samples: List[Dict[str, Any]] = []
+    while True:
+        with rx.session() as session:
+            rows = (
+                session.query(models.Order.id, models.Order.total_amount)
+                .filter(models.Order.order_date >= start, models.Order.order_date < end,
+                        models.Order.id > last_id)
+                .order_by(models.Order.id)
+                .limit(batch)
+                .all()
+            )
+        if not rows:
+            break
+        last_id = rows[-1].id
+        checked += len(rows)
+        computed = order_totals(row.id for row in rows)
+        updates = []
+        for row in rows:
+            total = computed.get(row.id)
+            if total is None or abs((row.total_amount or 0.0) - total) <= TOLERANCE:
+                continue
+            mismatched += 1
+            if len(samples) < 20:
+                samples.append({"id": row.id, "stored": row.total_amount, "computed": total})
+            updates.append({"id": row.id, "total_amount": total})
+        if fix and updates:
+            with rx.session() as session:
+                session.bulk_update_mappings(models.Order, updates)
+                session.commit()
+            fixed += len(updates)
+    return {"checked": checked, "mismatched": mismatched, "fixed": fixed, "samples": samples}
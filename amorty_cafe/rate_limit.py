@@ -0,0 +1,117 @@
+"""In-memory token-bucket rate limiting for login attempts."""
+import math
+import time
+import tracemalloc
+from typing import Dict, Hashable
+
+# Bucket state is packed into one int: milliseconds since the limiter
+# started in the high bits, token count in thousandths in the low bits.
+_TOKEN_BITS = 20
+_TOKEN_MASK = (1 << _TOKEN_BITS) - 1
+
+class TokenBucketLimiter:
+    """Token buckets keyed by an arbitrary tuple, with TTL eviction.
+
+    Keys are stored as their hash and bucket state as a single packed
+    int, so each tracked key costs roughly one small dict entry. The
+    dict is kept in last-touched order, so expired buckets are always at
+    the front and eviction is amortized O(1).
+    """
+
+    def __init__(self, capacity: int = 5, refill_per_second: float = 5 / 60,
+                 ttl: float = 900.0, max_keys: int = 500000):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.ttl_ms = int(ttl * 1000)
+        self.max_keys = max_keys
+        self._epoch = time.monotonic()
+        self._buckets: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def _now_ms(self) -> int:
+        return int((time.monotonic() - self._epoch) * 1000)
+
+    def _tokens(self, packed: int, now_ms: int) -> float:
+        last_ms = packed >> _TOKEN_BITS
+        tokens = (packed & _TOKEN_MASK) / 1000
+        return min(self.capacity, tokens + (now_ms - last_ms) / 1000 * self.refill_per_second)
+
+    def _evict(self, now_ms: int):
+        buckets = self._buckets
+        while buckets:
+            oldest_key = next(iter(buckets))
+            oldest = buckets[oldest_key] >> _TOKEN_BITS
+            if now_ms - oldest < self.ttl_ms and len(buckets) <= self.max_keys:
+                break
+            del buckets[oldest_key]
+
+    def allow(self, *key: Hashable) -> bool:
+        """Consume one token for ``key``; False when the bucket is empty."""
+        now_ms = self._now_ms()
+        hashed = hash(key)
+        packed = self._buckets.pop(hashed, None)
+        tokens = self.capacity if packed is None else self._tokens(packed, now_ms)
+
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self._buckets[hashed] = (now_ms << _TOKEN_BITS) | int(tokens * 1000)
+        self._evict(now_ms)
+        return allowed
+
+    def retry_after(self, *key: Hashable) -> int:
+        """Seconds until ``key`` has a token again."""
+        packed = self._buckets.get(hash(key))
+        if packed is None:
+            return 0
+        missing = 1 - self._tokens(packed, self._now_ms())
+        if missing <= 0:
+            return 0
+        return math.ceil(missing / self.refill_per_second)
+
+    def reset(self, *key: Hashable):
+        """Forget ``key`` (e.g. after a successful login)."""
+        self._buckets.pop(hash(key), None)
+
+# Per client+username: 5 attempts, then one every 12 seconds.
+login_limiter = TokenBucketLimiter(capacity=5, refill_per_second=5 / 60)
+# Per client across all usernames, against username spraying.
+client_limiter = TokenBucketLimiter(capacity=30, refill_per_second=0.5)
+
+def check_login_attempt(client: str, username: str) -> str:
+    """Return an error message if this login attempt must be rejected."""
+    username = (username or "").strip().lower()
+    if not login_limiter.allow(client, username):
+        wait = login_limiter.retry_after(client, username)
+        return f"Terlalu banyak percobaan login. Coba lagi dalam {wait} detik."
+    if not client_limiter.allow(client):
+        wait = client_limiter.retry_after(client)
+        return f"Terlalu banyak percobaan login. Coba lagi dalam {wait} detik."
+    return ""
+
+def login_succeeded(client: str, username: str):
+    """Give back the attempts of a client+username after a successful login."""
+    login_limiter.reset(client, (username or "").strip().lower())
+
+def measure_memory(keys: int = 100000) -> Dict[str, float]:
+    """Measure memory held by a limiter tracking ``keys`` distinct keys."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    limiter = TokenBucketLimiter(max_keys=keys)
+    start = time.perf_counter()
+    for i in range(keys):
+        limiter.allow(f"10.0.{i >> 8 & 255}.{i & 255}", f"user{i}")
+    elapsed = time.perf_counter() - start
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return {
+        "keys": len(limiter),
+        "total_mb": round(used / 1024 / 1024, 2),
+        "bytes_per_key": round(used / keys, 1),
+        "us_per_attempt": round(elapsed / keys * 1e6, 2),
+    }
+
+if __name__ == "__main__":
+    print(measure_memory())
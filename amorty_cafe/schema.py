@@ -0,0 +1,23 @@
+"""Schema migration helpers shared by database.py and database_rafi.py."""
+from sqlalchemy import inspect, text
+
+def drop_stale_indexes(engine, model) -> list:
+    """Drop ``ix_*`` indexes on the model's table that the model no longer declares.
+
+    Older versions indexed columns with ``index=True``, which names indexes
+    ix_<table>_<column> (too long for Oracle on some tables). Only names
+    with that prefix are touched, so unique keys and hand-made indexes
+    stay. Returns the dropped names.
+    """
+    table = model.__table__
+    declared = {index.name.lower() for index in table.indexes}
+    preparer = engine.dialect.identifier_preparer
+    dropped = []
+    for existing in inspect(engine).get_indexes(table.name):
+        name = existing["name"] or ""
+        if not name.lower().startswith("ix_") or name.lower() in declared:
+            continue
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP INDEX {preparer.quote(name)}"))
+        dropped.append(name)
+    return dropped
@@ -0,0 +1,307 @@
+"""Global search: a trigram inverted index over names, contacts and menu items.
+
+Documents are (kind, id) pairs with a few text fields, e.g. a customer's
+name and phone. Fields are normalised (accents stripped, lowercase,
+punctuation to spaces) and every trigram maps to an array of document
+numbers. A query reads the posting list of its rarest trigram and checks
+only those documents, so its cost depends on how selective the query is,
+not on how many rows are indexed.
+
+Loading every source takes tens of seconds at a million rows, so it
+runs in a background thread (``start_build``, called at app startup);
+until a kind is loaded, searches just do not return it.
+"""
+import random
+import re
+import threading
+import time
+import unicodedata
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# A loader returns (id, fields) for every row of one kind; fields[0] is the title
+Loader = Callable[[], Iterable[Tuple[str, Sequence[str]]]]
+
+# Separates fields in a document's text; never produced by ``normalize``
+FIELD_SEP = " \x1f "
+
+# Documents checked per query before returning the best found so far
+MAX_SCAN = 50_000
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+def normalize(text) -> str:
+    """Lowercase ASCII words and digits: "José.Doe@Mail" -> "jose doe mail"."""
+    text = unicodedata.normalize("NFKD", str(text or ""))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return _NON_ALNUM.sub(" ", text).strip()
+
+def field_trigrams(field: str) -> set:
+    """Trigrams of a normalised field, padded so word starts are indexed."""
+    padded = f" {field} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def query_trigrams(token: str) -> set:
+    """Trigrams a document must contain to match ``token``.
+
+    Two-letter tokens match word starts only (" ab"); longer tokens match
+    anywhere, so "4567" finds a phone number ending in 4567.
+    """
+    if len(token) == 2:
+        return {f" {token}"}
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+class SearchIndex:
+    """Trigram index with incremental put/remove and top-k search.
+
+    Removed or replaced documents are tombstoned; their postings are
+    dropped by ``compact``, which runs once tombstones outnumber live
+    documents. Rows put or removed while their kind is being loaded
+    keep the newer value.
+
+    Writers hold ``_lock``; ``search`` does not, so it never waits for a
+    build. It reads ``_view``, which ``compact`` replaces in one
+    assignment once the renumbered structures are complete. Other writes
+    only append (postings last) or tombstone, which readers can see
+    mid-way safely.
+    """
+
+    def __init__(self, max_scan: int = MAX_SCAN):
+        self.max_scan = max_scan
+        self._postings: Dict[str, array] = {}
+        self._keys: List[Optional[Tuple[str, str]]] = []
+        self._texts: List[str] = []
+        self._fields: List[Tuple[str, ...]] = []
+        self._view = (self._postings, self._keys, self._texts, self._fields)
+        self._docs: Dict[Tuple[str, str], int] = {}
+        self._loaders: Dict[str, Loader] = {}
+        self._loaded: set = set()
+        # IDs put/removed per kind while that kind's loader is running
+        self._touched: Dict[str, set] = {}
+        self._lock = threading.RLock()
+
+    def register(self, kind: str, loader: Loader):
+        """Add a source; it is loaded by the next build."""
+        self._loaders[kind] = loader
+
+    @property
+    def ready(self) -> bool:
+        return all(kind in self._loaded for kind in self._loaders)
+
+    def _claim(self) -> List[str]:
+        """Mark unloaded kinds as loading (lock held); returns them."""
+        kinds = [kind for kind in self._loaders if kind not in self._loaded and kind not in self._touched]
+        for kind in kinds:
+            self._touched[kind] = set()
+        return kinds
+
+    def _load(self, kinds: List[str]):
+        for kind in kinds:
+            try:
+                rows = list(self._loaders[kind]())
+            except Exception as e:
+                print(f"Error loading search index {kind}: {e}")
+                with self._lock:
+                    self._touched.pop(kind, None)
+                continue
+            with self._lock:
+                touched = self._touched.pop(kind)
+                for item_id, fields in rows:
+                    if str(item_id) not in touched:
+                        self._add(kind, item_id, fields)
+                self._loaded.add(kind)
+
+    def build(self):
+        """Load every registered kind that is not loaded yet, in this thread."""
+        with self._lock:
+            kinds = self._claim()
+        self._load(kinds)
+
+    def start_build(self):
+        """Load unloaded kinds in a background thread; returns at once."""
+        with self._lock:
+            kinds = self._claim()
+            if not kinds:
+                return
+            threading.Thread(target=self._load, args=(kinds,), name="search-index-build", daemon=True).start()
+
+    def _touch(self, kind: str, item_id):
+        touched = self._touched.get(kind)
+        if touched is not None:
+            touched.add(str(item_id))
+
+    def _add(self, kind: str, item_id, fields: Sequence[str]):
+        key = (kind, str(item_id))
+        old = self._docs.get(key)
+        if old is not None:
+            self._keys[old] = None
+        fields = tuple("" if field is None else str(field) for field in fields)
+        normalized = [normalize(field) for field in fields]
+        doc = len(self._keys)
+        self._keys.append(key)
+        self._texts.append(" " + FIELD_SEP.join(normalized) + " ")
+        self._fields.append(fields)
+        self._docs[key] = doc
+        grams = set()
+        for field in normalized:
+            if field:
+                grams |= field_trigrams(field)
+        postings = self._postings
+        for gram in grams:
+            posting = postings.get(gram)
+            if posting is None:
+                posting = postings[gram] = array("I")
+            posting.append(doc)
+
+    def put(self, kind: str, item_id, fields: Sequence[str]):
+        """Index a new row or re-index a changed one."""
+        with self._lock:
+            self._touch(kind, item_id)
+            self._add(kind, item_id, fields)
+            self._maybe_compact()
+
+    def remove(self, kind: str, item_id):
+        with self._lock:
+            self._touch(kind, item_id)
+            doc = self._docs.pop((kind, str(item_id)), None)
+            if doc is not None:
+                self._keys[doc] = None
+                self._maybe_compact()
+
+    def invalidate(self, kind: str):
+        """Drop one kind and reload it in the background.
+
+        A full reload; prefer ``put``/``remove`` for the rows that changed.
+        """
+        with self._lock:
+            for key in [key for key in self._docs if key[0] == kind]:
+                self._keys[self._docs.pop(key)] = None
+            self._loaded.discard(kind)
+            self._maybe_compact()
+        self.start_build()
+
+    def _maybe_compact(self):
+        if len(self._keys) > 1000 and len(self._keys) > 2 * len(self._docs):
+            self.compact()
+
+    def compact(self):
+        """Rebuild the postings without tombstoned documents."""
+        with self._lock:
+            live = [(key, self._fields[doc]) for key, doc in sorted(self._docs.items(), key=lambda kv: kv[1])]
+            self._postings, self._keys, self._texts, self._fields, self._docs = {}, [], [], [], {}
+            for (kind, item_id), fields in live:
+                self._add(kind, item_id, fields)
+            self._view = (self._postings, self._keys, self._texts, self._fields)
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def search(self, query: str, limit: int = 10,
+               kinds: Optional[Iterable[str]] = None) -> List[Dict[str, str]]:
+        """Top ``limit`` documents containing every word of ``query``.
+
+        Results whose words start where the query's words do come first,
+        then shorter documents. Returns dicts with kind, id, title, detail.
+        Never waits for a build; kinds still loading are missing.
+        """
+        self.start_build()
+        tokens = [token for token in normalize(query).split(" ") if len(token) >= 2]
+        if not tokens:
+            return []
+        kinds = set(kinds) if kinds is not None else None
+        # One consistent generation even if compact renumbers meanwhile
+        all_postings, keys, texts, all_fields = self._view
+
+        postings = []
+        for token in tokens:
+            for gram in query_trigrams(token):
+                posting = all_postings.get(gram)
+                if posting is None:
+                    return []
+                postings.append(posting)
+        candidates = min(postings, key=len)
+
+        word_starts = [" " + token for token in tokens]
+        short = [len(token) < 3 for token in tokens]
+        perfect = len(tokens)
+        hits = []
+        best = 0
+        for scanned, doc in enumerate(candidates):
+            if scanned >= self.max_scan or best >= limit:
+                break
+            key = keys[doc]
+            if key is None or (kinds is not None and key[0] not in kinds):
+                continue
+            text = texts[doc]
+            score = 0
+            for token, start, is_short in zip(tokens, word_starts, short):
+                if start in text:
+                    score += 1
+                elif is_short or token not in text:
+                    break
+            else:
+                hits.append((-score, len(text), doc, key))
+                if score == perfect:
+                    best += 1
+        hits.sort()
+        results = []
+        # The key read during the scan; a concurrent remove may tombstone it since
+        for _, _, doc, (kind, item_id) in hits[:limit]:
+            fields = all_fields[doc]
+            results.append({
+                "kind": kind,
+                "id": item_id,
+                "title": fields[0] if fields else item_id,
+                "detail": " · ".join(field for field in fields[1:] if field),
+            })
+        return results
+
+# Index shared by all sessions; sources are registered by the pages that own them
+search_index = SearchIndex()
+
+def benchmark(customers: int = 1_000_000, queries: int = 1000) -> Dict[str, float]:
+    """Build a synthetic customer index and time top-10 queries and updates."""
+    rng = random.Random(0)
+    first = ["Andi", "Budi", "Citra", "Dewi", "Eko", "Fitri", "Gilang", "Hana", "Intan", "Joko",
+             "Kartika", "Lukman", "Maya", "Nanda", "Oki", "Putri", "Rizky", "Sari", "Taufik", "Wulan"]
+    last = ["Saputra", "Nurhaliza", "Wijaya", "Pratama", "Lestari", "Santoso", "Kusuma",
+            "Hidayat", "Permata", "Siregar", "Nasution", "Halim"]
+
+    index = SearchIndex()
+    start = time.perf_counter()
+    for i in range(1, customers + 1):
+        name = f"{rng.choice(first)} {rng.choice(last)}"
+        phone = f"08{rng.randint(10**9, 10**10 - 1)}"
+        index._add("customer", f"CUS{i}", (name, phone, f"{name.split()[0].lower()}{i}@mail.com"))
+    build_s = time.perf_counter() - start
+
+    terms = []
+    for _ in range(queries):
+        kind = rng.random()
+        if kind < 0.4:
+            terms.append(f"{rng.choice(first)} {rng.choice(last)[:3]}")
+        elif kind < 0.7:
+            terms.append(str(rng.randint(1000, 9999)))
+        else:
+            terms.append(f"{rng.choice(first).lower()}{rng.randint(1, customers)}@")
+    start = time.perf_counter()
+    for term in terms:
+        index.search(term, 10)
+    search_ms = (time.perf_counter() - start) / queries * 1000
+
+    puts = 1000
+    start = time.perf_counter()
+    for i in range(1, puts + 1):
+        index.put("customer", f"CUS{i}", (f"Pelanggan Baru {i}", "081200000000", ""))
+    put_ms = (time.perf_counter() - start) / puts * 1000
+
+    return {
+        "customers": customers,
+        "build_s": round(build_s, 1),
+        "search_ms": round(search_ms, 2),
+        "put_ms": round(put_ms, 3),
+        "trigrams": len(index._postings),
+    }
+
+if __name__ == "__main__":
+    print(benchmark())
@@ -0,0 +1,284 @@
+"""Append-only operation log and compact snapshots for the admin TableStore.
+
+Both are JSON: the log has one [op, table, item_id, payload] array per
+line and a snapshot is a single document. One process per directory is
+the writer (it holds ``writer.lock``), so two workers never append to
+the same log.
+
+Run the admin app with a single worker. Other processes only read the
+snapshot and log once, in ``restore``; they do not follow the log, so
+they never see later changes made by the writer.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from .table_store import TableStore
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Snapshot and truncate the log once it holds this many operations.
+COMPACT_EVERY = int(os.getenv("STORE_COMPACT_EVERY", "100000"))
+
+def _try_lock(f) -> bool:
+    """Exclusive, non-blocking lock on an open file; held until it is closed."""
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+class OperationLog:
+    """Durable change log for a TableStore.
+
+    Every insert/update/delete is appended to ``oplog.<gen>.jsonl`` and
+    fsynced. A snapshot copies the rows, starts a fresh log for the next
+    generation, and writes the copy to ``snapshot.json`` (a temp file,
+    then renamed); older logs are removed once it is on disk. Startup is
+    one snapshot load plus a replay of the logs written since.
+    """
+
+    def __init__(self, directory: str, compact_every: int = COMPACT_EVERY, fsync: bool = True):
+        self.directory = directory
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self.generation = 0
+        self.pending = 0
+        self._file = None
+        self._lock_file = None
+        self._store: Optional[TableStore] = None
+        self._snapshot_thread: Optional[threading.Thread] = None
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def snapshot_path(self) -> str:
+        return os.path.join(self.directory, "snapshot.json")
+
+    def log_path(self, generation: int) -> str:
+        return os.path.join(self.directory, f"oplog.{generation}.jsonl")
+
+    @property
+    def is_writer(self) -> bool:
+        return self._lock_file is not None
+
+    def acquire(self) -> bool:
+        """Try to become the directory's only writer; True if this process is."""
+        if self._lock_file is None:
+            f = open(os.path.join(self.directory, "writer.lock"), "a+b")
+            if _try_lock(f):
+                self._lock_file = f
+            else:
+                f.close()
+        return self.is_writer
+
+    def _open_log(self):
+        if self._file:
+            self._file.close()
+        self._file = open(self.log_path(self.generation), "ab")
+
+    def restore(self, store: TableStore) -> bool:
+        """Load the snapshot and replay the logs written after it into ``store``.
+
+        Returns False when nothing has been persisted yet. In the writer
+        process the store is attached afterwards so later changes are
+        logged; elsewhere nothing on disk is changed and the store stays
+        a copy of the data as of this call.
+        """
+        found = False
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            self.generation = snapshot["generation"]
+            for name, table in snapshot["tables"].items():
+                store[name].bulk_load(table["rows"], table["next_number"])
+            found = True
+        snapshot_generation = self.generation
+
+        # A crash while a snapshot was being written leaves its log and the newer ones
+        while True:
+            path = self.log_path(self.generation)
+            if os.path.exists(path):
+                self.pending = self._replay(path, store)
+                found = found or self.pending > 0
+            if not os.path.exists(self.log_path(self.generation + 1)):
+                break
+            self.generation += 1
+
+        if self.is_writer:
+            self._remove_old_logs(snapshot_generation)
+            self._store = store
+            self._open_log()
+            store.attach(self.record)
+        return found
+
+    def _replay(self, path: str, store: TableStore) -> int:
+        """Apply every complete record in the log; the writer drops a torn tail."""
+        applied = 0
+        end = 0
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    op, table, item_id, payload = json.loads(line)
+                except ValueError:
+                    break
+                target = store[table]
+                if op == "insert":
+                    target.insert(payload)
+                elif op == "update":
+                    target.update(item_id, payload)
+                elif op == "delete":
+                    target.delete(item_id)
+                end += len(line)
+                applied += 1
+        if self.is_writer and end < os.path.getsize(path):
+            # Crash mid-append: keep only the complete records
+            with open(path, "r+b") as f:
+                f.truncate(end)
+        return applied
+
+    def record(self, op: str, table: str, item_id: str, payload: Optional[Dict[str, Any]]):
+        """Append one operation (used as the TableStore listener)."""
+        data = json.dumps([op, table, item_id, payload], separators=(",", ":"), default=str)
+        self._file.write(data.encode("utf-8") + b"\n")
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.pending += 1
+        if self.compact_every and self.pending >= self.compact_every and self._store is not None:
+            self.snapshot(self._store, background=True)
+
+    def snapshot(self, store: TableStore, background: bool = False):
+        """Snapshot the store and start a new, empty log generation.
+
+        The rows are copied and the log rotated in the calling thread;
+        with ``background`` the copy is serialized on another thread, so
+        a handler that triggers compaction does not wait for it. Does
+        nothing while a background snapshot is still being written.
+        """
+        if not self.is_writer:
+            raise RuntimeError(f"{self.directory} is written by another process")
+        if self._snapshot_thread is not None and self._snapshot_thread.is_alive():
+            return
+        generation = self.generation + 1
+        tables = {
+            name: {"rows": {item_id: dict(row) for item_id, row in table.rows.items()},
+                   "next_number": table.next_number}
+            for name, table in store.tables.items()
+        }
+
+        self.generation = generation
+        self.pending = 0
+        self._store = store
+        self._open_log()
+        if background:
+            self._snapshot_thread = threading.Thread(
+                target=self._write_snapshot, args=(generation, tables, True),
+                name="store-snapshot", daemon=True,
+            )
+            self._snapshot_thread.start()
+        else:
+            self._write_snapshot(generation, tables)
+
+    def _write_snapshot(self, generation: int, tables: Dict[str, Any], background: bool = False):
+        """Write copied rows as the snapshot of ``generation``, then drop older logs.
+
+        If this fails the older logs stay, and restore replays them all.
+        """
+        snapshot = {"generation": generation, "created_at": time.time(), "tables": tables}
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, separators=(",", ":"), default=str)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            if not background:
+                raise
+            print(f"Error writing snapshot: {e}")
+            return
+        self._remove_old_logs(generation)
+
+    def _remove_old_logs(self, before: int):
+        for name in os.listdir(self.directory):
+            if name.startswith("oplog.") and name.endswith(".jsonl"):
+                try:
+                    generation = int(name.split(".")[1])
+                except ValueError:
+                    continue
+                if generation < before:
+                    os.remove(os.path.join(self.directory, name))
+
+    def close(self):
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+            self._snapshot_thread = None
+        if self._file:
+            self._file.close()
+            self._file = None
+        if self._lock_file:
+            self._lock_file.close()
+            self._lock_file = None
+
+def benchmark(rows: int = 1000000, log_ops: int = 100000) -> Dict[str, Any]:
+    """Time appends, snapshot, and startup (snapshot load + log replay)."""
+    with tempfile.TemporaryDirectory() as directory:
+        store = TableStore()
+        # No fsync: measures encoding and append cost, not the disk
+        log = OperationLog(directory, compact_every=0, fsync=False)
+        log.acquire()
+        log.restore(store)
+        customers = store["customers"]
+
+        start = time.perf_counter()
+        for i in range(rows):
+            customers.insert({"Nama_Customer": f"Customer {i}", "Kontak_Customer": f"0812{i:08d}"})
+        append_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        log.snapshot(store)
+        snapshot_s = time.perf_counter() - start
+
+        for i in range(log_ops):
+            customers.update(f"CUS{i + 1}", {"Kontak_Customer": f"0813{i:08d}"})
+        log.close()
+        log_bytes = os.path.getsize(log.log_path(log.generation))
+
+        start = time.perf_counter()
+        restored = TableStore()
+        reader = OperationLog(directory, compact_every=0)
+        reader.restore(restored)
+        restore_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reader._replay(log.log_path(log.generation), restored)
+        replay_s = time.perf_counter() - start
+
+        return {
+            "rows": rows,
+            "append_us": round(append_s / rows * 1e6, 2),
+            "snapshot_s": round(snapshot_s, 3),
+            "snapshot_mb": round(os.path.getsize(log.snapshot_path) / 1024 / 1024, 1),
+            "log_ops": log_ops,
+            "log_mb": round(log_bytes / 1024 / 1024, 1),
+            "replay_s": round(replay_s, 3),
+            "startup_s": round(restore_s, 3),
+            "restored_rows": len(restored["customers"]),
+        }
+
+if __name__ == "__main__":
+    print(benchmark())
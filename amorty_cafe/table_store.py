@@ -0,0 +1,383 @@
+"""Keyed in-memory table store with secondary indexes on FK columns."""
+import itertools
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+# Table definitions for the admin store (matches Rafi's Oracle schema)
+TABLE_SCHEMAS = {
+    "customers": {
+        "columns": ["ID_Customer", "Nama_Customer", "Kontak_Customer"],
+        "id_field": "ID_Customer",
+        "prefix": "CUS",
+        "indexes": [],
+    },
+    "karyawan": {
+        "columns": ["ID_Karyawan", "Nama_Karyawan", "Tanggal_Masuk", "Gaji"],
+        "id_field": "ID_Karyawan",
+        "prefix": "KAR",
+        "indexes": [],
+    },
+    "meja": {
+        "columns": ["ID_Meja", "Nomor_Meja", "Status_Meja", "ID_Karyawan"],
+        "id_field": "ID_Meja",
+        "prefix": "MJ",
+        "indexes": ["ID_Karyawan", "Status_Meja"],
+    },
+    "menu": {
+        "columns": ["ID_Menu", "Nama_Menu", "Harga_Menu", "Kategori"],
+        "id_field": "ID_Menu",
+        "prefix": "MN",
+        "indexes": ["Kategori"],
+    },
+    "pesanan": {
+        "columns": ["ID_Pesanan", "ID_Customer", "ID_Karyawan", "Waktu_Pesanan", "ID_Menu", "ID_Meja"],
+        "id_field": "ID_Pesanan",
+        "prefix": "PES",
+        "indexes": ["ID_Customer", "ID_Karyawan", "ID_Menu", "ID_Meja"],
+    },
+    "transaksi": {
+        "columns": ["ID_Transaksi", "ID_Pesanan", "Total_Harga", "Tanggal_Transaksi", "ID_Karyawan"],
+        "id_field": "ID_Transaksi",
+        "prefix": "TRX",
+        "indexes": ["ID_Pesanan", "ID_Karyawan"],
+    },
+    "pembayaran": {
+        "columns": ["ID_Pembayaran", "ID_Pesanan", "ID_Transaksi", "ID_Karyawan", "Metode_Pembayaran", "Jumlah_Bayar", "Tanggal_Pembayaran"],
+        "id_field": "ID_Pembayaran",
+        "prefix": "PB",
+        "indexes": ["ID_Pesanan", "ID_Transaksi", "ID_Karyawan", "Metode_Pembayaran"],
+    },
+    "reservasi": {
+        "columns": ["ID_Reservasi", "ID_Customer", "ID_Meja", "ID_Karyawan", "Tanggal_Reservasi", "Waktu_Mulai", "Waktu_Selesai", "Status_Reservasi"],
+        "id_field": "ID_Reservasi",
+        "prefix": "RSV",
+        "indexes": ["ID_Customer", "ID_Meja", "ID_Karyawan", "Status_Reservasi"],
+    },
+}
+
+# Allowed values of the status/category columns
+COLUMN_CHOICES = {
+    "Status_Meja": ["AVAILABLE", "DIPESAN", "TERPAKAI"],
+    "Kategori": ["Makanan", "Minuman"],
+    "Metode_Pembayaran": ["Cash", "Credit Card", "Debit Card", "Digital Wallet"],
+    "Status_Reservasi": ["PENDING", "CONFIRMED", "CANCELLED", "COMPLETED"],
+}
+
+# Sorted ID lists kept per table, one per (filters, sort column, direction)
+SORT_CACHE_SIZE = 16
+
+class KeyedTable:
+    """Rows keyed by primary ID plus value -> IDs indexes on chosen columns.
+
+    Insert, get, update, delete and index lookups are all O(1) (index
+    lookups are O(matches)). Row order is insertion order.
+    """
+
+    def __init__(self, name: str, id_field: str, prefix: str, indexes: Iterable[str] = ()):
+        self.name = name
+        self.id_field = id_field
+        self.prefix = prefix
+        self.rows: Dict[str, Dict[str, Any]] = {}
+        self.indexes: Dict[str, Dict[Any, Dict[str, None]]] = {col: {} for col in indexes}
+        self.next_number = 1
+        self.listener: Optional[Callable[[str, str, str, Optional[Dict[str, Any]]], None]] = None
+        # (filters, sort, descending) -> matching IDs in sort order, LRU
+        self._sorted: "OrderedDict[tuple, List[str]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.rows.values())
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self.rows
+
+    def generate_id(self) -> str:
+        """Next ID from the monotonic per-table counter."""
+        item_id = f"{self.prefix}{self.next_number}"
+        self.next_number += 1
+        return item_id
+
+    def _track_id(self, item_id: str):
+        """Keep the counter above any explicitly supplied ID."""
+        if item_id.startswith(self.prefix):
+            try:
+                number = int(item_id[len(self.prefix):])
+            except ValueError:
+                return
+            if number >= self.next_number:
+                self.next_number = number + 1
+
+    def _index_add(self, item_id: str, row: Dict[str, Any]):
+        for col, index in self.indexes.items():
+            index.setdefault(row.get(col), {})[item_id] = None
+
+    def _index_remove(self, item_id: str, row: Dict[str, Any]):
+        for col, index in self.indexes.items():
+            bucket = index.get(row.get(col))
+            if bucket is not None:
+                bucket.pop(item_id, None)
+                if not bucket:
+                    del index[row.get(col)]
+
+    def insert(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert a row, assigning an ID when it has none."""
+        item_id = row.get(self.id_field)
+        if not item_id:
+            item_id = self.generate_id()
+            row = {self.id_field: item_id, **row}
+        else:
+            self._track_id(item_id)
+        if item_id in self.rows:
+            raise KeyError(f"Duplicate {self.id_field}: {item_id}")
+        self.rows[item_id] = row
+        self._index_add(item_id, row)
+        self._sorted.clear()
+        if self.listener:
+            self.listener("insert", self.name, item_id, row)
+        return row
+
+    def get(self, item_id: str) -> Optional[Dict[str, Any]]:
+        """Row by primary ID."""
+        return self.rows.get(item_id)
+
+    def update(self, item_id: str, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Apply changes to a row; indexes are only touched for changed columns."""
+        row = self.rows.get(item_id)
+        if row is None:
+            return None
+        for col, value in changes.items():
+            if col == self.id_field:
+                continue
+            index = self.indexes.get(col)
+            if index is not None and row.get(col) != value:
+                bucket = index.get(row.get(col))
+                if bucket is not None:
+                    bucket.pop(item_id, None)
+                    if not bucket:
+                        del index[row.get(col)]
+                index.setdefault(value, {})[item_id] = None
+            row[col] = value
+        self._forget_sorted(changes)
+        if self.listener:
+            self.listener("update", self.name, item_id, changes)
+        return row
+
+    def delete(self, item_id: str) -> Optional[Dict[str, Any]]:
+        """Remove a row by primary ID."""
+        row = self.rows.pop(item_id, None)
+        if row is not None:
+            self._index_remove(item_id, row)
+            self._sorted.clear()
+            if self.listener:
+                self.listener("delete", self.name, item_id, None)
+        return row
+
+    def bulk_load(self, rows: Dict[str, Dict[str, Any]], next_number: int):
+        """Replace all rows at once (snapshot restore) and rebuild indexes."""
+        self.rows = rows
+        self.next_number = next_number
+        self._sorted.clear()
+        for col, index in self.indexes.items():
+            index.clear()
+            for item_id, row in rows.items():
+                index.setdefault(row.get(col), {})[item_id] = None
+
+    def find(self, col: str, value: Any) -> List[Dict[str, Any]]:
+        """Rows whose indexed column equals value."""
+        if col == self.id_field:
+            row = self.rows.get(value)
+            return [row] if row is not None else []
+        ids = self.indexes[col].get(value, {})
+        return [self.rows[item_id] for item_id in ids]
+
+    def count(self, col: str, value: Any) -> int:
+        """Number of rows whose indexed column equals value."""
+        return len(self.indexes[col].get(value, ()))
+
+    def _forget_sorted(self, changes: Dict[str, Any]):
+        """Drop cached orders that sort or filter on a changed column."""
+        for key in list(self._sorted):
+            filters, sort, _ = key
+            if sort in changes or any(col in changes for col, _ in filters):
+                del self._sorted[key]
+
+    def _sorted_ids(self, filters: Dict[str, Any], ids: Iterable[str], rest: Dict[str, Any],
+                    sort: str, descending: bool) -> List[str]:
+        """Matching IDs ordered by ``sort``, sorted once and reused until a write."""
+        key = (tuple(sorted(filters.items())), sort, descending)
+        order = self._sorted.get(key)
+        if order is not None:
+            self._sorted.move_to_end(key)
+            return order
+        rows = self.rows
+        candidates = reversed(ids) if descending else iter(ids)
+        if rest:
+            candidates = (item_id for item_id in candidates
+                          if all(rows[item_id].get(col) == value for col, value in rest.items()))
+        # None sorts last in both directions; ties keep ID order
+        if descending:
+            order = sorted(candidates, key=lambda item_id: (rows[item_id].get(sort) is not None, rows[item_id].get(sort)),
+                           reverse=True)
+        else:
+            order = sorted(candidates, key=lambda item_id: (rows[item_id].get(sort) is None, rows[item_id].get(sort)))
+        self._sorted[key] = order
+        while len(self._sorted) > SORT_CACHE_SIZE:
+            self._sorted.popitem(last=False)
+        return order
+
+    def select(self, filters: Optional[Dict[str, Any]] = None, offset: int = 0,
+               limit: int = 25, sort: Optional[str] = None,
+               descending: bool = False) -> Dict[str, Any]:
+        """One page of rows matching equality filters, plus the match count.
+
+        The smallest matching index bucket drives the scan; remaining
+        filters are checked per candidate row. Rows come in ID (insertion)
+        order unless ``sort`` names another column; that order is sorted
+        once per query and cached until the table changes, so scrolling
+        only slices it.
+        """
+        filters = {col: value for col, value in (filters or {}).items() if value not in ("", None)}
+        indexed = [col for col in filters if col in self.indexes]
+        if indexed:
+            driver = min(indexed, key=lambda col: self.count(col, filters[col]))
+            ids = self.indexes[driver].get(filters[driver], {})
+            rest = {col: value for col, value in filters.items() if col != driver}
+        else:
+            ids = self.rows
+            rest = filters
+
+        if sort and sort != self.id_field:
+            order = self._sorted_ids(filters, ids, rest, sort, descending)
+            return {"rows": [self.rows[item_id] for item_id in order[offset:offset + limit]], "total": len(order)}
+        ordered = reversed(ids) if descending else iter(ids)
+        candidates = (self.rows[item_id] for item_id in ordered)
+        if rest:
+            matches = [row for row in candidates if all(row.get(col) == value for col, value in rest.items())]
+            return {"rows": matches[offset:offset + limit], "total": len(matches)}
+        return {"rows": list(itertools.islice(candidates, offset, offset + limit)), "total": len(ids)}
+
+class TableStore:
+    """A set of keyed tables built from TABLE_SCHEMAS."""
+
+    def __init__(self, schemas: Dict[str, Dict] = TABLE_SCHEMAS):
+        self.schemas = schemas
+        self.tables: Dict[str, KeyedTable] = {
+            name: KeyedTable(name, schema["id_field"], schema["prefix"], schema["indexes"])
+            for name, schema in schemas.items()
+        }
+
+    def __getitem__(self, table: str) -> KeyedTable:
+        return self.tables[table]
+
+    def load(self, data: Dict[str, List[Dict[str, Any]]]):
+        """Bulk load rows, e.g. from sample data or a database extract."""
+        for table, rows in data.items():
+            for row in rows:
+                self.tables[table].insert(dict(row))
+
+    def attach(self, listener: Optional[Callable[[str, str, str, Optional[Dict[str, Any]]], None]]):
+        """Call listener(op, table, item_id, payload) after every change."""
+        for table in self.tables.values():
+            table.listener = listener
+
+    def counts(self) -> Dict[str, int]:
+        """Row count per table."""
+        return {name: len(table) for name, table in self.tables.items()}
+
+def view(store: "TableStore", table: str, offset: int = 0, limit: int = 25,
+         filters: Optional[Dict[str, Any]] = None, sort: Optional[str] = None,
+         descending: bool = False) -> Dict[str, Any]:
+    """Everything a session needs to render one window of a table tab."""
+    selected = store[table].select(filters, offset, limit, sort, descending)
+    return {
+        "rows": selected["rows"],
+        "total": selected["total"],
+        "counts": store.counts(),
+    }
+
+def measure_session_state(dataset_sizes: List[int] = (1000, 10000, 100000),
+                          session_counts: List[int] = (1, 10, 100),
+                          page_size: int = 25) -> List[Dict[str, Any]]:
+    """Serialized per-session view size against dataset size and sessions."""
+    results = []
+    for size in dataset_sizes:
+        store = TableStore()
+        for i in range(size):
+            store["customers"].insert({
+                "Nama_Customer": f"Customer {i}",
+                "Kontak_Customer": f"0812{i:08d}",
+            })
+        for sessions in session_counts:
+            total = 0
+            for s in range(sessions):
+                state = view(store, "customers", offset=(s % 10) * page_size, limit=page_size)
+                state.update({"active_tab": "customers", "window_start": (s % 10) * page_size, "filters": {}})
+                total += len(json.dumps(state))
+            results.append({
+                "rows": size,
+                "sessions": sessions,
+                "bytes_per_session": total // sessions,
+                "total_bytes": total,
+            })
+    return results
+
+def benchmark(rows: int = 100000) -> List[Dict[str, Any]]:
+    """Time add/get/update/FK lookup/delete with ``rows`` rows per table."""
+    results = []
+    store = TableStore()
+    for name, table in store.tables.items():
+        fk_cols = [col for col in table.indexes if col.startswith("ID_")]
+        fk_col = fk_cols[0] if fk_cols else None
+
+        start = time.perf_counter()
+        for i in range(rows):
+            row = {"Nama": f"row {i}"}
+            if fk_col:
+                row[fk_col] = f"FK{i % 1000}"
+            table.insert(row)
+        insert_s = time.perf_counter() - start
+
+        ids = list(table.rows)[::max(rows // 10000, 1)]
+        start = time.perf_counter()
+        for item_id in ids:
+            table.get(item_id)
+        get_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for i, item_id in enumerate(ids):
+            table.update(item_id, {fk_col: f"FK{i % 500}"} if fk_col else {"Nama": "x"})
+        update_s = time.perf_counter() - start
+
+        lookup_s = 0.0
+        if fk_col:
+            start = time.perf_counter()
+            for i in range(len(ids)):
+                table.find(fk_col, f"FK{i % 1000}")
+            lookup_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for item_id in ids:
+            table.delete(item_id)
+        delete_s = time.perf_counter() - start
+
+        ops = len(ids)
+        results.append({
+            "table": name,
+            "rows": rows,
+            "insert_us": round(insert_s / rows * 1e6, 2),
+            "get_us": round(get_s / ops * 1e6, 2),
+            "update_us": round(update_s / ops * 1e6, 2),
+            "fk_lookup_us": round(lookup_s / ops * 1e6, 2) if fk_col else None,
+            "delete_us": round(delete_s / ops * 1e6, 2),
+        })
+    return results
+
+if __name__ == "__main__":
+    for row in benchmark():
+        print(row)
+    for row in measure_session_state():
+        print(row)
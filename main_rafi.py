@@ -24,7 +24,8 @@ def main():
     # Setup database if needed
     if "--setup-db" in sys.argv:
         print("\n🗄️  Setting up database...")
-        if setup_database_rafi():
+        # Deleting/clearing orphaned rows needs an explicit --fix-orphans
+        if setup_database_rafi(fix_orphans="--fix-orphans" in sys.argv):
             print("✅ Database setup completed!")
         else:
             print("❌ Database setup failed!")
@@ -0,0 +1,15 @@
+"""Make the amorty_cafe package importable when pytest is run from any directory."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+@pytest.fixture(scope="session")
+def admin_app(tmp_path_factory):
+    """full_admin_app imported with its store log in a temporary directory."""
+    pytest.importorskip("reflex")
+    os.environ["ADMIN_STORE_DIR"] = str(tmp_path_factory.mktemp("admin_store"))
+    from amorty_cafe import full_admin_app
+    return full_admin_app
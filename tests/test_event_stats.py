@@ -0,0 +1,78 @@
+"""Events sent per completed form, counted by the real EventCounter middleware."""
+import asyncio
+import os
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("reflex")
+
+from amorty_cafe.event_stats import EventCounter
+
+# Per-field vars AdminState had before forms were submitted as one event
+OLD_FIELDS = ["username", "password", "customer_nama", "customer_kontak", "menu_nama", "menu_harga"]
+
+@pytest.fixture(scope="module")
+def dashboard():
+    """The admin dashboard page module; AuthState needs a private SECRET_KEY."""
+    os.environ.setdefault("SECRET_KEY", "test-only-secret-key")
+    from amorty_cafe.pages import admin_dashboard
+    return admin_dashboard
+
+def send(counter: EventCounter, state_cls, handler: str, token: str = "client-1"):
+    event = SimpleNamespace(name=f"{state_cls.get_full_name()}.{handler}", token=token)
+    asyncio.run(counter.preprocess(None, None, event))
+
+def type_text(counter: EventCounter, state_cls, handler: str, text: str, debounced: bool = False):
+    """Keystrokes into a controlled input: one event each, or one per burst when debounced."""
+    for _ in range(1 if debounced else len(text)):
+        send(counter, state_cls, handler)
+
+def forms(counter: EventCounter, state_cls, handler: str):
+    return counter.per_form[f"{state_cls.get_full_name()}.{handler}"]
+
+def test_controlled_inputs_cost_one_event_per_keystroke(admin_app):
+    counter = EventCounter(verbose=False)
+    type_text(counter, admin_app.AdminState, "set_username", "admin")
+    type_text(counter, admin_app.AdminState, "set_password", "secret")
+    send(counter, admin_app.AdminState, "admin_login")
+    assert forms(counter, admin_app.AdminState, "admin_login") == [len("admin") + len("secret") + 1]
+
+def test_admin_forms_send_fk_lookups_and_submit_only(admin_app):
+    state_cls = admin_app.AdminState
+    for field in OLD_FIELDS:
+        assert f"set_{field}" not in state_cls.event_handlers
+    for handler in ("admin_login", "customer_login", "add_item", "update_item", "search_fk", "pick_fk"):
+        assert handler in state_cls.event_handlers
+
+    counter = EventCounter(verbose=False)
+    # Login: both inputs are uncontrolled, so typing sends nothing
+    send(counter, state_cls, "admin_login")
+    # Add Meja: Nomor_Meja and Status_Meja are uncontrolled; "andi" goes to the debounced picker
+    type_text(counter, state_cls, "search_fk", "andi", debounced=True)
+    send(counter, state_cls, "pick_fk")
+    send(counter, state_cls, "add_item")
+    # Edit Menu: no foreign keys, only the submit
+    send(counter, state_cls, "update_item")
+    assert forms(counter, state_cls, "admin_login") == [1]
+    assert forms(counter, state_cls, "add_item") == [3]
+    assert forms(counter, state_cls, "update_item") == [1]
+
+def test_dashboard_form_is_submitted_once(dashboard):
+    state_cls = dashboard.AdminDashboardState
+    assert "set_form_field" not in state_cls.event_handlers
+
+    counter = EventCounter(verbose=False)
+    # Add Transaksi: pick a Pesanan, then submit; Total_Harga is filled in by the server
+    type_text(counter, state_cls, "search_fk", "PES12", debounced=True)
+    send(counter, state_cls, "pick_fk")
+    send(counter, state_cls, "save_item")
+    assert forms(counter, state_cls, "save_item") == [3]
+
+def test_clients_are_counted_separately(admin_app):
+    counter = EventCounter(verbose=False)
+    send(counter, admin_app.AdminState, "search_fk", token="a")
+    send(counter, admin_app.AdminState, "search_fk", token="a")
+    send(counter, admin_app.AdminState, "add_item", token="b")
+    send(counter, admin_app.AdminState, "add_item", token="a")
+    assert forms(counter, admin_app.AdminState, "add_item") == [1, 3]
@@ -0,0 +1,42 @@
+"""Login rate limiter: bucket behaviour and memory with 100k distinct keys."""
+import pytest
+
+from amorty_cafe import rate_limit
+from amorty_cafe.rate_limit import TokenBucketLimiter, measure_memory
+
+def test_rejects_after_capacity():
+    limiter = TokenBucketLimiter(capacity=3, refill_per_second=0.001)
+    assert [limiter.allow("10.0.0.1", "admin") for _ in range(4)] == [True, True, True, False]
+    assert limiter.retry_after("10.0.0.1", "admin") > 0
+    # Other usernames from the same client have their own bucket
+    assert limiter.allow("10.0.0.1", "cus1")
+
+def test_reset_gives_attempts_back():
+    limiter = TokenBucketLimiter(capacity=1, refill_per_second=0.001)
+    assert limiter.allow("10.0.0.1", "admin")
+    assert not limiter.allow("10.0.0.1", "admin")
+    limiter.reset("10.0.0.1", "admin")
+    assert limiter.allow("10.0.0.1", "admin")
+
+def test_login_succeeded_resets_the_bucket(monkeypatch):
+    monkeypatch.setattr(rate_limit, "login_limiter", TokenBucketLimiter(capacity=2, refill_per_second=0.001))
+    monkeypatch.setattr(rate_limit, "client_limiter", TokenBucketLimiter(capacity=100, refill_per_second=0.001))
+    assert rate_limit.check_login_attempt("10.0.0.1", "Admin") == ""
+    assert rate_limit.check_login_attempt("10.0.0.1", "admin") == ""
+    assert rate_limit.check_login_attempt("10.0.0.1", "admin") != ""
+    rate_limit.login_succeeded("10.0.0.1", " ADMIN ")
+    assert rate_limit.check_login_attempt("10.0.0.1", "admin") == ""
+
+def test_max_keys_evicts_oldest():
+    limiter = TokenBucketLimiter(max_keys=1000)
+    for i in range(5000):
+        limiter.allow("10.0.0.1", f"user{i}")
+    assert len(limiter) <= 1000
+
+@pytest.mark.parametrize("keys", [100_000])
+def test_memory_with_100k_keys(keys):
+    stats = measure_memory(keys)
+    assert stats["keys"] == keys
+    # One small dict entry per key (about 120 bytes on CPython 3.11)
+    assert stats["bytes_per_key"] < 200
+    assert stats["total_mb"] < 20
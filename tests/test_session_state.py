@@ -0,0 +1,44 @@
+"""Per-session AdminState stays a fixed-size window however big the shared store gets."""
+import json
+
+import pytest
+
+from amorty_cafe.table_store import TableStore
+
+PAGE_BYTES = 20_000
+
+def fill(store: TableStore, rows: int) -> TableStore:
+    for i in range(rows):
+        store["customers"].insert({
+            "Nama_Customer": f"Customer {i}",
+            "Kontak_Customer": f"0812{i:08d}",
+        })
+    return store
+
+def state_bytes(state) -> int:
+    return len(json.dumps(state.dict(), default=str))
+
+def open_customers(app, offset: int = 0):
+    state = app.AdminState()
+    state.set_active_tab("customers")
+    state.scroll_table(offset * 36)
+    return state
+
+@pytest.mark.parametrize("rows", [1_000, 50_000])
+def test_state_size_does_not_grow_with_rows(admin_app, monkeypatch, rows):
+    small = open_customers(admin_app)
+    monkeypatch.setattr(admin_app, "admin_store", fill(TableStore(), rows))
+    state = open_customers(admin_app)
+    assert state.total_rows == rows
+    assert len(state.rows) <= state.window_size
+    assert state_bytes(state) < PAGE_BYTES
+    # Only the row count and the rows' text differ from the sample-data session
+    assert state_bytes(state) < 2 * state_bytes(small)
+
+def test_sessions_hold_their_own_window(admin_app, monkeypatch):
+    monkeypatch.setattr(admin_app, "admin_store", fill(TableStore(), 20_000))
+    states = [open_customers(admin_app, offset=i * 500) for i in range(20)]
+    sizes = [state_bytes(state) for state in states]
+    assert max(sizes) < PAGE_BYTES
+    assert sum(sizes) < 20 * PAGE_BYTES
+    assert len({state.window_start for state in states}) > 1